@@ -0,0 +1,101 @@
+"""Compare job latency of cold CLI runs with jobs sent to a warm daemon.
+
+Each cold run starts ``python -m scraper`` for one page of a local fixture
+site; each daemon job goes over the daemon's Unix socket to a
+``python -m scraper --serve`` process started once. Prints latency
+percentiles per mode as JSON.
+
+    python -m benchmarks.bench_daemon --runs 20 --fetch-mode browser
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from scraper import DaemonClient, ScrapingConfig
+
+from .fixture_site import FixtureSite, FixtureSiteConfig
+
+
+def summarize(mode: str, latencies: list) -> dict:
+    latencies = sorted(latencies)
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+    return {
+        "mode": mode,
+        "runs": len(latencies),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 1),
+        "p50_ms": round(pick(0.5) * 1000, 1),
+        "p95_ms": round(pick(0.95) * 1000, 1),
+    }
+
+
+def cold_runs(url: str, args: argparse.Namespace) -> list:
+    latencies = []
+    for i in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "scraper", f"{url}?run={i}", "--fetch-mode", args.fetch_mode,
+             "--delay-ms", "0"],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def daemon_runs(url: str, socket_path: str, args: argparse.Namespace) -> list:
+    client = DaemonClient(socket_path)
+    config = ScrapingConfig(fetch_mode=args.fetch_mode, delay_ms=0)
+    latencies = []
+    for i in range(args.runs):
+        start = time.perf_counter()
+        await client.scrape(f"{url}?run={i}", config)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def start_daemon(socket_path: str, lazy: bool) -> subprocess.Popen:
+    command = [sys.executable, "-m", "scraper", "--serve", "--socket", socket_path]
+    if lazy:
+        # HTTP-only jobs never need the browser
+        command.append("--lazy-launch")
+    proc = subprocess.Popen(
+        command,
+        stderr=subprocess.PIPE, text=True,
+    )
+    line = proc.stderr.readline()
+    if "_serving" not in line:
+        proc.kill()
+        raise RuntimeError(f"Daemon failed to start: {line}{proc.stderr.read()}")
+    return proc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--fetch-mode", choices=["browser", "hybrid"], default="browser")
+    args = parser.parse_args()
+
+    with FixtureSite(FixtureSiteConfig(pages=10)) as site, tempfile.TemporaryDirectory() as tmp:
+        url = site.url()
+        print(json.dumps(summarize("cold_cli", cold_runs(url, args))), flush=True)
+
+        socket_path = os.path.join(tmp, "scraper.sock")
+        start = time.perf_counter()
+        daemon = start_daemon(socket_path, lazy=args.fetch_mode == "hybrid")
+        startup = time.perf_counter() - start
+        try:
+            report = summarize("daemon", asyncio.run(daemon_runs(url, socket_path, args)))
+            report["daemon_startup_ms"] = round(startup * 1000, 1)
+            print(json.dumps(report), flush=True)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+
+if __name__ == "__main__":
+    main()
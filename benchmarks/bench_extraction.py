@@ -0,0 +1,71 @@
+"""Compare combined single-pass extraction with the three separate scripts.
+
+Loads synthetic DOMs of increasing size with ``page.set_content`` and times
+``ContentExtractor.extract_content`` in both modes. Prints JSON per size.
+
+    python -m benchmarks.bench_extraction --sizes 1000 10000 50000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from playwright.async_api import async_playwright
+
+from scraper import ContentExtractor
+
+
+def synthetic_dom(nodes: int) -> str:
+    """Build a page with roughly ``nodes`` elements: sections, links, tables, hidden blocks"""
+    parts = ["<!doctype html><html><body><main>"]
+    count = 0
+    i = 0
+    while count < nodes:
+        parts.append(
+            f"<section><h2>Section {i}</h2><p>Paragraph {i} with <a href='/p/{i}'>link {i}</a>.</p>"
+            f"<div style='display:none'><p>hidden {i}</p><a href='/h/{i}'>h</a></div>"
+            f"<table><thead><tr><th>k</th><th>v</th></tr></thead>"
+            f"<tbody><tr><td>{i}</td><td>{i * 2}</td></tr></tbody></table></section>"
+        )
+        count += 16
+        i += 1
+    parts.append("</main></body></html>")
+    return "".join(parts)
+
+
+async def time_mode(page, extractor: ContentExtractor, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await extractor.extract_content(page, include_tables=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        page = await browser.new_page()
+        for size in args.sizes:
+            await page.set_content(synthetic_dom(size))
+            separate = await time_mode(page, ContentExtractor(combined=False), args.repeat)
+            combined = await time_mode(page, ContentExtractor(combined=True), args.repeat)
+            print(json.dumps({
+                "nodes": size,
+                "separate_ms": round(separate * 1000, 2),
+                "combined_ms": round(combined * 1000, 2),
+                "speedup": round(separate / combined, 2) if combined else None,
+            }))
+        await browser.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
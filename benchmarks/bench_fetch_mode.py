@@ -0,0 +1,55 @@
+"""Compare browser-only crawling with the hybrid HTTP-first fetch path.
+
+Crawls a static local fixture site in both fetch modes and prints pages/sec
+for each as JSON.
+
+    python -m benchmarks.bench_fetch_mode --pages 200 --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from scraper import ScrapingConfig, WebScraper
+
+from .fixture_site import FixtureSite, FixtureSiteConfig
+
+
+async def run_once(url: str, fetch_mode: str, args: argparse.Namespace) -> dict:
+    config = ScrapingConfig(
+        depth=args.depth,
+        max_pages=args.pages,
+        delay_ms=0,
+        concurrency=args.concurrency,
+        fetch_mode=fetch_mode,
+        include_tables=True,
+    )
+    scraper = WebScraper(config)
+    start = time.perf_counter()
+    results = await scraper.scrape(url)
+    elapsed = time.perf_counter() - start
+    return {
+        "fetch_mode": fetch_mode,
+        "pages": len(results),
+        "errors": sum(1 for r in results if "error" in r),
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(len(results) / elapsed, 2) if elapsed else None,
+        "stats": scraper.stats(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with FixtureSite(FixtureSiteConfig(pages=args.pages, fanout=args.fanout)) as site:
+        for fetch_mode in ("browser", "hybrid"):
+            print(json.dumps(asyncio.run(run_once(site.url(), fetch_mode, args))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Count page visits needed to reach a target set with FIFO vs best-first frontiers.
+
+Generates a synthetic shop-like site graph: category pages with long
+pagination chains, product pages (the targets), and a large cloud of tag
+and help pages linked from every page. The crawl is simulated in-process
+(no browser or HTTP), visiting pages in frontier order exactly as
+``WebScraper`` pops them, and reports how many visits each frontier needs
+to reach 50%, 90% and 100% of the product pages.
+
+    python -m benchmarks.bench_frontier --categories 20 --pages-per-category 10 --tags 500
+"""
+import argparse
+import json
+import random
+from typing import Dict, List, Tuple
+
+from scraper import PriorityFrontier, SpillingFrontier, URLScorer
+
+Graph = Dict[str, List[Tuple[str, str]]]
+ROOT = "https://shop.example"
+
+
+def build_site(categories: int, pages_per_category: int, products_per_page: int,
+               tags: int, seed: int = 0) -> Tuple[Graph, set]:
+    rng = random.Random(seed)
+    graph: Graph = {}
+    targets = set()
+    tag_links = [(f"{ROOT}/tag/{t}", f"tag {t}") for t in range(tags)]
+    help_links = [(f"{ROOT}/help/{h}", f"Help topic {h}") for h in range(20)]
+
+    def chrome() -> List[Tuple[str, str]]:
+        # Site-wide navigation noise: a random slice of the tag cloud plus help
+        return rng.sample(tag_links, min(len(tag_links), 30)) + help_links
+
+    graph[ROOT] = [(f"{ROOT}/category/{c}", f"Category {c}") for c in range(categories)] + chrome()
+    product = 0
+    for c in range(categories):
+        for p in range(1, pages_per_category + 1):
+            url = f"{ROOT}/category/{c}" + (f"?page={p}" if p > 1 else "")
+            links = []
+            for _ in range(products_per_page):
+                product_url = f"{ROOT}/product/{product}"
+                targets.add(product_url)
+                graph[product_url] = [(f"{ROOT}/category/{c}", "Back to category")] + chrome()
+                links.append((product_url, f"View product {product}"))
+                product += 1
+            if p < pages_per_category:
+                links.append((f"{ROOT}/category/{c}?page={p + 1}", "Next page"))
+            graph[url] = links + chrome()
+    for t in range(tags):
+        graph[f"{ROOT}/tag/{t}"] = chrome()
+    for h in range(20):
+        graph[f"{ROOT}/help/{h}"] = chrome()
+    return graph, targets
+
+
+def crawl(graph: Graph, targets: set, frontier) -> Dict[str, int]:
+    """Visit pages in frontier order; return visits needed per target fraction"""
+    seen = set()
+    found = 0
+    milestones = {0.5: None, 0.9: None, 1.0: None}
+    visits = 0
+    while frontier and found < len(targets):
+        url, depth = frontier.popleft()
+        if url in seen:
+            continue
+        seen.add(url)
+        visits += 1
+        if url in targets:
+            found += 1
+            for fraction, at in milestones.items():
+                if at is None and found >= fraction * len(targets):
+                    milestones[fraction] = visits
+        for href, text in graph.get(url, []):
+            if href not in seen:
+                frontier.append((href, depth + 1), text)
+    return {f"visits_to_{int(k * 100)}pct": v for k, v in milestones.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--pages-per-category", type=int, default=10)
+    parser.add_argument("--products-per-page", type=int, default=10)
+    parser.add_argument("--tags", type=int, default=500)
+    args = parser.parse_args()
+
+    graph, targets = build_site(
+        args.categories, args.pages_per_category, args.products_per_page, args.tags
+    )
+    scorer = URLScorer(
+        depth_weight=0.1,
+        pattern_weights={"*/product/*": 10, "*/category/*": 5},
+        keyword_weights={"next": 2, "help": -5},
+    )
+    frontiers = {
+        "fifo": lambda: SpillingFrontier([(ROOT, 0)]),
+        "priority": lambda: PriorityFrontier([(ROOT, 0)], scorer=scorer),
+        "priority+budget": lambda: PriorityFrontier(
+            [(ROOT, 0)], scorer=scorer, path_budgets={"/tag/": 20, "/help/": 5}
+        ),
+    }
+    for name, make in frontiers.items():
+        report = {"frontier": name, "site_pages": len(graph), "targets": len(targets)}
+        report.update(crawl(graph, targets, make()))
+        print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Measure the per-page cost of phase instrumentation, disabled and enabled.
+
+Replays the timing calls ``WebScraper._visit_url`` makes for a
+browser-rendered page (clock reads, phase contexts, the end-of-page
+aggregation) without a browser, and prints the microseconds added per page
+as JSON. The disabled case is what every crawl pays when metrics are off.
+
+    python -m benchmarks.bench_metrics --pages 200000
+"""
+import argparse
+import json
+import time
+
+from scraper.metrics import NULL_TIMINGS, CrawlMetrics
+
+
+def visit(metrics) -> None:
+    timings = metrics.page("https://example.com/") if metrics is not None else NULL_TIMINGS
+    start = timings.clock()
+    timings.record("politeness", start)
+    start = timings.clock()
+    timings.record("slot", start)
+    for phase in ("pool_acquire", "goto", "automation", "extraction"):
+        with timings.phase(phase):
+            pass
+    if metrics is not None:
+        metrics.page_done(timings, {})
+
+
+def per_page_us(metrics, pages: int) -> float:
+    start = time.perf_counter()
+    for _ in range(pages):
+        visit(metrics)
+    return (time.perf_counter() - start) / pages * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200000)
+    args = parser.parse_args()
+    for mode, metrics in (
+        ("disabled", None),
+        ("enabled", CrawlMetrics()),
+        ("enabled+timings", CrawlMetrics(attach_to_results=True)),
+    ):
+        print(json.dumps({
+            "mode": mode,
+            "pages": args.pages,
+            "us_per_page": round(per_page_us(metrics, args.pages), 3),
+        }), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare crawling many fixture sites one run at a time with one multi-seed crawl.
+
+Serves one large site and ``--sites`` small ones, each on its own port (so
+each is its own host). The sequential run crawls the seeds one
+``WebScraper`` at a time, large site first; the multi-seed run crawls them
+all with ``iter_scrape_many``. Prints pages/sec and when the small seeds
+finished (median and last, seconds from the start) as JSON.
+
+    python -m benchmarks.bench_multi_seed --sites 20 --pages 50 --big-pages 1000
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import statistics
+import time
+from dataclasses import replace
+from typing import Dict, List
+
+from scraper import ScrapingConfig, Seed, WebScraper
+
+from .fixture_site import FixtureSite, FixtureSiteConfig
+
+
+async def run_sequential(config: ScrapingConfig, seeds: List[Seed]) -> Dict[str, float]:
+    finished: Dict[str, float] = {}
+    start = time.perf_counter()
+    pages = 0
+    for seed in seeds:
+        seed_config = replace(config, max_pages=seed.max_pages or config.max_pages)
+        async for _ in WebScraper(seed_config).iter_scrape(seed.url):
+            pages += 1
+        finished[seed.url] = time.perf_counter() - start
+    return report("sequential", pages, time.perf_counter() - start, finished, seeds)
+
+
+async def run_multi_seed(config: ScrapingConfig, seeds: List[Seed]) -> Dict[str, float]:
+    finished: Dict[str, float] = {}
+    start = time.perf_counter()
+    pages = 0
+    async for result in WebScraper(config).iter_scrape_many(seeds):
+        pages += 1
+        finished[result["seed"]] = time.perf_counter() - start
+    return report("multi_seed", pages, time.perf_counter() - start, finished, seeds)
+
+
+def report(mode: str, pages: int, elapsed: float, finished: Dict[str, float],
+           seeds: List[Seed]) -> Dict[str, float]:
+    # The first seed is the large site
+    small = [finished[seed.url] for seed in seeds[1:] if seed.url in finished]
+    return {
+        "mode": mode,
+        "pages": pages,
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(pages / elapsed, 2) if elapsed else 0.0,
+        "small_seeds_done_p50_s": round(statistics.median(small), 3) if small else None,
+        "small_seeds_done_max_s": round(max(small), 3) if small else None,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    sites = [FixtureSite(FixtureSiteConfig(pages=args.big_pages, fanout=args.fanout))]
+    sites += [
+        FixtureSite(FixtureSiteConfig(pages=args.pages, fanout=args.fanout))
+        for _ in range(args.sites)
+    ]
+    with contextlib.ExitStack() as stack:
+        for site in sites:
+            stack.enter_context(site)
+        seeds = [Seed(sites[0].url(), max_pages=args.big_pages)]
+        seeds += [Seed(site.url()) for site in sites[1:]]
+        config = ScrapingConfig(
+            depth=args.big_pages,
+            max_pages=args.pages,
+            delay_ms=args.delay_ms,
+            concurrency=args.concurrency,
+            fetch_mode=args.fetch_mode,
+        )
+        for run in (run_sequential, run_multi_seed):
+            print(json.dumps(await run(config, seeds)), flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, default=20, help="Small sites besides the large one")
+    parser.add_argument("--pages", type=int, default=50, help="Pages per small site")
+    parser.add_argument("--big-pages", type=int, default=1000, help="Pages of the large site")
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--delay-ms", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--fetch-mode", choices=["browser", "hybrid"], default="hybrid")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
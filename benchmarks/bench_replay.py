@@ -0,0 +1,81 @@
+"""Compare re-crawling a fixture site live with replaying recorded snapshots.
+
+Crawls the site once with ``record_dir`` set, then runs the same extraction
+twice more: as a live crawl and as a :class:`ReplayScraper` over the
+snapshots. Prints pages/sec for each run, the store size and whether the
+replayed text, links and tables match the recorded crawl, as JSON.
+
+    python -m benchmarks.bench_replay --pages 200 --slow-every 4 --slow-ms 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from dataclasses import replace
+from typing import Any, Dict, List
+
+from scraper import ReplayScraper, ScrapingConfig, WebScraper
+
+from .fixture_site import FixtureSite, FixtureSiteConfig
+
+
+def store_size(root: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(dirpath, name))
+        for dirpath, _, names in os.walk(root)
+        for name in names
+    )
+
+
+def report(mode: str, results: List[Dict[str, Any]], elapsed: float, **extra) -> None:
+    print(json.dumps({
+        "mode": mode,
+        "pages": len(results),
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(len(results) / elapsed, 1),
+        **extra,
+    }), flush=True)
+
+
+def extracted(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {r["url"]: (r["text"], r["links"], r.get("tables")) for r in results}
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    site_config = FixtureSiteConfig(
+        pages=args.pages, fanout=args.fanout, slow_every=args.slow_every, slow_ms=args.slow_ms
+    )
+    with FixtureSite(site_config) as site, tempfile.TemporaryDirectory() as store:
+        config = ScrapingConfig(
+            depth=args.pages, max_pages=args.pages, concurrency=args.concurrency,
+            delay_ms=0, fetch_mode=args.fetch_mode, include_tables=True,
+        )
+        start = time.perf_counter()
+        recorded = await WebScraper(replace(config, record_dir=store)).scrape(site.url())
+        report("record", recorded, time.perf_counter() - start, store_kb=store_size(store) // 1024)
+
+        start = time.perf_counter()
+        live = await WebScraper(config).scrape(site.url())
+        report("live", live, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        replayed = await ReplayScraper(config, store).replay()
+        report("replay", replayed, time.perf_counter() - start,
+               matches_recording=extracted(replayed) == extracted(recorded))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--slow-every", type=int, default=4)
+    parser.add_argument("--slow-ms", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--fetch-mode", choices=["browser", "hybrid"], default="hybrid")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
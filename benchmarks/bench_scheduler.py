@@ -0,0 +1,59 @@
+"""Compare crawl throughput of the batch and worker-pool schedulers.
+
+Crawls a local fixture site where a fraction of pages respond slowly and
+prints pages/sec for each scheduler as JSON.
+
+    python -m benchmarks.bench_scheduler --pages 60 --slow-every 5 --slow-ms 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from scraper import ScrapingConfig, WebScraper
+
+from .fixture_site import FixtureSite, FixtureSiteConfig
+
+
+async def run_once(url: str, scheduler: str, args: argparse.Namespace) -> dict:
+    config = ScrapingConfig(
+        depth=args.depth,
+        max_pages=args.pages,
+        delay_ms=0,
+        concurrency=args.concurrency,
+        concurrent_batch=args.concurrency,
+        scheduler=scheduler,
+    )
+    start = time.perf_counter()
+    results = await WebScraper(config).scrape(url)
+    elapsed = time.perf_counter() - start
+    return {
+        "scheduler": scheduler,
+        "pages": len(results),
+        "errors": sum(1 for r in results if "error" in r),
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(len(results) / elapsed, 2) if elapsed else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--slow-every", type=int, default=5)
+    parser.add_argument("--slow-ms", type=int, default=2000)
+    args = parser.parse_args()
+
+    site_config = FixtureSiteConfig(
+        pages=args.pages, fanout=args.fanout, slow_every=args.slow_every, slow_ms=args.slow_ms
+    )
+    with FixtureSite(site_config) as site:
+        for scheduler in ("batch", "pool"):
+            report = asyncio.run(run_once(site.url(), scheduler, args))
+            print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure how crawl throughput scales with --workers on a local fixture site.
+
+The fixture site runs in its own process so serving pages does not compete
+with the coordinator for the GIL. Each run crawls the same pages with a
+``ShardedCrawler`` and prints pages/sec and the speedup over one worker as
+JSON. The site has one host, so URLs are sharded by URL hash by default.
+
+    python -m benchmarks.bench_sharding --pages 2000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import multiprocessing
+import time
+
+from scraper import ScrapingConfig, ShardedCrawler
+
+from .fixture_site import FixtureSite, FixtureSiteConfig
+
+
+def serve_fixture(site_config: FixtureSiteConfig, conn, stop) -> None:
+    with FixtureSite(site_config) as site:
+        conn.send(site.url())
+        stop.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--paragraphs", type=int, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--fetch-mode", choices=["browser", "hybrid"], default="hybrid")
+    parser.add_argument("--shard-by", choices=["host", "url"], default="url")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    site_config = FixtureSiteConfig(pages=args.pages, fanout=args.fanout, paragraphs=args.paragraphs)
+    parent, child = ctx.Pipe()
+    stop = ctx.Event()
+    server = ctx.Process(target=serve_fixture, args=(site_config, child, stop), daemon=True)
+    server.start()
+    try:
+        url = parent.recv()
+        baseline = None
+        for workers in args.workers:
+            config = ScrapingConfig(
+                depth=args.pages,
+                max_pages=args.pages,
+                delay_ms=0,
+                concurrency=args.concurrency,
+                fetch_mode=args.fetch_mode,
+            )
+            crawler = ShardedCrawler(config, workers, shard_by=args.shard_by)
+            start = time.perf_counter()
+            pages = sum(1 for _ in crawler.iter_lines(url))
+            elapsed = time.perf_counter() - start
+            rate = pages / elapsed if elapsed else 0.0
+            baseline = baseline or rate
+            print(json.dumps({
+                "workers": workers,
+                "pages": pages,
+                "seconds": round(elapsed, 3),
+                "pages_per_sec": round(rate, 2),
+                "speedup": round(rate / baseline, 2) if baseline else None,
+            }), flush=True)
+    finally:
+        stop.set()
+        server.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
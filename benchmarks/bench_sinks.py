@@ -0,0 +1,117 @@
+"""Compare per-record NDJSON writes with the batched result sinks.
+
+Writes ``--records`` synthetic results of about ``--text-kb`` KB each and
+reports records/sec, the output size and the longest event-loop stall
+seen by a 1 ms ticker running alongside, as JSON. ``direct`` serializes
+and writes each record on the event loop with a flush per record (the
+stdout path with ``--flush-every 1``). ``--disk-latency-ms`` adds a
+blocking sleep to every flush or batch write to model a slow disk.
+
+    python -m benchmarks.bench_sinks --records 20000 --text-kb 4 --disk-latency-ms 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from scraper import NDJSONSink
+
+
+class SlowNDJSONSink(NDJSONSink):
+    def __init__(self, path: str, latency: float) -> None:
+        super().__init__(path)
+        self.latency = latency
+
+    def _write_sync(self, batch) -> None:
+        time.sleep(self.latency)
+        super()._write_sync(batch)
+
+
+def make_record(i: int, text_kb: int) -> Dict[str, Any]:
+    words = " ".join(f"word{(i * 7 + j) % 5000}" for j in range(text_kb * 128))
+    return {
+        "url": f"https://example.com/page/{i}",
+        "text": words,
+        "links": [{"href": f"https://example.com/page/{i + k}", "text": f"Page {i + k}"} for k in range(20)],
+        "depth": i % 5,
+    }
+
+
+class StallMeter:
+    """Longest gap between ticks of a 1 ms timer, i.e. the worst event-loop stall"""
+
+    def __init__(self) -> None:
+        self.worst = 0.0
+        self._task = None
+
+    async def _tick(self) -> None:
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            self.worst = max(self.worst, now - last)
+            last = now
+
+    def __enter__(self) -> "StallMeter":
+        self._task = asyncio.ensure_future(self._tick())
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._task.cancel()
+
+
+async def write_direct(records: List[Dict[str, Any]], path: str, latency: float) -> None:
+    with open(path, "w", encoding="utf-8") as out:
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False))
+            out.write("\n")
+            out.flush()
+            if latency:
+                time.sleep(latency)
+            await asyncio.sleep(0)
+
+
+async def write_sink(records: List[Dict[str, Any]], path: str, latency: float) -> None:
+    async with SlowNDJSONSink(path, latency) as sink:
+        for record in records:
+            await sink.write(record)
+            await asyncio.sleep(0)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    records = [make_record(i, args.text_kb) for i in range(args.records)]
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = [
+            ("direct", write_direct, "direct.ndjson"),
+            ("sink", write_sink, "sink.ndjson"),
+            ("sink_gzip", write_sink, "sink.ndjson.gz"),
+        ]
+        for mode, run, name in runs:
+            path = os.path.join(tmp, name)
+            start = time.perf_counter()
+            with StallMeter() as stalls:
+                await run(records, path, args.disk_latency_ms / 1000)
+            elapsed = time.perf_counter() - start
+            print(json.dumps({
+                "mode": mode,
+                "records": len(records),
+                "seconds": round(elapsed, 3),
+                "records_per_sec": round(len(records) / elapsed, 1),
+                "mb": round(os.path.getsize(path) / 2 ** 20, 2),
+                "max_loop_stall_ms": round(stalls.worst * 1000, 2),
+            }), flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--text-kb", type=int, default=4)
+    parser.add_argument("--disk-latency-ms", type=float, default=0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Time link cleaning and frontier filtering on link-heavy pages.
+
+Builds synthetic pages whose links mix shared navigation, relative and
+absolute URLs, tracking parameters, assets and off-site links, then runs
+both steps with per-link ``URLNormalizer`` calls (the previous code path)
+and with a ``URLPolicy``. Prints links/sec for each as JSON.
+
+    python -m benchmarks.bench_url_policy --pages 200 --links 2000
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from scraper import URLNormalizer, URLPolicy
+
+
+def make_pages(pages: int, links: int, unique: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    nav = [{"href": f"/section/{i}/", "text": f"Section {i}"} for i in range(50)]
+    out = []
+    for n in range(pages):
+        page_links = list(nav)
+        while len(page_links) < links:
+            i = rng.randrange(unique)
+            kind = rng.random()
+            if kind < 0.4:
+                href = f"/item/{i}?utm_source=news&ref={i % 7}"
+            elif kind < 0.7:
+                href = f"https://www.example.com/item/{i}/"
+            elif kind < 0.8:
+                href = f"/static/img/{i}.jpg"
+            elif kind < 0.9:
+                href = f"https://other.example.org/{i}"
+            else:
+                href = f"#anchor-{i}"
+            page_links.append({"href": href, "text": f"link {i}"})
+        out.append((f"https://example.com/page/{n}", page_links))
+    return out
+
+
+def legacy(pages: list, start_url: str) -> int:
+    """The per-link normalize/same_domain/re.search path URLPolicy replaces"""
+    kept = 0
+    for base_url, links in pages:
+        cleaned = []
+        for link in links:
+            href = (link.get("href") or "").strip()
+            if not href or href.startswith(("#", "javascript:", "mailto:", "tel:")):
+                continue
+            cleaned.append({"text": link.get("text", ""), "href": URLNormalizer.absolutize(base_url, href)})
+        dedup = {}
+        for item in cleaned:
+            href_n = URLNormalizer.normalize_url(item["href"])
+            if href_n not in dedup or (not dedup[href_n] and item["text"]):
+                dedup[href_n] = item["text"]
+        for href in dedup:
+            href = URLNormalizer.normalize_url(href)
+            if URLNormalizer.same_domain(start_url, href):
+                if re.search(r"\.(pdf|zip|jpg|jpeg|png|gif|webp|mp4|mov|avi|mp3)(\?.*)?$", href, re.I):
+                    continue
+                kept += 1
+    return kept
+
+
+def with_policy(pages: list, policy: URLPolicy) -> int:
+    kept = 0
+    for base_url, links in pages:
+        cleaned = policy.clean_links(links, base_url)
+        kept += len(policy.filter_links(cleaned))
+    return kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--links", type=int, default=2000)
+    parser.add_argument("--unique", type=int, default=20_000,
+                        help="Distinct link targets across all pages")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages, args.links, args.unique)
+    total = sum(len(links) for _, links in pages)
+    start_url = "https://example.com"
+    runs = {
+        "normalizer": lambda: legacy(pages, start_url),
+        "policy": lambda: with_policy(pages, URLPolicy(seeds=[start_url])),
+        "policy+strip": lambda: with_policy(
+            pages, URLPolicy(seeds=[start_url], strip_params=["utm_*"])
+        ),
+    }
+    for name, run in runs.items():
+        best, kept = float("inf"), 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            kept = run()
+            best = min(best, time.perf_counter() - start)
+        print(json.dumps({
+            "path": name,
+            "links": total,
+            "kept": kept,
+            "seconds": round(best, 3),
+            "links_per_sec": round(total / best),
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Measure memory and throughput of the visited-URL stores and the spilling frontier.
+
+Each (store, size) pair runs in a fresh subprocess so peak RSS is not
+polluted by earlier runs. Prints one JSON line per measurement.
+
+    python -m benchmarks.bench_url_store --sizes 1000000 10000000
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _url(i: int) -> str:
+    return f"https://example.com/section/{i % 997}/item/{i}?page={i % 13}"
+
+
+def measure_store(kind: str, size: int, fp_rate: float) -> dict:
+    from scraper.seen_store import make_seen_store
+
+    base = _peak_rss_mb()
+    store = make_seen_store(kind, capacity=size, fp_rate=fp_rate)
+    start = time.perf_counter()
+    for i in range(size):
+        store.add(_url(i))
+    add_s = time.perf_counter() - start
+
+    probes = min(size, 1_000_000)
+    start = time.perf_counter()
+    hits = sum(1 for i in range(probes) if _url(i) in store)
+    misses = sum(1 for i in range(probes) if _url(size + i) in store)
+    lookup_s = time.perf_counter() - start
+    return {
+        "bench": "seen_store",
+        "store": kind,
+        "urls": size,
+        "rss_mb": round(_peak_rss_mb() - base, 1),
+        "adds_per_sec": round(size / add_s),
+        "lookups_per_sec": round(2 * probes / lookup_s),
+        "recall": round(hits / probes, 6),
+        "false_positive_rate": round(misses / probes, 6),
+    }
+
+
+def measure_frontier(size: int, memory_limit: int) -> dict:
+    from scraper.frontier import SpillingFrontier
+
+    base = _peak_rss_mb()
+    with tempfile.TemporaryDirectory() as spill_dir:
+        frontier = SpillingFrontier(memory_limit=memory_limit, spill_dir=spill_dir)
+        start = time.perf_counter()
+        for i in range(size):
+            frontier.append((_url(i), i % 8))
+        push_s = time.perf_counter() - start
+        peak_spilled = frontier.spilled
+        start = time.perf_counter()
+        while frontier:
+            frontier.popleft()
+        pop_s = time.perf_counter() - start
+        frontier.close()
+    return {
+        "bench": "frontier",
+        "memory_limit": memory_limit,
+        "urls": size,
+        "spilled": peak_spilled,
+        "rss_mb": round(_peak_rss_mb() - base, 1),
+        "appends_per_sec": round(size / push_s),
+        "pops_per_sec": round(size / pop_s),
+    }
+
+
+def _run_child(args: list) -> None:
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_url_store", "--child", *args],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        print(json.dumps({"error": proc.stderr.strip().splitlines()[-1:], "args": args}))
+    else:
+        print(proc.stdout.strip(), flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--stores", nargs="+", default=["set", "fingerprint", "bloom"],
+                        choices=["set", "fingerprint", "bloom"])
+    parser.add_argument("--bloom-fp-rate", type=float, default=0.001)
+    parser.add_argument("--frontier-memory-limit", type=int, default=100_000)
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        what, size = args.child[0], int(args.child[1])
+        if what == "frontier":
+            report = measure_frontier(size, int(args.child[2]))
+        else:
+            report = measure_store(what, size, float(args.child[2]))
+        print(json.dumps(report))
+        return
+
+    for size in args.sizes:
+        for kind in args.stores:
+            _run_child([kind, str(size), str(args.bloom_fp_rate)])
+        _run_child(["frontier", str(size), "0"])
+        _run_child(["frontier", str(size), str(args.frontier_memory_limit)])
+
+
+if __name__ == "__main__":
+    main()
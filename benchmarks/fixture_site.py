@@ -0,0 +1,231 @@
+"""Local fixture site for benchmarks.
+
+Serves a synthetic site from a background thread so benchmarks can crawl it
+without touching the network. Pages are ``/page/<n>``; each links to the next
+``fanout`` pages, and every ``slow_every``-th page sleeps ``slow_ms`` before
+responding. Pages carry an ``ETag`` and answer ``If-None-Match`` with 304.
+
+Optional content, all off by default:
+
+- ``tables`` tables of ``table_rows`` rows per page, and ``dom_nodes``
+  extra elements without text to make the DOM bigger.
+- Every ``scroll_every``-th page is an infinite-scroll feed: it starts with
+  ``feed_batch`` items and loads ``feed_batch`` more from
+  ``/feed/<n>/<offset>`` whenever it is scrolled to the bottom, up to
+  ``feed_items``. With ``feed_virtualized`` only the last ``feed_window``
+  items stay in the DOM, behind a spacer, like a virtualized list. With
+  ``feed_divs`` items are ``<div>`` elements holding bare text rather than
+  ``<article><p>``.
+- Every ``trap_every``-th page links to ``/trap``, an endless archive:
+  each of its pages links one level deeper (``/archive``, ``/older``) and
+  to three more ``?session=`` variants of itself.
+"""
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass
+class FixtureSiteConfig:
+    pages: int = 100
+    fanout: int = 5
+    slow_every: int = 0
+    slow_ms: int = 0
+    paragraphs: int = 5
+    tables: int = 0
+    table_rows: int = 20
+    dom_nodes: int = 0
+    scroll_every: int = 0
+    feed_items: int = 200
+    feed_batch: int = 20
+    feed_virtualized: bool = False
+    feed_window: int = 40
+    feed_divs: bool = False
+    trap_every: int = 0
+
+
+# Fixed item height, so a virtualized feed can stand in removed items with a spacer
+_FEED_ITEM_PX = 80
+
+_FEED_SCRIPT = """<script>
+(() => {
+  const feed = document.getElementById("feed"), spacer = document.getElementById("spacer");
+  let offset = %(batch)d, removed = 0, loading = false;
+  addEventListener("scroll", async () => {
+    if (loading || offset >= %(total)d) return;
+    if (innerHeight + scrollY < document.body.scrollHeight - 200) return;
+    loading = true;
+    const html = await (await fetch("/feed/%(n)d/" + offset)).text();
+    feed.insertAdjacentHTML("beforeend", html);
+    offset += %(batch)d;
+    while (%(virtualized)s && feed.children.length > %(window)d) {
+      feed.firstElementChild.remove();
+      removed++;
+    }
+    spacer.style.height = removed * %(item_px)d + "px";
+    loading = false;
+  });
+})();
+</script>"""
+
+
+class FixtureSite:
+    """Threaded HTTP server serving a generated site"""
+
+    def __init__(self, config: FixtureSiteConfig | None = None, host: str = "127.0.0.1") -> None:
+        self.config = config or FixtureSiteConfig()
+        self.host = host
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None, "FixtureSite is not running"
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    def url(self, path: str = "/page/0") -> str:
+        return self.base_url + path
+
+    def render_page(self, n: int) -> str:
+        cfg = self.config
+        links = "".join(
+            f'<li><a href="/page/{(n * cfg.fanout + i + 1) % cfg.pages}">Page {(n * cfg.fanout + i + 1) % cfg.pages}</a></li>'
+            for i in range(cfg.fanout)
+        )
+        if self._every(n, cfg.trap_every):
+            links += '<li><a href="/trap">Archive</a></li>'
+        paras = "".join(
+            f"<p>Page {n} paragraph {i}: lorem ipsum dolor sit amet.</p>" for i in range(cfg.paragraphs)
+        )
+        tables = "".join(self.render_table(n, t) for t in range(cfg.tables))
+        filler = "".join('<div class="f"><span></span></div>' for _ in range(cfg.dom_nodes // 2))
+        feed = ""
+        if self._every(n, cfg.scroll_every):
+            feed = (
+                f'<style>.item{{height:{_FEED_ITEM_PX}px;overflow:hidden}}</style>'
+                f'<div id="spacer"></div><div id="feed">{self.render_feed(n, 0)}</div>'
+                + _FEED_SCRIPT % {
+                    "n": n, "batch": cfg.feed_batch, "total": cfg.feed_items,
+                    "virtualized": "true" if cfg.feed_virtualized else "false",
+                    "window": cfg.feed_window, "item_px": _FEED_ITEM_PX,
+                }
+            )
+        return (
+            f"<!doctype html><html><head><title>Page {n}</title></head><body>"
+            f"<main><h1>Page {n}</h1>{paras}{tables}<ul>{links}</ul>{feed}</main>"
+            f"<aside>{filler}</aside></body></html>"
+        )
+
+    def render_table(self, n: int, t: int) -> str:
+        rows = "".join(
+            f"<tr><td>{n}</td><td>{t}</td><td>{r}</td><td>{(n * 31 + t * 7 + r) % 1000}</td></tr>"
+            for r in range(self.config.table_rows)
+        )
+        return (
+            "<table><thead><tr><th>Page</th><th>Table</th><th>Row</th><th>Value</th></tr></thead>"
+            f"<tbody>{rows}</tbody></table>"
+        )
+
+    def render_feed(self, n: int, offset: int) -> str:
+        cfg = self.config
+        end = min(offset + cfg.feed_batch, cfg.feed_items)
+        if cfg.feed_divs:
+            return "".join(
+                f'<div class="item">Feed {n} item {i}: lorem ipsum dolor sit amet. '
+                f'<a href="/page/{(n + i) % cfg.pages}">Item {i}</a></div>'
+                for i in range(offset, end)
+            )
+        return "".join(
+            f'<article class="item"><p>Feed {n} item {i}: lorem ipsum dolor sit amet.</p>'
+            f'<a href="/page/{(n + i) % cfg.pages}">Item {i}</a></article>'
+            for i in range(offset, end)
+        )
+
+    def render_trap(self, path: str, query: str) -> str:
+        session = int(query.rpartition("=")[2]) if query.startswith("session=") else 0
+        base = path.rstrip("/")
+        links = "".join(
+            f'<a href="{base}/{name}">{name}</a> ' for name in ("archive", "older")
+        ) + "".join(
+            f'<a href="{base}?session={session + i}">Session {session + i}</a> ' for i in (1, 2, 3)
+        )
+        return (
+            f"<!doctype html><html><head><title>Archive</title></head><body>"
+            f"<main><h1>Archive {path}</h1><p>Session {session}: older entries.</p>"
+            f"{links}</main></body></html>"
+        )
+
+    def is_slow(self, n: int) -> bool:
+        return bool(self.config.slow_ms) and self._every(n, self.config.slow_every)
+
+    @staticmethod
+    def _every(n: int, every: int) -> bool:
+        return bool(every) and n % every == every - 1
+
+    def _make_handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                path, _, query = self.path.partition("?")
+                parts = path.strip("/").split("/")
+                if parts[0] == "trap":
+                    self._send(site.render_trap(path, query))
+                    return
+                if not all(part.isdigit() for part in parts[1:]):
+                    self.send_error(404)
+                    return
+                if parts[0] == "feed" and len(parts) == 3:
+                    self._send(site.render_feed(int(parts[1]), int(parts[2])))
+                    return
+                if parts[0] != "page" or len(parts) != 2:
+                    self.send_error(404)
+                    return
+                n = int(parts[1])
+                if n >= site.config.pages:
+                    self.send_error(404)
+                    return
+                if site.is_slow(n):
+                    time.sleep(site.config.slow_ms / 1000)
+                self._send(site.render_page(n))
+
+            def _send(self, html: str) -> None:
+                body = html.encode("utf-8")
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "FixtureSite":
+        self._server = ThreadingHTTPServer((self.host, 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FixtureSite":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,319 @@
+"""Run the benchmark scenarios and report throughput, latency and memory as JSON.
+
+Each scenario serves a generated fixture site (see ``fixture_site.py``) and
+crawls it with ``WebScraper`` under its own ``ScrapingConfig`` settings. Each
+run happens in a fresh process, so peak memory is measured per scenario.
+The site is served from this process, so it does not compete with the
+crawler for the GIL. Prints one JSON line per scenario with:
+
+- ``pages_per_sec``, the median of ``--repeat`` runs
+- p50/p95/p99 page latency from the crawl metrics
+- peak RSS of the crawler process
+- peak memory of its Playwright driver and browser processes (PSS where
+  the kernel reports it)
+
+``--output`` writes all results together with the scraper version, git commit
+and machine they came from. ``--baseline`` compares with such a file and exits
+with status 1 when a scenario got slower or bigger than ``--tolerance`` allows.
+
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --scenario static --scenario traps --scale 0.2 --baseline bench.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from importlib import metadata
+from typing import Any, Dict, List, Optional
+
+from scraper import ScrapingConfig, WebScraper
+
+from .fixture_site import FixtureSite, FixtureSiteConfig
+
+
+@dataclass
+class Scenario:
+    description: str
+    site: FixtureSiteConfig
+    config: Dict[str, Any] = field(default_factory=dict)
+    # ``max_pages`` as a multiple of the site's page count
+    budget: float = 1.0
+
+
+# Settings shared by every scenario
+_BASE_CONFIG = dict(depth=1000, delay_ms=0, concurrency=8, metrics=True)
+
+SCENARIOS: Dict[str, Scenario] = {
+    "static": Scenario(
+        "Plain pages over HTTP (hybrid fetch mode)",
+        FixtureSiteConfig(pages=400, fanout=5),
+        dict(fetch_mode="hybrid"),
+    ),
+    "browser": Scenario(
+        "Plain pages rendered in the browser",
+        FixtureSiteConfig(pages=100, fanout=5),
+        dict(page_pool_size=8),
+    ),
+    "slow_endpoints": Scenario(
+        "Every 5th page answers after 300 ms (hybrid)",
+        FixtureSiteConfig(pages=200, fanout=5, slow_every=5, slow_ms=300),
+        dict(fetch_mode="hybrid"),
+    ),
+    "large_dom": Scenario(
+        "200 paragraphs and 5000 extra elements per page (browser)",
+        FixtureSiteConfig(pages=50, fanout=5, paragraphs=200, dom_nodes=5000),
+        dict(page_pool_size=8),
+    ),
+    "tables": Scenario(
+        "Five 50-row tables per page, table extraction on (hybrid)",
+        FixtureSiteConfig(pages=200, fanout=5, tables=5, table_rows=50),
+        dict(fetch_mode="hybrid", include_tables=True),
+    ),
+    "infinite_scroll": Scenario(
+        "200-item infinite-scroll feeds, scrolled until the end (browser)",
+        FixtureSiteConfig(pages=20, fanout=3, scroll_every=1, feed_items=200),
+        dict(page_pool_size=8, scroll_until_end=True, scroll_wait_ms=200),
+    ),
+    "virtualized_harvest": Scenario(
+        "Virtualized 200-item feeds with --scroll-harvest (browser)",
+        FixtureSiteConfig(pages=20, fanout=3, scroll_every=1, feed_items=200, feed_virtualized=True),
+        dict(page_pool_size=8, scroll_harvest=True, scroll_wait_ms=200),
+    ),
+    "traps": Scenario(
+        "Every 3rd page links into an endless archive; trap detection on, budget 2x the site (hybrid)",
+        FixtureSiteConfig(pages=200, fanout=5, trap_every=3),
+        # The priority frontier keeps every queued link, so the budget is spent on traps
+        dict(fetch_mode="hybrid", frontier="priority", max_segment_repeats=2, max_query_variants=3),
+        budget=2.0,
+    ),
+}
+
+
+class ProcessTreeMemory:
+    """Samples the summed memory of a process's descendants in a background thread.
+
+    Reads ``/proc`` (Linux only) and prefers PSS, which splits pages that
+    browser processes share, over RSS. ``peak_mb`` is None if ``/proc``
+    cannot be read.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.25) -> None:
+        self.pid = pid
+        self.interval = interval
+        self.peak_mb: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self) -> "ProcessTreeMemory":
+        if os.path.isdir("/proc"):
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            kb = sum(self._memory_kb(pid) for pid in self._descendants())
+            self.peak_mb = max(self.peak_mb or 0.0, kb / 1024)
+
+    def _descendants(self) -> List[int]:
+        children: Dict[int, List[int]] = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    # The command name may contain spaces; fields resume after its ")"
+                    ppid = int(f.read().rpartition(")")[2].split()[1])
+            except (OSError, ValueError, IndexError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+        found, stack = [], [self.pid]
+        while stack:
+            for child in children.get(stack.pop(), []):
+                found.append(child)
+                stack.append(child)
+        return found
+
+    @staticmethod
+    def _memory_kb(pid: int) -> int:
+        try:
+            with open(f"/proc/{pid}/smaps_rollup") as f:
+                for line in f:
+                    if line.startswith("Pss:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+        except (OSError, ValueError, IndexError):
+            return 0
+
+
+def scaled(scenario: Scenario, scale: float) -> Scenario:
+    return replace(scenario, site=replace(scenario.site, pages=max(10, round(scenario.site.pages * scale))))
+
+
+async def crawl(scenario: Scenario, url: str) -> Dict[str, Any]:
+    max_pages = round(scenario.site.pages * scenario.budget)
+    config = ScrapingConfig(**{**_BASE_CONFIG, "max_pages": max_pages, **scenario.config})
+    scraper = WebScraper(config)
+    start = time.perf_counter()
+    results = await scraper.scrape(url)
+    elapsed = time.perf_counter() - start
+    total = scraper.metrics.histograms.get("total")
+    latency = total.summary() if total is not None else {}
+    return {
+        "pages": len(results),
+        "errors": sum(1 for r in results if "error" in r),
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(len(results) / elapsed, 2) if elapsed else None,
+        "latency_ms": {k: latency[k] for k in ("p50_ms", "p95_ms", "p99_ms", "max_ms") if k in latency},
+        "stats": {k: v for k, v in scraper.stats().items() if k != "pages_visited"},
+    }
+
+
+def run_child(scenario: Scenario, url: str, conn) -> None:
+    """Crawl in this (fresh) process and send back the report"""
+    with ProcessTreeMemory(os.getpid()) as browser_memory:
+        try:
+            report = asyncio.run(crawl(scenario, url))
+        except Exception as e:
+            # Playwright errors can run to many lines (install hints); keep the first
+            report = {"error": f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"}
+    # ru_maxrss is in KB on Linux
+    report["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    report["browser_peak_mb"] = (
+        round(browser_memory.peak_mb, 1) if browser_memory.peak_mb is not None else None
+    )
+    conn.send(report)
+    conn.close()
+
+
+def run_scenario(name: str, scenario: Scenario, repeat: int) -> Dict[str, Any]:
+    ctx = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        with FixtureSite(scenario.site) as site:
+            recv, send = ctx.Pipe(duplex=False)
+            child = ctx.Process(target=run_child, args=(scenario, site.url(), send))
+            child.start()
+            send.close()
+            try:
+                runs.append(recv.recv())
+            except EOFError:
+                runs.append({"error": f"benchmark process exited with {child.exitcode}"})
+            child.join()
+        if "error" in runs[-1]:
+            return {"scenario": name, **runs[-1]}
+    # Report the median run, with the spread of all runs
+    runs.sort(key=lambda run: run["pages_per_sec"] or 0)
+    report = {"scenario": name, **runs[len(runs) // 2]}
+    report["runs_pages_per_sec"] = [run["pages_per_sec"] for run in runs]
+    report["peak_rss_mb"] = max(run["peak_rss_mb"] for run in runs)
+    return report
+
+
+def compare(report: Dict[str, Any], base: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    """Relative change against a baseline report; slower or bigger than ``tolerance`` regresses"""
+    change: Dict[str, Any] = {"regressed": False}
+    for key, worse_if_higher in (("pages_per_sec", False), ("peak_rss_mb", True),
+                                 ("browser_peak_mb", True)):
+        new, old = report.get(key), base.get(key)
+        if not new or not old:
+            continue
+        ratio = new / old
+        change[key] = round(ratio - 1, 3)
+        if (ratio > 1 + tolerance) if worse_if_higher else (ratio < 1 - tolerance):
+            change["regressed"] = True
+    return change
+
+
+def _version(package: str) -> Optional[str]:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "scraper": _version("scraper"),
+        "playwright": _version("playwright"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Run only this scenario; repeatable (default: all)")
+    parser.add_argument("--list", action="store_true", help="List the scenarios and exit")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario; the median is reported")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every site's page count")
+    parser.add_argument("--output", default=None, help="Write all results with environment info to this file")
+    parser.add_argument("--baseline", default=None, help="Compare with a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Relative slowdown or memory growth counted as a regression")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, scenario in SCENARIOS.items():
+            print(json.dumps({"scenario": name, "description": scenario.description}))
+        return
+
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = {r["scenario"]: r for r in json.load(f)["results"]}
+
+    results = []
+    regressed = False
+    for name in args.scenario or list(SCENARIOS):
+        report = run_scenario(name, scaled(SCENARIOS[name], args.scale), max(1, args.repeat))
+        base = baseline.get(name)
+        if base is not None and "error" not in base:
+            # A scenario that used to run and now fails counts as a regression
+            report["baseline"] = (
+                {"regressed": True} if "error" in report else compare(report, base, args.tolerance)
+            )
+            regressed = regressed or report["baseline"]["regressed"]
+        results.append(report)
+        print(json.dumps(report), flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "scale": args.scale, "results": results}, f, indent=2)
+    if regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,27 @@ from .page_automator import PageAutomator
 from .content_extractor import ContentExtractor
 from .web_scraper import WebScraper
 from .js_manager import JsManager
+from .politeness import PolitenessScheduler
+from .page_pool import PagePool
+from .resource_blocker import ResourceBlocker
+from .static_fetcher import StaticFetcher, StaticPageParser
+from .wait_engine import WaitEngine
+from .crawl_state import CrawlStateStore
+from .recrawl_index import RecrawlIndex
+from .seen_store import BloomFilter, FingerprintSet, make_seen_store
+from .frontier import SpillingFrontier
+from .priority_frontier import PriorityFrontier, URLScorer
+from .url_policy import URLPolicy
+from .near_duplicates import NearDuplicateDetector, SimHashIndex, simhash
+from .trap_detector import TrapDetector
+from .sharded import ShardedCrawler
+from .browser_session import BrowserSession
+from .daemon import DaemonClient, ScrapeDaemon
+from .seeds import Seed, load_seeds
+from .metrics import CrawlMetrics, LatencyHistogram
+from .sinks import NDJSONSink, ResultSink, TableSink, flatten_tables
+from .snapshots import PageSnapshot, SnapshotStore
+from .replay import ReplayScraper
 
 __all__ = [
     "ScrapingConfig",
@@ -12,4 +33,38 @@ __all__ = [
     "ContentExtractor",
     "WebScraper",
     "JsManager",
+    "PolitenessScheduler",
+    "PagePool",
+    "ResourceBlocker",
+    "StaticFetcher",
+    "StaticPageParser",
+    "WaitEngine",
+    "CrawlStateStore",
+    "RecrawlIndex",
+    "BloomFilter",
+    "FingerprintSet",
+    "make_seen_store",
+    "SpillingFrontier",
+    "PriorityFrontier",
+    "URLScorer",
+    "URLPolicy",
+    "NearDuplicateDetector",
+    "SimHashIndex",
+    "simhash",
+    "TrapDetector",
+    "ShardedCrawler",
+    "BrowserSession",
+    "ScrapeDaemon",
+    "DaemonClient",
+    "Seed",
+    "load_seeds",
+    "CrawlMetrics",
+    "LatencyHistogram",
+    "ResultSink",
+    "NDJSONSink",
+    "TableSink",
+    "flatten_tables",
+    "SnapshotStore",
+    "PageSnapshot",
+    "ReplayScraper",
 ]
@@ -1,10 +1,20 @@
 import asyncio
 import argparse
+import contextlib
 import json
-from typing import List, Dict, Any
+import os
+import sys
+from dataclasses import fields
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Dict, Any, Optional, TextIO, Tuple
 
 from .scraping_config import ScrapingConfig
 from .web_scraper import WebScraper
+from .crawl_state import CrawlStateStore
+from .sharded import ShardedCrawler
+from .daemon import DaemonClient, ScrapeDaemon
+from .seeds import load_seeds
+from .sinks import NDJSONSink, Record, ResultSink, TableSink
+from .replay import ReplayScraper
 
 
 class ScraperCLI:
@@ -16,19 +26,52 @@ class ScraperCLI:
         parser = argparse.ArgumentParser(
             description="Playwright scraper with optional JS automation (scroll/click/eval)"
         )
-        parser.add_argument("url", help="Start URL")
+        parser.add_argument("url", nargs="?",
+                          help="Start URL (optional with --resume, --seeds, --replay or --serve)")
+        parser.add_argument("--seeds", default=None, metavar="FILE",
+                          help="Crawl every seed in FILE in one browser session: one URL or "
+                               "JSON object {\"url\", \"depth\", \"max_pages\"} per line")
         parser.add_argument("--depth", type=int, default=0, help="Crawl depth (0 = single page)")
         parser.add_argument("--max-pages", type=int, default=50, help="Max pages (safety cap)")
-        parser.add_argument("--delay-ms", type=int, default=500, help="Delay between page visits")
+        parser.add_argument("--delay-ms", type=int, default=500,
+                          help="Pause after each page visit, per worker")
+        parser.add_argument("--host-delay-ms", type=int, default=0,
+                          help="Minimum delay between page visits to the same host (0 = none)")
+        parser.add_argument("--per-host-concurrency", type=int, default=0,
+                          help="Max concurrent pages per host (0 = no per-host cap)")
         parser.add_argument("--concurrency", type=int, default=5, help="Concurrent pages")
         parser.add_argument("--concurrent-batch", type=int, default=10, 
-                          help="Batch size before expanding frontier")
+                          help="Batch size before expanding frontier (batch scheduler)")
+        parser.add_argument("--scheduler", choices=["pool", "batch"], default="pool",
+                          help="pool: workers expand the frontier per page; batch: drain batches")
+        parser.add_argument("--workers", type=int, default=1,
+                          help="Crawl with N processes, each with its own browser, sharding URLs by host")
+        parser.add_argument("--shard-by", choices=["host", "url"], default="host",
+                          help="Shard key for --workers; url also spreads a single host over all workers")
         parser.add_argument("--headful", action="store_true", help="Show the browser window")
+        parser.add_argument("--fetch-mode", choices=["browser", "hybrid"], default="browser",
+                          help="hybrid: fetch over HTTP first, render in the browser only when needed")
+
+        # Page/context pooling
+        parser.add_argument("--page-pool", type=int, default=0,
+                          help="Idle pages kept for reuse across visits (0 = new page per URL)")
+        parser.add_argument("--pool-contexts", type=int, default=1,
+                          help="Browser contexts to spread pages over")
+        parser.add_argument("--context-max-pages", type=int, default=0,
+                          help="Recycle a context after this many pages (0 = never)")
+        parser.add_argument("--context-max-memory-mb", type=int, default=0,
+                          help="Recycle a context once a page's JS heap exceeds this (0 = never)")
 
         # Navigation timeouts & UA/viewport
         parser.add_argument("--goto-timeout-ms", type=int, default=30000)
         parser.add_argument("--wait-timeout-ms", type=int, default=15000)
         parser.add_argument("--post-click-wait-ms", type=int, default=2000)
+        parser.add_argument("--wait-strategy", choices=["networkidle", "adaptive"], default="networkidle",
+                          help="adaptive: return once the DOM is quiet instead of waiting for networkidle")
+        parser.add_argument("--quiet-ms", type=int, default=300,
+                          help="DOM quiet period that ends an adaptive wait")
+        parser.add_argument("--max-wait-ms", type=int, default=5000,
+                          help="Upper bound for the post-load settle wait")
         parser.add_argument("--user-agent", default=None)
         parser.add_argument("--vw", type=int, default=1366)
         parser.add_argument("--vh", type=int, default=900)
@@ -42,15 +85,161 @@ class ScraperCLI:
         parser.add_argument("--scroll-wait-ms", type=int, default=1000, help="Wait between scrolls")
         parser.add_argument("--scroll-until-end", action="store_true", 
                           help="Keep scrolling until page height is stable")
+        parser.add_argument("--scroll-harvest", action="store_true",
+                          help="Scroll one viewport at a time and extract new content after each "
+                               "step (for virtualized feeds); --scrolls caps the steps")
+        parser.add_argument("--harvest-seen-limit", type=int, default=20000,
+                          help="Max items the page remembers to dedupe harvest steps")
         parser.add_argument("--eval-js", default=None, help="Custom JS (inline) to run on each page")
         parser.add_argument("--eval-js-file", default=None, 
                           help="Path to a JS file to run on each page")
 
         # Extraction toggles
         parser.add_argument("--tables", action="store_true", help="Include table extraction")
+        parser.add_argument("--separate-extraction", action="store_true",
+                          help="Run the text/links/tables scripts separately instead of in one pass")
+
+        # Resource blocking
+        parser.add_argument("--block-preset", choices=["text-only", "no-media"], default=None,
+                          help="Block a preset set of subresources")
+        parser.add_argument("--block-type", action="append",
+                          help="Block a resource type (image, font, media, stylesheet, ...); repeatable")
+        parser.add_argument("--block-pattern", action="append",
+                          help="Block request URLs matching this glob; repeatable")
+        parser.add_argument("--block-third-party", action="store_true",
+                          help="Block subresources from other sites than the page")
+
+        # Output
+        parser.add_argument("--result-buffer", type=int, default=100,
+                          help="Max finished results held before the crawl waits for output")
+        parser.add_argument("--flush-every", type=int, default=1,
+                          help="Flush NDJSON output every N results")
+        parser.add_argument("--output", "-o", default=None, metavar="PATH",
+                          help="Write NDJSON to PATH instead of stdout, buffered off the event loop")
+        parser.add_argument("--compress", choices=["gzip", "zstd", "none"], default=None,
+                          help="Compression for --output (default: from the suffix, .gz or .zst)")
+        parser.add_argument("--rotate-mb", type=float, default=0,
+                          help="Start a new --output file after this many MB (0 = one file)")
+        parser.add_argument("--tables-out", default=None, metavar="PATH",
+                          help="Also write table rows to a Parquet (.parquet) or Arrow IPC file; "
+                               "needs pyarrow and --tables")
+
+        # URL policy
+        parser.add_argument("--include", action="append",
+                          help="Only crawl URLs matching this glob (or regex with a re: prefix); repeatable")
+        parser.add_argument("--exclude", action="append",
+                          help="Never crawl URLs matching this glob (or regex with a re: prefix); repeatable")
+        parser.add_argument("--deny-ext", action="append",
+                          help="Skip links with this file extension; repeatable (replaces the default list)")
+        parser.add_argument("--deny-mime", action="append",
+                          help="Skip extraction for responses whose Content-Type starts with this; repeatable")
+        parser.add_argument("--strip-param", action="append",
+                          help="Drop query parameters matching this glob from URLs; repeatable")
+        parser.add_argument("--strip-tracking-params", action="store_true",
+                          help="Drop utm_*, click-id and session-id query parameters from URLs")
+
+        # Frontier ordering
+        parser.add_argument("--frontier", choices=["fifo", "priority"], default="fifo",
+                          help="fifo: breadth-first; priority: best-first by score")
+        parser.add_argument("--depth-weight", type=float, default=1.0,
+                          help="Score penalty per level of depth (priority frontier)")
+        parser.add_argument("--priority-pattern", action="append", type=ScraperCLI.weight_arg,
+                          metavar="PATTERN=WEIGHT",
+                          help="Add WEIGHT to URLs matching a glob (or re: regex); repeatable")
+        parser.add_argument("--priority-keyword", action="append", type=ScraperCLI.weight_arg,
+                          metavar="WORD=WEIGHT",
+                          help="Add WEIGHT to links whose anchor text contains WORD; repeatable")
+        parser.add_argument("--path-budget", action="append", type=ScraperCLI.budget_arg,
+                          metavar="PREFIX=N",
+                          help="Visit at most N URLs under a path prefix (priority frontier); repeatable")
+
+        # Duplicates and traps
+        parser.add_argument("--near-duplicates", action="store_true",
+                          help="Flag pages whose text is a near-duplicate of an earlier page "
+                               "and do not follow their links")
+        parser.add_argument("--simhash-distance", type=int, default=3,
+                          help="Max differing SimHash bits for a near-duplicate")
+        parser.add_argument("--max-segment-repeats", type=int, default=0,
+                          help="Skip URLs repeating a path segment more than N times (0 = off)")
+        parser.add_argument("--max-query-variants", type=int, default=0,
+                          help="Queue at most N distinct query strings per path (0 = off)")
+
+        # Large crawls
+        parser.add_argument("--seen-store", choices=["set", "fingerprint", "bloom"], default="set",
+                          help="Visited-URL store: exact strings, 64-bit fingerprints, or a Bloom filter")
+        parser.add_argument("--bloom-fp-rate", type=float, default=0.001,
+                          help="Target false-positive rate for --seen-store bloom")
+        parser.add_argument("--frontier-memory-limit", type=int, default=0,
+                          help="Frontier entries kept in memory before spilling to disk (0 = no limit)")
+        parser.add_argument("--spill-dir", default=None, help="Directory for frontier spill files")
+
+        # Checkpointing
+        parser.add_argument("--state-file", default=None,
+                          help="Checkpoint crawl state to this SQLite file")
+        parser.add_argument("--checkpoint-interval-ms", type=int, default=1000,
+                          help="How often buffered state is written to the state file")
+        parser.add_argument("--resume", default=None, metavar="STATE_FILE",
+                          help="Resume the crawl recorded in STATE_FILE with its original settings")
+        parser.add_argument("--incremental", default=None, metavar="INDEX_FILE",
+                          help="Incremental recrawl: only emit pages that are new or changed since "
+                               "the crawls recorded in INDEX_FILE")
+        parser.add_argument("--record", default=None, metavar="DIR",
+                          help="Save each page's final DOM and network responses to a snapshot store in DIR")
+        parser.add_argument("--replay", default=None, metavar="DIR",
+                          help="Re-run extraction offline over the snapshots recorded in DIR")
+        parser.add_argument("--stats", action="store_true",
+                          help="Print crawl counters as JSON to stderr when done")
+
+        # Metrics
+        parser.add_argument("--metrics", action="store_true",
+                          help="Print per-phase latency percentiles, error counts and queue depth "
+                               "as JSON to stderr when done")
+        parser.add_argument("--metrics-file", default=None,
+                          help="Write metrics to this file: Prometheus text if it ends in .prom, else JSON")
+        parser.add_argument("--metrics-interval-ms", type=int, default=1000,
+                          help="How often queue depth is sampled")
+        parser.add_argument("--timings", action="store_true",
+                          help="Attach per-phase timings (ms) to each result")
+
+        # Daemon
+        parser.add_argument("--serve", action="store_true",
+                          help="Run as a daemon with a warm browser, accepting jobs on --socket or --port")
+        parser.add_argument("--socket", default=None, help="Unix socket path for --serve")
+        parser.add_argument("--port", type=int, default=8765, help="Local TCP port for --serve")
+        parser.add_argument("--max-concurrency", type=int, default=16,
+                          help="Pages open at once across all daemon jobs")
+        parser.add_argument("--job-max-pages", type=int, default=10000,
+                          help="Daemon: lower any job's --max-pages to this")
+        parser.add_argument("--allow-eval-js", action="store_true",
+                          help="Daemon: accept jobs that run their own eval_js script in the browser")
+        parser.add_argument("--lazy-launch", action="store_true",
+                          help="Daemon: launch the browser on the first job that needs it")
+        parser.add_argument("--daemon", default=None, metavar="ADDRESS",
+                          help="Send the crawl to a running daemon (socket path or host:port)")
+        parser.add_argument("--token", default=os.environ.get("SCRAPER_DAEMON_TOKEN"),
+                          help="Daemon token every job must carry (default: $SCRAPER_DAEMON_TOKEN; "
+                               "--serve over TCP generates one if unset)")
         
         return parser
 
+    @staticmethod
+    def weight_arg(value: str) -> Tuple[str, float]:
+        """Parse ``KEY=WEIGHT``; the key itself may contain ``=``"""
+        key, sep, weight = value.rpartition("=")
+        try:
+            if not (sep and key):
+                raise ValueError
+            return key, float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected KEY=WEIGHT, got {value!r}")
+
+    @staticmethod
+    def budget_arg(value: str) -> Tuple[str, int]:
+        prefix, weight = ScraperCLI.weight_arg(value)
+        if weight < 0 or weight != int(weight):
+            raise argparse.ArgumentTypeError(f"expected PREFIX=N with N >= 0, got {value!r}")
+        return prefix, int(weight)
+
     @staticmethod
     def parse_args_to_config(args: argparse.Namespace) -> ScrapingConfig:
         """Convert parsed arguments to ScrapingConfig"""
@@ -58,12 +247,23 @@ class ScraperCLI:
             depth=args.depth,
             max_pages=args.max_pages,
             delay_ms=args.delay_ms,
+            host_delay_ms=args.host_delay_ms,
+            per_host_concurrency=args.per_host_concurrency,
             concurrency=args.concurrency,
             concurrent_batch=args.concurrent_batch,
+            scheduler=args.scheduler,
             headful=args.headful,
+            fetch_mode=args.fetch_mode,
+            page_pool_size=args.page_pool,
+            pool_contexts=args.pool_contexts,
+            context_max_pages=args.context_max_pages,
+            context_max_memory_mb=args.context_max_memory_mb,
             goto_timeout_ms=args.goto_timeout_ms,
             wait_timeout_ms=args.wait_timeout_ms,
             post_click_wait_ms=args.post_click_wait_ms,
+            wait_strategy=args.wait_strategy,
+            quiet_ms=args.quiet_ms,
+            max_wait_ms=args.max_wait_ms,
             user_agent=args.user_agent,
             vw=args.vw,
             vh=args.vh,
@@ -72,11 +272,190 @@ class ScraperCLI:
             scrolls=args.scrolls,
             scroll_wait_ms=args.scroll_wait_ms,
             scroll_until_end=args.scroll_until_end,
+            scroll_harvest=args.scroll_harvest,
+            harvest_seen_limit=args.harvest_seen_limit,
             eval_js=args.eval_js,
             eval_js_file=args.eval_js_file,
-            include_tables=args.tables,
+            include_tables=args.tables or bool(args.tables_out),
+            combined_extraction=not args.separate_extraction,
+            block_preset=args.block_preset,
+            block_resource_types=args.block_type or [],
+            block_url_patterns=args.block_pattern or [],
+            block_third_party=args.block_third_party,
+            result_buffer=args.result_buffer,
+            state_file=args.state_file,
+            checkpoint_interval_ms=args.checkpoint_interval_ms,
+            incremental_db=args.incremental,
+            seen_store=args.seen_store,
+            bloom_fp_rate=args.bloom_fp_rate,
+            frontier_memory_limit=args.frontier_memory_limit,
+            spill_dir=args.spill_dir,
+            include_patterns=args.include or [],
+            exclude_patterns=args.exclude or [],
+            deny_extensions=args.deny_ext,
+            deny_mime_types=args.deny_mime or [],
+            strip_query_params=args.strip_param or [],
+            strip_tracking_params=args.strip_tracking_params,
+            frontier=args.frontier,
+            priority_depth_weight=args.depth_weight,
+            priority_patterns=dict(args.priority_pattern or []),
+            priority_keywords=dict(args.priority_keyword or []),
+            path_budgets=dict(args.path_budget or []),
+            near_duplicates=args.near_duplicates,
+            simhash_distance=args.simhash_distance,
+            max_segment_repeats=args.max_segment_repeats,
+            max_query_variants=args.max_query_variants,
+            metrics=args.metrics or bool(args.metrics_file),
+            result_timings=args.timings,
+            metrics_interval_ms=args.metrics_interval_ms,
+            record_dir=args.record,
         )
 
+    @staticmethod
+    def resume_config(state_file: str) -> Tuple[str, ScrapingConfig]:
+        """Start URL and config of the crawl recorded in ``state_file``"""
+        meta = CrawlStateStore.read_meta(state_file)
+        if "start_url" not in meta:
+            raise ValueError(f"No crawl state found in {state_file}")
+        known = {f.name for f in fields(ScrapingConfig)}
+        stored = {k: v for k, v in meta.get("config", {}).items() if k in known}
+        stored["state_file"] = state_file
+        stored["resume"] = True
+        return meta["start_url"], ScrapingConfig(**stored)
+
+    @staticmethod
+    async def stream_results(scraper: WebScraper, url: str, out: TextIO,
+                             flush_every: int = 1) -> int:
+        """Write results as NDJSON while the crawl runs; returns the record count"""
+        return await ScraperCLI.write_results(scraper.iter_scrape(url), out, flush_every)
+
+    @staticmethod
+    async def write_results(results: AsyncIterable[Record], out: TextIO,
+                            flush_every: int = 1) -> int:
+        """Write results (or ready JSON lines) from any async source as NDJSON; returns the count"""
+        count = 0
+        flush_every = max(1, flush_every)
+        async for result in results:
+            out.write(result if isinstance(result, str) else json.dumps(result, ensure_ascii=False))
+            out.write("\n")
+            count += 1
+            if count % flush_every == 0:
+                out.flush()
+        out.flush()
+        return count
+
+    @staticmethod
+    def write_lines(lines: Iterable[str], out: TextIO, flush_every: int = 1) -> int:
+        """Write pre-serialized NDJSON lines; returns the record count"""
+        count = 0
+        flush_every = max(1, flush_every)
+        for line in lines:
+            out.write(line)
+            out.write("\n")
+            count += 1
+            if count % flush_every == 0:
+                out.flush()
+        out.flush()
+        return count
+
+    @staticmethod
+    def build_sinks(args: argparse.Namespace) -> List[ResultSink]:
+        """File sinks for --output and --tables-out"""
+        sinks: List[ResultSink] = []
+        if args.output:
+            sinks.append(NDJSONSink(
+                args.output, compression=args.compress, rotate_bytes=int(args.rotate_mb * 2 ** 20)
+            ))
+        if args.tables_out:
+            sinks.append(TableSink(args.tables_out))
+        return sinks
+
+    @staticmethod
+    async def run_output(results: AsyncIterable[Record], sinks: List[ResultSink],
+                         feed_sinks: bool, out: Optional[TextIO], flush_every: int = 1) -> int:
+        """Consume a crawl with ``sinks`` open, printing NDJSON to ``out`` if given.
+
+        With ``feed_sinks`` each result is also written to the sinks here;
+        otherwise the scraper feeds them itself.
+        """
+        async with contextlib.AsyncExitStack() as stack:
+            for sink in sinks:
+                await stack.enter_async_context(sink)
+            if feed_sinks:
+                results = ScraperCLI.tee(results, sinks)
+            if out is not None:
+                return await ScraperCLI.write_results(results, out, flush_every)
+            count = 0
+            async for _ in results:
+                count += 1
+            return count
+
+    @staticmethod
+    async def tee(results: AsyncIterable[Record], sinks: List[ResultSink]) -> AsyncIterator[Record]:
+        async for result in results:
+            for sink in sinks:
+                await sink.write(result)
+            yield result
+
+    @staticmethod
+    async def iter_async(lines: Iterable[str]) -> AsyncIterator[str]:
+        """Iterate a blocking iterator on a worker thread, off the event loop"""
+        iterator = iter(lines)
+        end = object()
+        try:
+            while True:
+                line = await asyncio.to_thread(next, iterator, end)
+                if line is end:
+                    return
+                yield line
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                await asyncio.to_thread(close)
+
+    @staticmethod
+    def report(scraper: WebScraper, args: argparse.Namespace) -> None:
+        """Print stats and metrics to stderr and write the metrics file, as requested"""
+        if args.stats or scraper.config.incremental_db:
+            print(json.dumps({"_stats": scraper.stats()}), file=sys.stderr)
+        metrics = scraper.metrics
+        if metrics is None:
+            return
+        if args.metrics:
+            print(json.dumps({"_metrics": metrics.to_dict()}), file=sys.stderr)
+        if args.metrics_file:
+            with open(args.metrics_file, "w", encoding="utf-8") as f:
+                if args.metrics_file.endswith(".prom"):
+                    f.write(metrics.to_prometheus())
+                else:
+                    json.dump(metrics.to_dict(), f)
+
+    @staticmethod
+    async def serve(args: argparse.Namespace) -> None:
+        """Run the scrape daemon until interrupted"""
+        daemon = ScrapeDaemon(
+            socket_path=args.socket,
+            port=args.port,
+            max_concurrency=args.max_concurrency,
+            page_pool_size=args.page_pool or 8,
+            pool_contexts=args.pool_contexts,
+            context_max_pages=args.context_max_pages,
+            context_max_memory_mb=args.context_max_memory_mb,
+            headful=args.headful,
+            prelaunch=not args.lazy_launch,
+            token=args.token,
+            host_delay_ms=args.host_delay_ms,
+            per_host_concurrency=args.per_host_concurrency,
+            job_limits={"max_pages": args.job_max_pages},
+            allow_eval_js=args.allow_eval_js,
+        )
+        async with daemon:
+            serving = {"_serving": daemon.address}
+            if daemon.token and not args.token:
+                serving["token"] = daemon.token
+            print(json.dumps(serving), file=sys.stderr, flush=True)
+            await daemon.serve_forever()
+
 
 # Convenience functions for backward compatibility
 async def scrape_one_page_async(url: str, depth: int = 0) -> List[Dict[str, Any]]:
@@ -95,13 +474,100 @@ def main() -> None:
     parser = ScraperCLI.build_arg_parser()
     args = parser.parse_args()
 
-    config = ScraperCLI.parse_args_to_config(args)
-    scraper = WebScraper(config)
+    if args.serve:
+        try:
+            asyncio.run(ScraperCLI.serve(args))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    def build_sinks() -> List[ResultSink]:
+        try:
+            return ScraperCLI.build_sinks(args)
+        except (ValueError, RuntimeError) as e:
+            parser.error(str(e))
+
+    # With --output, results go to the file only
+    out = None if args.output else sys.stdout
+
+    if args.replay:
+        if args.url or args.seeds or args.resume or args.daemon or args.workers > 1:
+            parser.error("--replay cannot be combined with a URL, --seeds, --resume, --daemon or --workers")
+        sinks = build_sinks()
+        scraper = ReplayScraper(ScraperCLI.parse_args_to_config(args), args.replay, sinks=sinks)
+        asyncio.run(ScraperCLI.run_output(
+            scraper.iter_replay(), sinks, False, out, args.flush_every
+        ))
+        ScraperCLI.report(scraper, args)
+        return
+
+    if args.seeds:
+        if args.url or args.resume or args.state_file or args.daemon or args.workers > 1:
+            parser.error("--seeds cannot be combined with a URL, --resume, --state-file, "
+                         "--daemon or --workers")
+        try:
+            seeds = load_seeds(args.seeds)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        config = ScraperCLI.parse_args_to_config(args)
+        sinks = build_sinks()
+        scraper = WebScraper(config, sinks=sinks)
+        asyncio.run(ScraperCLI.run_output(
+            scraper.iter_scrape_many(seeds), sinks, False, out, args.flush_every
+        ))
+        ScraperCLI.report(scraper, args)
+        return
+
+    if args.resume:
+        try:
+            url, config = ScraperCLI.resume_config(args.resume)
+        except ValueError as e:
+            parser.error(str(e))
+        # Metrics only observe the crawl, so they can be turned on for the resumed run
+        config.metrics = config.metrics or args.metrics or bool(args.metrics_file)
+    elif args.url:
+        url, config = args.url, ScraperCLI.parse_args_to_config(args)
+    else:
+        parser.error("a start URL is required unless --resume, --seeds, --replay or --serve is given")
 
-    results = asyncio.run(scraper.scrape(args.url))
+    if args.daemon:
+        if args.resume or args.state_file or args.incremental or args.record or args.eval_js_file or args.spill_dir:
+            parser.error("--daemon jobs cannot use --resume, --state-file, --incremental, --record, "
+                         "--eval-js-file or --spill-dir")
+        client = DaemonClient(args.daemon, token=args.token)
+        sinks = build_sinks()
+        try:
+            asyncio.run(ScraperCLI.run_output(
+                client.iter_scrape(url, config), sinks, True, out, args.flush_every
+            ))
+        except (OSError, RuntimeError) as e:
+            print(json.dumps({"_error": str(e)}), file=sys.stderr)
+            sys.exit(1)
+        return
 
-    for result in results:
-        print(f"{json.dumps(result, ensure_ascii=False)}\n\n")
+    if args.workers > 1:
+        if args.metrics or args.metrics_file:
+            parser.error("--metrics and --metrics-file are not supported with --workers")
+        try:
+            scraper = ShardedCrawler(config, args.workers, shard_by=args.shard_by)
+        except ValueError as e:
+            parser.error(str(e))
+        sinks = build_sinks()
+        if sinks:
+            asyncio.run(ScraperCLI.run_output(
+                ScraperCLI.iter_async(scraper.iter_lines(url)), sinks, True, out, args.flush_every
+            ))
+        else:
+            ScraperCLI.write_lines(scraper.iter_lines(url), sys.stdout, args.flush_every)
+        if args.stats:
+            print(json.dumps({"_stats": scraper.stats()}), file=sys.stderr)
+    else:
+        sinks = build_sinks()
+        scraper = WebScraper(config, sinks=sinks)
+        asyncio.run(ScraperCLI.run_output(
+            scraper.iter_scrape(url), sinks, False, out, args.flush_every
+        ))
+        ScraperCLI.report(scraper, args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,23 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+from playwright.async_api import Playwright
+
+from .page_pool import PagePool
+from .resource_blocker import ResourceBlocker
+from .wait_engine import WaitEngine
+
+
+@dataclass
+class BrowserSession:
+    """A running browser and page pool shared by several crawls.
+
+    ``wait_engine`` and ``resource_blocker`` are the instances whose routes
+    and init scripts are installed on the pool's contexts; crawls using the
+    session report waits and blocked requests through them.
+    """
+    playwright: Playwright
+    pool: PagePool
+    semaphore: asyncio.Semaphore
+    wait_engine: WaitEngine
+    resource_blocker: Optional[ResourceBlocker] = None
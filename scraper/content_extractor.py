@@ -1,23 +1,53 @@
-from typing import List, Dict, Tuple, Optional
+from typing import Any, Callable, List, Dict, Tuple, Optional
 from playwright.async_api import Page
-from .url_normalizer import URLNormalizer
+from .url_policy import URLPolicy
 from .js_manager import JsManager
+from .wait_engine import WaitEngine
+
+
+class _Harvest:
+    """Text, links and table rows collected over the steps of a scroll harvest"""
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.links: List[Dict[str, str]] = []
+        self.tables: Dict[int, Dict[str, List[List[str]]]] = {}
+
+    def add(self, chunk: Dict[str, Any]) -> int:
+        """Fold in one step's chunk; returns how many new items it carried"""
+        self.lines.extend(chunk["text"])
+        self.links.extend(chunk["links"])
+        added = len(chunk["text"]) + len(chunk["links"])
+        for part in chunk["tables"]:
+            table = self.tables.setdefault(part["id"], {"headers": [], "rows": []})
+            table["headers"].extend(part["headers"])
+            table["rows"].extend(part["rows"])
+            added += len(part["rows"])
+        return added
 
 
 class ContentExtractor:
     """Handles content extraction from web pages"""
 
-    def __init__(self, js_manager: Optional[JsManager] = None) -> None:
+    def __init__(self, js_manager: Optional[JsManager] = None, combined: bool = True,
+                 wait_engine: Optional[WaitEngine] = None,
+                 url_policy: Optional[URLPolicy] = None) -> None:
         self.js_manager = js_manager or JsManager()
+        self.url_policy = url_policy or URLPolicy()
+        self.combined = combined
+        self.wait_engine = wait_engine or WaitEngine(js_manager=self.js_manager)
     
     async def extract_content(self, page: Page, include_tables: bool = False) -> Tuple[str, List[Dict[str, str]], Optional[List[Dict[str, List[List[str]]]]]]:
         """Extract text content, links, and optionally tables from a page"""
         # Wait for initial states
         try:
             await page.wait_for_load_state("domcontentloaded")
-            await page.wait_for_load_state("networkidle", timeout=5000)
         except Exception:
             pass
+        await self.wait_engine.settle(page, "load")
+
+        if self.combined:
+            return await self._extract_combined(page, include_tables)
 
         # Extract visible text
         text = await self._extract_text(page)
@@ -33,6 +63,68 @@ class ContentExtractor:
         
         return text, cleaned_links, tables
 
+    async def _extract_combined(self, page: Page, include_tables: bool) -> Tuple[str, List[Dict[str, str]], Optional[List[Dict[str, List[List[str]]]]]]:
+        """Extract text, links and tables in one DOM pass and one round trip"""
+        script = self.js_manager.extract_all(text=True, links=True, tables=include_tables)
+        data = await page.evaluate(script)
+        cleaned_links = self._clean_links(data["links"], page.url)
+        return data["text"], cleaned_links, data["tables"] if include_tables else None
+
+    async def harvest_content(self, page: Page, include_tables: bool = False, max_steps: int = 0,
+                              wait_ms: int = 1000, seen_limit: int = 20000,
+                              on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None
+                              ) -> Tuple[str, List[Dict[str, str]], Optional[List[Dict[str, List[List[str]]]]]]:
+        """Scroll one viewport at a time, extracting new content after each step.
+
+        Each step returns only items the page has not returned before, so
+        items a virtualized list drops from the DOM are kept and no step
+        sends the whole page. The page dedupes with a seen-set of at most
+        ``seen_limit`` hashes. Stops once the bottom is reached and the
+        height stays the same without new items, or after ``max_steps``
+        steps (0 = no limit). ``on_chunk`` gets each step's raw chunk.
+        """
+        try:
+            await page.wait_for_load_state("domcontentloaded")
+        except Exception:
+            pass
+        await self.wait_engine.settle(page, "load")
+
+        engine = self.wait_engine
+        script = self.js_manager.harvest(
+            wait_ms, tables=include_tables, seen_limit=seen_limit, adaptive=engine.adaptive,
+            quiet_ms=engine.quiet_ms, long_request_ms=engine.long_request_ms,
+        )
+        harvest = _Harvest()
+        chunk = await page.evaluate(script, False)
+        harvest.add(chunk)
+        if on_chunk is not None:
+            on_chunk(chunk)
+
+        # Like scroll.js: a fixed wait needs a few quiet steps to trust the end
+        max_stable = 1 if engine.adaptive else 3
+        height = chunk["height"]
+        steps = stable = waited = 0
+        reason = "tries"
+        while not max_steps or steps < max_steps:
+            chunk = await page.evaluate(script, True)
+            steps += 1
+            waited += chunk["waited_ms"]
+            added = harvest.add(chunk)
+            if on_chunk is not None:
+                on_chunk(chunk)
+            if chunk["at_end"] and not added and chunk["height"] == height:
+                stable += 1
+                if stable >= max_stable:
+                    reason = "stable"
+                    break
+            else:
+                stable = 0
+            height = chunk["height"]
+        engine.record(page, {"phase": "scroll", "waited_ms": waited, "reason": reason, "steps": steps})
+
+        tables = [harvest.tables[i] for i in sorted(harvest.tables)] if include_tables else None
+        return "\n".join(harvest.lines), self._clean_links(harvest.links, page.url), tables
+
     async def _extract_text(self, page: Page) -> str:
         """Extract visible text content from the page"""
         script = self.js_manager.extract_text()
@@ -48,23 +140,6 @@ class ContentExtractor:
         script = self.js_manager.extract_tables()
         return await page.evaluate(script)
 
-    @staticmethod
-    def _clean_links(links: List[Dict[str, str]], base_url: str) -> List[Dict[str, str]]:
+    def _clean_links(self, links: List[Dict[str, str]], base_url: str) -> List[Dict[str, str]]:
         """Clean and normalize extracted links"""
-        cleaned = []
-        for link in links:
-            href = (link.get("href") or "").strip()
-            if not href or href.startswith(("#", "javascript:", "mailto:", "tel:")):
-                continue
-            abs_url = URLNormalizer.absolutize(base_url, href)
-            cleaned.append({"text": link.get("text", ""), "href": abs_url})
-
-        # De-dupe by href
-        dedup = {}
-        for item in cleaned:
-            href_n = URLNormalizer.normalize_url(item["href"])
-            # keep the first non-empty text if available
-            if href_n not in dedup or (not dedup[href_n] and item["text"]):
-                dedup[href_n] = item["text"]
-        
-        return [{"href": k, "text": v} for k, v in dedup.items()]
+        return self.url_policy.clean_links(links, base_url)
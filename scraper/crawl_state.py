@@ -0,0 +1,171 @@
+import asyncio
+import contextlib
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class CrawlStateStore:
+    """SQLite-backed crawl state for checkpointing and resuming crawls.
+
+    Records the crawl's start URL and config, every queued URL with its depth
+    and status (``queued``, ``done`` or ``failed``), and each completed result.
+    Updates are buffered in memory and written in batched transactions on a
+    dedicated thread, so the crawl loop never waits on disk. A crash loses at
+    most the last ``flush_interval_ms`` of updates; those pages are simply
+    visited again on resume.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS urls ("
+        " url TEXT PRIMARY KEY, depth INTEGER NOT NULL, status TEXT NOT NULL,"
+        " seq INTEGER NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS urls_status ON urls (status, seq)",
+        "CREATE TABLE IF NOT EXISTS results (url TEXT PRIMARY KEY, data TEXT NOT NULL)",
+    )
+
+    def __init__(self, path: str, flush_interval_ms: int = 1000) -> None:
+        self.path = path
+        self.flush_interval = max(10, flush_interval_ms) / 1000
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crawl-state")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._queued: List[Tuple[str, int]] = []
+        self._completed: List[Tuple[str, int, str, str]] = []
+        self._seq = 0
+        self._flusher: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def read_meta(path: str) -> Dict[str, Any]:
+        """Read the stored start URL and config without opening the store"""
+        conn = sqlite3.connect(path)
+        try:
+            rows = conn.execute("SELECT key, value FROM meta").fetchall()
+        except sqlite3.OperationalError:
+            return {}
+        finally:
+            conn.close()
+        return {key: json.loads(value) for key, value in rows}
+
+    async def open(self) -> None:
+        await self._run(self._open_sync)
+        self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+        await self.flush()
+        await self._run(self._close_sync)
+        self._executor.shutdown(wait=True)
+
+    async def load(self) -> Tuple[Dict[str, Any], List[str], List[Tuple[str, int]]]:
+        """Return ``(meta, visited_urls, frontier)`` from a previous run.
+
+        Failed pages and pages that were in flight when the crawl stopped are
+        returned in the frontier so they are visited again.
+        """
+        return await self._run(self._load_sync)
+
+    async def reset(self) -> None:
+        """Drop everything recorded by a previous crawl"""
+        self._queued.clear()
+        self._completed.clear()
+        await self._run(self._reset_sync)
+
+    async def save_meta(self, meta: Dict[str, Any]) -> None:
+        await self._run(self._save_meta_sync, meta)
+
+    def enqueued(self, url: str, depth: int) -> None:
+        """Record a URL added to the frontier"""
+        self._queued.append((url, depth))
+
+    def completed(self, url: str, result: Dict[str, Any]) -> None:
+        """Record a finished page and its result"""
+        status = "failed" if "error" in result else "done"
+        data = json.dumps(result, ensure_ascii=False)
+        self._completed.append((url, result.get("depth", 0), status, data))
+
+    async def flush(self) -> None:
+        if not (self._queued or self._completed):
+            return
+        queued, self._queued = self._queued, []
+        completed, self._completed = self._completed, []
+        await self._run(self._write_sync, queued, completed)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # -- executor thread ---------------------------------------------------
+
+    def _open_sync(self) -> None:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+        self._seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM urls").fetchone()[0]
+        self._conn = conn
+
+    def _close_sync(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _load_sync(self) -> Tuple[Dict[str, Any], List[str], List[Tuple[str, int]]]:
+        conn = self._conn
+        meta = {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM meta")}
+        visited = [row[0] for row in conn.execute("SELECT url FROM urls WHERE status = 'done'")]
+        frontier = [
+            (url, depth) for url, depth in conn.execute(
+                "SELECT url, depth FROM urls WHERE status != 'done' ORDER BY seq"
+            )
+        ]
+        return meta, visited, frontier
+
+    def _reset_sync(self) -> None:
+        with self._conn:
+            for table in ("meta", "urls", "results"):
+                self._conn.execute(f"DELETE FROM {table}")
+        self._seq = 0
+
+    def _save_meta_sync(self, meta: Dict[str, Any]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in meta.items()],
+            )
+
+    def _write_sync(self, queued: List[Tuple[str, int]],
+                    completed: List[Tuple[str, int, str, str]]) -> None:
+        queued_rows = []
+        for url, depth in queued:
+            self._seq += 1
+            queued_rows.append((url, depth, self._seq))
+        completed_rows = []
+        for url, depth, status, _ in completed:
+            self._seq += 1
+            completed_rows.append((url, depth, status, self._seq))
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO urls (url, depth, status, seq) VALUES (?, ?, 'queued', ?)",
+                queued_rows,
+            )
+            self._conn.executemany(
+                "INSERT INTO urls (url, depth, status, seq) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(url) DO UPDATE SET status = excluded.status",
+                completed_rows,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (url, data) VALUES (?, ?)",
+                [(url, data) for url, _, _, data in completed],
+            )
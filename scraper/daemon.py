@@ -0,0 +1,360 @@
+import asyncio
+import contextlib
+import hmac
+import ipaddress
+import json
+import os
+import secrets
+import socket
+import stat
+from dataclasses import asdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+from .browser_session import BrowserSession
+from .page_pool import PagePool
+from .politeness import PolitenessScheduler
+from .scraping_config import ScrapingConfig
+from .web_scraper import WebScraper
+
+
+# Config fields that shape a browser context; jobs agreeing on them share contexts
+_PROFILE_FIELDS = (
+    "user_agent", "vw", "vh", "wait_strategy", "quiet_ms", "max_wait_ms",
+    "block_preset", "block_resource_types", "block_url_patterns", "block_third_party",
+)
+
+
+# Config fields a job may set. Everything else is the daemon's: browser, pool
+# and politeness settings, and any field naming a file or directory, which
+# would let a client read or write files as the daemon's user. ``eval_js``
+# runs client script in the daemon's browser, so only a daemon started with
+# ``allow_eval_js`` accepts it.
+JOB_FIELDS = frozenset((
+    "depth", "max_pages", "delay_ms", "concurrency", "concurrent_batch", "scheduler", "fetch_mode",
+    "goto_timeout_ms", "wait_timeout_ms", "post_click_wait_ms",
+    "wait_strategy", "quiet_ms", "max_wait_ms", "user_agent", "vw", "vh",
+    "wait_selector", "click_selectors", "scrolls", "scroll_wait_ms", "scroll_until_end",
+    "scroll_harvest", "harvest_seen_limit", "include_tables", "combined_extraction",
+    "block_preset", "block_resource_types", "block_url_patterns", "block_third_party",
+    "result_buffer", "seen_store", "bloom_fp_rate", "frontier", "priority_depth_weight",
+    "priority_patterns", "priority_keywords", "path_budgets", "near_duplicates",
+    "simhash_distance", "max_segment_repeats", "max_query_variants",
+    "include_patterns", "exclude_patterns", "deny_extensions", "deny_mime_types",
+    "strip_query_params", "strip_tracking_params", "result_timings",
+))
+
+# Largest values a job may ask for; larger requests are lowered to these.
+# ``concurrency`` and ``concurrent_batch`` are capped at the daemon's
+# ``max_concurrency`` unless ``job_limits`` says otherwise.
+JOB_LIMITS: Dict[str, int] = {
+    "max_pages": 10000,
+    "harvest_seen_limit": 100000,
+    "result_buffer": 1000,
+}
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _profile_key(config: ScrapingConfig) -> Tuple:
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (getattr(config, name) for name in _PROFILE_FIELDS)
+    )
+
+
+class ScrapeDaemon:
+    """Long-running scrape server with a warm browser and shared page pools.
+
+    Clients connect over a Unix socket (``socket_path``, mode 0600) or a TCP
+    port on a loopback address and send one JSON line per connection:
+    ``{"url": ..., "config": {...}, "token": ...}`` with any of the
+    :data:`JOB_FIELDS` config fields, plus ``eval_js`` if ``allow_eval_js``.
+    Page counts and buffer sizes above ``job_limits`` (default
+    :data:`JOB_LIMITS`) are lowered to them. Results stream back as NDJSON
+    as pages complete, followed by ``{"_done": true, "pages": n}`` or
+    ``{"_error": "..."}``. When ``token`` is set every job must carry it;
+    over TCP one is generated if none is given. Jobs run concurrently; those with the same
+    context settings (user agent, viewport, waits, blocking) share warm
+    contexts and pages, all jobs together hold at most ``max_concurrency``
+    pages, and one politeness scheduler (``host_delay_ms``,
+    ``per_host_concurrency``) paces every job's requests to a host.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, host: str = "127.0.0.1", port: int = 0,
+                 max_concurrency: int = 16, page_pool_size: int = 8, pool_contexts: int = 1,
+                 context_max_pages: int = 0, context_max_memory_mb: int = 0,
+                 headful: bool = False, prelaunch: bool = True, token: Optional[str] = None,
+                 host_delay_ms: int = 0, per_host_concurrency: int = 0,
+                 job_limits: Optional[Dict[str, int]] = None, allow_eval_js: bool = False) -> None:
+        if not socket_path and not _is_loopback(host):
+            raise ValueError(f"The daemon only listens on loopback addresses, not {host}")
+        self.socket_path = socket_path
+        self.host = host
+        self.port = port
+        self.token = token if token or socket_path else secrets.token_urlsafe(24)
+        self.max_concurrency = max(1, max_concurrency)
+        self.job_limits = {
+            **JOB_LIMITS,
+            "concurrency": self.max_concurrency,
+            "concurrent_batch": self.max_concurrency,
+            **(job_limits or {}),
+        }
+        self.allow_eval_js = allow_eval_js
+        self.page_pool_size = page_pool_size
+        self.pool_contexts = pool_contexts
+        self.context_max_pages = context_max_pages
+        self.context_max_memory_mb = context_max_memory_mb
+        self.headful = headful
+        self.prelaunch = prelaunch
+        self._playwright_cm = None
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._launch_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._sessions: Dict[Tuple, BrowserSession] = {}
+        self.politeness = PolitenessScheduler(
+            min_interval_ms=host_delay_ms, per_host_concurrency=per_host_concurrency,
+        )
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.stats: Dict[str, int] = {"jobs": 0, "jobs_failed": 0, "pages": 0, "active_jobs": 0}
+
+    async def start(self) -> None:
+        self._playwright_cm = async_playwright()
+        self._playwright = await self._playwright_cm.__aenter__()
+        if self.prelaunch:
+            await self._get_browser()
+        if self.socket_path:
+            self._server = await asyncio.start_unix_server(self._handle, sock=self._bind_unix())
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    def _bind_unix(self) -> socket.socket:
+        """Bind the Unix socket with mode 0600 from the start, not after a chmod"""
+        with contextlib.suppress(FileNotFoundError):
+            if stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+                # Left behind by a daemon that did not shut down cleanly
+                os.unlink(self.socket_path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Nothing else runs while the umask is narrowed: bind() does not yield
+        umask = os.umask(0o177)
+        try:
+            sock.bind(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        finally:
+            os.umask(umask)
+        return sock
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if self.socket_path:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(self.socket_path)
+        for session in self._sessions.values():
+            await session.pool.close()
+        self._sessions.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright_cm is not None:
+            await self._playwright_cm.__aexit__(None, None, None)
+            self._playwright_cm = None
+
+    async def __aenter__(self) -> "ScrapeDaemon":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    @property
+    def address(self) -> str:
+        return self.socket_path or f"{self.host}:{self.port}"
+
+    async def run_job(self, url: str, config: ScrapingConfig) -> AsyncIterator[Dict[str, Any]]:
+        """Crawl ``url`` with ``config`` on the warm browser, yielding results"""
+        if config.state_file or config.incremental_db:
+            raise ValueError("state_file and incremental_db are not supported for daemon jobs")
+        scraper = WebScraper(config, session=self._session_for(config), politeness=self.politeness)
+        self.stats["jobs"] += 1
+        self.stats["active_jobs"] += 1
+        try:
+            async with contextlib.aclosing(scraper.iter_scrape(url)) as results:
+                async for result in results:
+                    self.stats["pages"] += 1
+                    yield result
+        except Exception:
+            self.stats["jobs_failed"] += 1
+            raise
+        finally:
+            self.stats["active_jobs"] -= 1
+
+    # -- sessions ----------------------------------------------------------
+
+    async def _get_browser(self) -> Browser:
+        async with self._launch_lock:
+            if self._browser is None:
+                self._browser = await self._playwright.chromium.launch(headless=not self.headful)
+            return self._browser
+
+    def _session_for(self, config: ScrapingConfig) -> BrowserSession:
+        """Shared session for the job's context profile, created on first use"""
+        key = _profile_key(config)
+        session = self._sessions.get(key)
+        if session is None:
+            # This scraper only configures the profile's contexts; jobs get their own
+            template = WebScraper(config)
+
+            async def new_context() -> BrowserContext:
+                return await template._new_context(await self._get_browser())
+
+            pool = PagePool(
+                new_context,
+                contexts=self.pool_contexts,
+                pool_size=self.page_pool_size,
+                context_max_pages=self.context_max_pages,
+                context_max_memory_mb=self.context_max_memory_mb,
+            )
+            session = self._sessions[key] = BrowserSession(
+                self._playwright, pool, self._semaphore,
+                template.wait_engine, template.resource_blocker,
+            )
+        return session
+
+    # -- protocol ----------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                url, config = self._parse_job(
+                    await reader.readline(), self.token, self.job_limits, self.allow_eval_js,
+                )
+            except ValueError as e:
+                await self._send(writer, {"_error": str(e)})
+                return
+            pages = 0
+            try:
+                async with contextlib.aclosing(self.run_job(url, config)) as results:
+                    async for result in results:
+                        await self._send(writer, result)
+                        pages += 1
+            except (ConnectionError, asyncio.CancelledError):
+                raise
+            except Exception as e:
+                await self._send(writer, {"_error": str(e)})
+                return
+            await self._send(writer, {"_done": True, "pages": pages})
+        except ConnectionError:
+            # The client went away; closing the generator stopped its crawl
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    def _parse_job(line: bytes, token: Optional[str] = None, limits: Optional[Dict[str, int]] = None,
+                   allow_eval_js: bool = False) -> Tuple[str, ScrapingConfig]:
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid job: {e}")
+        if not isinstance(job, dict) or not isinstance(job.get("url"), str):
+            raise ValueError("Job must be an object with a \"url\" string")
+        if token is not None:
+            sent = job.get("token")
+            if not isinstance(sent, str) or not hmac.compare_digest(sent.encode(), token.encode()):
+                raise ValueError("Invalid or missing token")
+        options = job.get("config") or {}
+        if not isinstance(options, dict):
+            raise ValueError("Job \"config\" must be an object")
+        allowed = JOB_FIELDS | {"eval_js"} if allow_eval_js else JOB_FIELDS
+        refused = sorted(set(options) - allowed)
+        if refused:
+            raise ValueError(f"Config fields not allowed in daemon jobs: {', '.join(refused)}")
+        try:
+            config = ScrapingConfig(**options)
+        except TypeError as e:
+            raise ValueError(f"Invalid config: {e}")
+        for name, limit in (JOB_LIMITS if limits is None else limits).items():
+            value = getattr(config, name)
+            if not isinstance(value, int):
+                raise ValueError(f"Config field {name} must be an integer")
+            setattr(config, name, min(value, limit))
+        return job["url"], config
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, record: Dict[str, Any]) -> None:
+        writer.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        await writer.drain()
+
+
+class DaemonClient:
+    """Submit jobs to a :class:`ScrapeDaemon` and stream back their results"""
+
+    def __init__(self, address: str, token: Optional[str] = None) -> None:
+        # "host:port" for TCP, anything else is a Unix socket path
+        self.address = address
+        self.token = token
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        host, sep, port = self.address.rpartition(":")
+        if sep and port.isdigit():
+            return await asyncio.open_connection(host, int(port), limit=2 ** 24)
+        return await asyncio.open_unix_connection(self.address, limit=2 ** 24)
+
+    async def iter_scrape(self, url: str, config: Optional[ScrapingConfig] = None
+                          ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield results of one job; raises RuntimeError if the daemon reports an error"""
+        options = self._job_options(config)
+        reader, writer = await self._connect()
+        try:
+            job = {"url": url, "config": options}
+            if self.token:
+                job["token"] = self.token
+            writer.write(json.dumps(job).encode("utf-8") + b"\n")
+            await writer.drain()
+            while True:
+                line = await reader.readline()
+                if not line:
+                    raise RuntimeError("Daemon closed the connection before the job finished")
+                record = json.loads(line)
+                if "_error" in record:
+                    raise RuntimeError(record["_error"])
+                if record.get("_done"):
+                    return
+                yield record
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def scrape(self, url: str, config: Optional[ScrapingConfig] = None) -> List[Dict[str, Any]]:
+        return [result async for result in self.iter_scrape(url, config)]
+
+    @staticmethod
+    def _job_options(config: Optional[ScrapingConfig]) -> Dict[str, Any]:
+        """Job fields of ``config`` that differ from the defaults; the daemon owns the rest"""
+        if config is None:
+            return {}
+        defaults = asdict(ScrapingConfig())
+        return {
+            k: v for k, v in asdict(config).items()
+            if (k in JOB_FIELDS or k == "eval_js") and defaults.get(k) != v
+        }
@@ -0,0 +1,104 @@
+import os
+import tempfile
+from collections import deque
+from typing import Callable, Deque, Iterable, List, Optional, Tuple
+
+
+FrontierItem = Tuple[str, int]
+
+
+class SpillingFrontier:
+    """FIFO frontier of ``(url, depth)`` that spills to disk past a memory limit.
+
+    Up to ``memory_limit`` entries live in an in-memory deque (0 = no limit).
+    Beyond that, new entries are appended to a temporary file and read back in
+    chunks as the in-memory part drains, preserving FIFO order.
+    """
+
+    _WRITE_BUFFER = 1024
+
+    def __init__(self, items: Iterable[FrontierItem] = (), memory_limit: int = 0,
+                 spill_dir: Optional[str] = None) -> None:
+        self.memory_limit = max(0, memory_limit)
+        self.spill_dir = spill_dir
+        self._head: Deque[FrontierItem] = deque()
+        self._file = None
+        self._read_pos = 0
+        self._spilled = 0
+        self._write_buffer: List[bytes] = []
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self._head) + self._spilled
+
+    def __bool__(self) -> bool:
+        return bool(self._head) or self._spilled > 0
+
+    @property
+    def spilled(self) -> int:
+        """Entries currently held on disk"""
+        return self._spilled
+
+    def append(self, item: FrontierItem, anchor: str = "") -> None:
+        # ``anchor`` is accepted for parity with PriorityFrontier; FIFO ignores it
+        if self._spilled or (self.memory_limit and len(self._head) >= self.memory_limit):
+            self._spill(item)
+        else:
+            self._head.append(item)
+
+    def popleft(self) -> FrontierItem:
+        if not self._head and self._spilled:
+            self._refill()
+        return self._head.popleft()
+
+    def pop_first(self, predicate: Callable[[str], bool], window: int) -> Optional[FrontierItem]:
+        """Remove and return the first of the next ``window`` entries whose URL matches"""
+        if not self._head and self._spilled:
+            self._refill()
+        head = self._head
+        for i in range(min(len(head), window)):
+            if predicate(head[i][0]):
+                item = head[i]
+                del head[i]
+                return item
+        return None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _spill(self, item: FrontierItem) -> None:
+        url, depth = item
+        self._write_buffer.append(b"%d\t%s\n" % (depth, url.encode("utf-8")))
+        self._spilled += 1
+        if len(self._write_buffer) >= self._WRITE_BUFFER:
+            self._flush_writes()
+
+    def _flush_writes(self) -> None:
+        if not self._write_buffer:
+            return
+        if self._file is None:
+            fd, path = tempfile.mkstemp(prefix="frontier-", suffix=".spill", dir=self.spill_dir)
+            self._file = os.fdopen(fd, "w+b")
+            os.unlink(path)
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(b"".join(self._write_buffer))
+        self._write_buffer.clear()
+
+    def _refill(self) -> None:
+        self._flush_writes()
+        chunk = max(1, self.memory_limit // 2) if self.memory_limit else self._spilled
+        f = self._file
+        f.seek(self._read_pos)
+        for _ in range(min(chunk, self._spilled)):
+            line = f.readline()
+            depth, url = line.rstrip(b"\n").split(b"\t", 1)
+            self._head.append((url.decode("utf-8"), int(depth)))
+            self._spilled -= 1
+        self._read_pos = f.tell()
+        if not self._spilled:
+            f.seek(0)
+            f.truncate()
+            self._read_pos = 0
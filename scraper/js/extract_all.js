@@ -0,0 +1,90 @@
+(() => {
+  const wantText = __TEXT__;
+  const wantLinks = __LINKS__;
+  const wantTables = __TABLES__;
+
+  // Visibility is computed once per element. Elements with display:none are
+  // cached as GONE so their descendants are skipped without another style read.
+  const GONE = 0, HIDDEN = 1, SHOWN = 2;
+  const cache = new Map();
+  function visibility(el) {
+    let v = cache.get(el);
+    if (v !== undefined) return v;
+    for (let p = el.parentElement; p; p = p.parentElement) {
+      if (cache.get(p) === GONE) {
+        cache.set(el, GONE);
+        return GONE;
+      }
+    }
+    const cs = getComputedStyle(el);
+    if (!cs || cs.display === "none") {
+      v = GONE;
+    } else if (cs.visibility === "hidden") {
+      v = HIDDEN;
+    } else {
+      const r = el.getBoundingClientRect();
+      v = r.width > 0 && r.height > 0 ? SHOWN : HIDDEN;
+    }
+    cache.set(el, v);
+    return v;
+  }
+
+  function getText(node) {
+    return (node?.innerText || "").trim().replace(/\s+/g, " ");
+  }
+
+  function extractTable(tbl) {
+    const headers = [];
+    const headRows = tbl.tHead ? Array.from(tbl.tHead.rows) : [];
+    for (const tr of headRows) {
+      const cells = Array.from(tr.cells).map(getText);
+      if (cells.some(Boolean)) headers.push(cells);
+    }
+    const rows = [];
+    const bodies = tbl.tBodies ? Array.from(tbl.tBodies) : [];
+    for (const tb of bodies) {
+      for (const tr of Array.from(tb.rows)) {
+        const cells = Array.from(tr.cells).map(getText);
+        if (cells.some(Boolean)) rows.push(cells);
+      }
+    }
+    return { headers, rows };
+  }
+
+  const textTags = new Set(["main","article","section","h1","h2","h3","h4","h5","h6","p"]);
+  const sels = [];
+  if (wantText) sels.push(...textTags);
+  if (wantLinks) sels.push("a[href]");
+  if (wantTables) sels.push("table");
+
+  const lines = [];
+  const seen = new Set();
+  const links = [];
+  const tables = [];
+
+  const nodes = sels.length ? document.querySelectorAll(sels.join(",")) : [];
+  for (const el of nodes) {
+    if (visibility(el) !== SHOWN) continue;
+    const tag = el.localName;
+    if (wantText && textTags.has(tag)) {
+      const line = (el.innerText || "").trim();
+      if (!line) continue;
+      const norm = line.replace(/\s+/g, " ").slice(0, 200);
+      if (!seen.has(norm)) {
+        seen.add(norm);
+        lines.push(line);
+      }
+    } else if (tag === "a") {
+      links.push({ text: getText(el), href: el.getAttribute("href") });
+    } else if (tag === "table") {
+      const t = extractTable(el);
+      if (t.headers.length + t.rows.length > 0) tables.push(t);
+    }
+  }
+
+  return {
+    text: wantText ? lines.join("\n") : null,
+    links: wantLinks ? links : null,
+    tables: wantTables ? tables : null,
+  };
+})();
@@ -0,0 +1,146 @@
+async (scroll) => {
+  // State survives between steps and is dropped on navigation
+  const state = window.__scraperHarvest || (window.__scraperHarvest = {
+    seen: new Set(),
+    done: new WeakSet(),
+    tableIds: new WeakMap(),
+    nextTable: 0,
+    evicted: 0,
+  });
+  const seenLimit = __SEEN_LIMIT__;
+  const wantTables = __TABLES__;
+
+  let waited = 0;
+  if (scroll) {
+    const adaptive = __ADAPTIVE__ && !!window.__scraperSettle;
+    const start = performance.now();
+    // One viewport at a time, so virtualized lists render every item on the way
+    window.scrollBy(0, Math.max(1, Math.floor(window.innerHeight * 0.8)));
+    if (adaptive) {
+      await window.__scraperSettle(__QUIET_MS__, __WAIT_MS__, __LONG_MS__);
+    } else {
+      await new Promise(r => setTimeout(r, __WAIT_MS__));
+    }
+    waited = performance.now() - start;
+  }
+
+  // 53-bit string hash: the seen-set holds short keys, not item text
+  function hash(s) {
+    let h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+    for (let i = 0; i < s.length; i++) {
+      const c = s.charCodeAt(i);
+      h1 = Math.imul(h1 ^ c, 2654435761);
+      h2 = Math.imul(h2 ^ c, 1597334677);
+    }
+    h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+    h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+    return 4294967296 * (2097151 & h2) + (h1 >>> 0);
+  }
+
+  // True the first time ``key`` is seen; the oldest keys are evicted past the limit
+  function fresh(key) {
+    const k = hash(key);
+    if (state.seen.has(k)) return false;
+    state.seen.add(k);
+    if (state.seen.size > seenLimit) {
+      state.seen.delete(state.seen.values().next().value);
+      state.evicted++;
+    }
+    return true;
+  }
+
+  const GONE = 0, HIDDEN = 1, SHOWN = 2;
+  const cache = new Map();
+  function visibility(el) {
+    let v = cache.get(el);
+    if (v !== undefined) return v;
+    for (let p = el.parentElement; p; p = p.parentElement) {
+      if (cache.get(p) === GONE) {
+        cache.set(el, GONE);
+        return GONE;
+      }
+    }
+    const cs = getComputedStyle(el);
+    if (!cs || cs.display === "none") {
+      v = GONE;
+    } else if (cs.visibility === "hidden") {
+      v = HIDDEN;
+    } else {
+      const r = el.getBoundingClientRect();
+      v = r.width > 0 && r.height > 0 ? SHOWN : HIDDEN;
+    }
+    cache.set(el, v);
+    return v;
+  }
+
+  function getText(node) {
+    return (node?.innerText || "").trim().replace(/\s+/g, " ");
+  }
+
+  // Containers are read again on every step: items without a text tag of
+  // their own (bare text in a <div>) appear inside them as the page grows.
+  // Text is deduped line by line, so a step returns only the new lines.
+  const containerTags = new Set(["main","article","section"]);
+  const textTags = new Set([...containerTags,"h1","h2","h3","h4","h5","h6","p"]);
+  const sels = [...textTags, "a[href]"];
+  if (wantTables) sels.push("table");
+
+  const text = [];
+  const links = [];
+  const tables = [];
+
+  for (const el of document.querySelectorAll(sels.join(","))) {
+    // Tables keep growing, so only finished text and links are skipped
+    if (state.done.has(el) || visibility(el) !== SHOWN) continue;
+    const tag = el.localName;
+    if (textTags.has(tag)) {
+      const inner = el.innerText || "";
+      if (!containerTags.has(tag) && inner.trim()) state.done.add(el);
+      for (const raw of inner.split("\n")) {
+        const line = raw.trim();
+        if (line && fresh("t:" + line.replace(/\s+/g, " ").slice(0, 200))) text.push(line);
+      }
+    } else if (tag === "a") {
+      state.done.add(el);
+      const href = el.getAttribute("href");
+      const label = getText(el);
+      if (fresh("a:" + href + "\u0001" + label)) links.push({ text: label, href });
+    } else if (tag === "table") {
+      let id = state.tableIds.get(el);
+      const added = id === undefined;
+      if (added) {
+        id = state.nextTable++;
+        state.tableIds.set(el, id);
+      }
+      const headers = [];
+      if (added && el.tHead) {
+        for (const tr of Array.from(el.tHead.rows)) {
+          const cells = Array.from(tr.cells).map(getText);
+          if (cells.some(Boolean)) headers.push(cells);
+        }
+      }
+      const rows = [];
+      for (const tb of Array.from(el.tBodies || [])) {
+        for (const tr of Array.from(tb.rows)) {
+          if (state.done.has(tr)) continue;
+          const cells = Array.from(tr.cells).map(getText);
+          if (!cells.some(Boolean)) continue;
+          state.done.add(tr);
+          if (fresh("r" + id + ":" + cells.join("\u0001"))) rows.push(cells);
+        }
+      }
+      if (headers.length + rows.length > 0) tables.push({ id, headers, rows });
+    }
+  }
+
+  const doc = document.scrollingElement || document.documentElement;
+  return {
+    text,
+    links,
+    tables,
+    height: doc.scrollHeight,
+    at_end: window.scrollY + window.innerHeight >= doc.scrollHeight - 2,
+    waited_ms: Math.round(waited),
+    evicted: state.evicted,
+  };
+}
@@ -0,0 +1,60 @@
+(() => {
+  if (window.__scraperSettle) return;
+
+  // Track in-flight fetch/XHR requests by start time
+  const requests = new Map();
+  let seq = 0;
+  function track() {
+    const id = ++seq;
+    requests.set(id, performance.now());
+    return () => requests.delete(id);
+  }
+
+  const origFetch = window.fetch;
+  if (origFetch) {
+    window.fetch = function (...args) {
+      const done = track();
+      return origFetch.apply(this, args).finally(done);
+    };
+  }
+  const origSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function (...args) {
+    this.addEventListener("loadend", track(), { once: true });
+    return origSend.apply(this, args);
+  };
+
+  // Requests open longer than longMs (long-polling, streams) are ignored
+  function pending(longMs) {
+    const now = performance.now();
+    let n = 0;
+    for (const t of requests.values()) {
+      if (now - t < longMs) n++;
+    }
+    return n;
+  }
+
+  // Resolve once the DOM has not changed for quietMs and no recent request is
+  // in flight, or after maxMs
+  window.__scraperSettle = async (quietMs, maxMs, longMs) => {
+    const sleep = ms => new Promise(r => setTimeout(r, ms));
+    const start = performance.now();
+    let last = start;
+    const obs = new MutationObserver(() => { last = performance.now(); });
+    obs.observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+    let reason = "timeout";
+    try {
+      while (true) {
+        const now = performance.now();
+        if (now - last >= quietMs && pending(longMs) === 0) {
+          reason = "quiet";
+          break;
+        }
+        if (now - start >= maxMs) break;
+        await sleep(Math.max(10, Math.min(50, quietMs, maxMs - (now - start))));
+      }
+    } finally {
+      obs.disconnect();
+    }
+    return { waited_ms: Math.round(performance.now() - start), reason };
+  };
+})();
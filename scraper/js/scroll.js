@@ -1,21 +1,34 @@
 (async () => {
   const sleep = ms => new Promise(r => setTimeout(r, ms));
+  const adaptive = __ADAPTIVE__ && !!window.__scraperSettle;
+  // Adaptive mode returns as soon as the DOM settles after each scroll
+  const settle = adaptive
+    ? ms => window.__scraperSettle(__QUIET_MS__, ms, __LONG_MS__)
+    : sleep;
+  const start = performance.now();
   let prev = 0;
   let stableCount = 0;
-  const maxStable = 3;
+  const maxStable = adaptive ? 1 : 3;
   const tries = __TRIES__;
+  let steps = 0;
+  let reason = "tries";
   for (let i = 0; i < tries; i++) {
     window.scrollTo(0, document.body.scrollHeight);
-    await sleep(__WAIT_MS__);
+    steps++;
+    await settle(__WAIT_MS__);
     const h = document.body.scrollHeight;
     if (__UNTIL_END__) {
       if (h === prev) {
         stableCount++;
-        if (stableCount >= maxStable) break;
+        if (stableCount >= maxStable) {
+          reason = "stable";
+          break;
+        }
       } else {
         stableCount = 0;
       }
       prev = h;
     }
   }
+  return { waited_ms: Math.round(performance.now() - start), reason, steps };
 })();
@@ -0,0 +1,4 @@
+(async () => {
+  if (!window.__scraperSettle) return null;
+  return await window.__scraperSettle(__QUIET_MS__, __MAX_MS__, __LONG_MS__);
+})();
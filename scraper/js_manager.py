@@ -18,6 +18,10 @@ class JsManager:
     _EXTRACT_TEXT_FILE: Final[str] = "js/extract_text.js"
     _EXTRACT_LINKS_FILE: Final[str] = "js/extract_links.js"
     _EXTRACT_TABLES_FILE: Final[str] = "js/extract_tables.js"
+    _EXTRACT_ALL_FILE: Final[str] = "js/extract_all.js"
+    _QUIESCENCE_FILE: Final[str] = "js/quiescence.js"
+    _WAIT_QUIESCENCE_FILE: Final[str] = "js/wait_quiescence.js"
+    _HARVEST_FILE: Final[str] = "js/harvest.js"
 
     def __init__(self, package: str = __package__ or "scraper") -> None:
         self.package = package
@@ -36,11 +40,26 @@ class JsManager:
         self._cache[name] = script
         return script
 
-    def scroll(self, tries: int, wait_ms: int, until_end: bool) -> str:
+    def scroll(self, tries: int, wait_ms: int, until_end: bool, adaptive: bool = False,
+               quiet_ms: int = 300, long_request_ms: int = 2000) -> str:
         tpl = self._get_cached("scroll", self._SCROLL_FILE).content
         tpl = tpl.replace("__TRIES__", str(tries if tries > 0 else 999999))
         tpl = tpl.replace("__WAIT_MS__", str(wait_ms))
         tpl = tpl.replace("__UNTIL_END__", "true" if until_end else "false")
+        tpl = tpl.replace("__ADAPTIVE__", "true" if adaptive else "false")
+        tpl = tpl.replace("__QUIET_MS__", str(quiet_ms))
+        tpl = tpl.replace("__LONG_MS__", str(long_request_ms))
+        return tpl
+
+    def quiescence_init(self) -> str:
+        """Init script tracking DOM mutations and in-flight requests"""
+        return self._get_cached("quiescence", self._QUIESCENCE_FILE).content
+
+    def wait_quiescence(self, quiet_ms: int, max_ms: int, long_request_ms: int) -> str:
+        tpl = self._get_cached("wait_quiescence", self._WAIT_QUIESCENCE_FILE).content
+        tpl = tpl.replace("__QUIET_MS__", str(quiet_ms))
+        tpl = tpl.replace("__MAX_MS__", str(max_ms))
+        tpl = tpl.replace("__LONG_MS__", str(long_request_ms))
         return tpl
 
     def extract_text(self) -> str:
@@ -51,3 +70,28 @@ class JsManager:
 
     def extract_tables(self) -> str:
         return self._get_cached("extract_tables", self._EXTRACT_TABLES_FILE).content
+
+    def extract_all(self, text: bool = True, links: bool = True, tables: bool = False) -> str:
+        """Single-pass extraction returning ``{text, links, tables}`` in one payload"""
+        tpl = self._get_cached("extract_all", self._EXTRACT_ALL_FILE).content
+        tpl = tpl.replace("__TEXT__", "true" if text else "false")
+        tpl = tpl.replace("__LINKS__", "true" if links else "false")
+        tpl = tpl.replace("__TABLES__", "true" if tables else "false")
+        return tpl
+
+    def harvest(self, wait_ms: int, tables: bool = False, seen_limit: int = 20000,
+                adaptive: bool = False, quiet_ms: int = 300, long_request_ms: int = 2000) -> str:
+        """Scroll-and-harvest step, called as ``page.evaluate(script, scroll)``.
+
+        Returns only the text, links and table rows not returned by an
+        earlier step on the same page, plus the page height and whether the
+        viewport is at the bottom.
+        """
+        tpl = self._get_cached("harvest", self._HARVEST_FILE).content
+        tpl = tpl.replace("__WAIT_MS__", str(wait_ms))
+        tpl = tpl.replace("__TABLES__", "true" if tables else "false")
+        tpl = tpl.replace("__SEEN_LIMIT__", str(max(1, seen_limit)))
+        tpl = tpl.replace("__ADAPTIVE__", "true" if adaptive else "false")
+        tpl = tpl.replace("__QUIET_MS__", str(quiet_ms))
+        tpl = tpl.replace("__LONG_MS__", str(long_request_ms))
+        return tpl
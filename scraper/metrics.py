@@ -0,0 +1,248 @@
+import contextlib
+import math
+import time
+from collections import deque
+from typing import Any, Callable, ContextManager, Deque, Dict, List, Optional, Tuple
+
+
+# Phases of a page visit, in the order they happen
+PHASES = (
+    "politeness", "slot", "lookup", "static_fetch", "pool_acquire",
+    "goto", "automation", "extraction", "total",
+)
+
+PageHook = Callable[[str, Dict[str, float], Dict[str, Any]], None]
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with bounded memory.
+
+    Bucket bounds grow by ``growth`` per bucket, so a quantile estimate is
+    within ``growth - 1`` of the true value however many samples are added.
+    """
+
+    _MIN_MS = 0.01
+
+    def __init__(self, growth: float = 1.05) -> None:
+        self._log_growth = math.log(growth)
+        self.growth = growth
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float) -> None:
+        index = 0 if ms <= self._MIN_MS else int(math.log(ms / self._MIN_MS) / self._log_growth) + 1
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def quantile(self, q: float) -> float:
+        """Estimated ``q``-quantile in milliseconds (0 if empty)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                if index == 0:
+                    return min(self._MIN_MS, self.max_ms)
+                # Geometric middle of the bucket, capped by the largest sample
+                return min(self._MIN_MS * self.growth ** (index - 0.5), self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "p50_ms": round(self.quantile(0.50), 3),
+            "p95_ms": round(self.quantile(0.95), 3),
+            "p99_ms": round(self.quantile(0.99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class PageTimings:
+    """Phase durations of one page visit, in milliseconds"""
+
+    __slots__ = ("url", "phases", "error", "_start")
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.phases: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self._start = time.perf_counter()
+
+    @staticmethod
+    def clock() -> float:
+        return time.perf_counter()
+
+    def record(self, phase: str, since: float) -> None:
+        """Add the time since ``since`` (a :meth:`clock` value) to ``phase``"""
+        self.phases[phase] = self.phases.get(phase, 0.0) + (time.perf_counter() - since) * 1000
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def failed(self, error: BaseException) -> None:
+        self.error = type(error).__name__
+
+    def finish(self) -> None:
+        self.record("total", self._start)
+
+
+class _NullTimings:
+    """Stand-in for :class:`PageTimings` when metrics are off; every call is a no-op"""
+
+    __slots__ = ()
+    _NULL_CONTEXT = contextlib.nullcontext()
+
+    @staticmethod
+    def clock() -> float:
+        return 0.0
+
+    def record(self, phase: str, since: float) -> None:
+        pass
+
+    def phase(self, name: str) -> ContextManager[None]:
+        return self._NULL_CONTEXT
+
+    def failed(self, error: BaseException) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+NULL_TIMINGS = _NullTimings()
+
+
+class CrawlMetrics:
+    """Per-phase latency histograms, error counters and queue depth of a crawl.
+
+    The scraper records each page's phase timings; :meth:`add_hook` callbacks
+    get them as each page completes (``hook(url, timings_ms, result)``).
+    Queue depth is sampled at most every ``sample_interval_ms`` and the
+    last ``max_samples`` samples are kept. Export with :meth:`to_dict` or
+    :meth:`to_prometheus`.
+    """
+
+    def __init__(self, attach_to_results: bool = False, sample_interval_ms: int = 1000,
+                 max_samples: int = 3600) -> None:
+        self.attach_to_results = attach_to_results
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.pages = 0
+        self.errors: Dict[str, int] = {}
+        self.timeouts = 0
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.queue_samples: Deque[Tuple[float, int, int]] = deque(maxlen=max_samples)
+        self._sample_interval = max(0, sample_interval_ms) / 1000
+        self._next_sample = 0.0
+        self._started = time.monotonic()
+        self._hooks: List[PageHook] = []
+
+    @classmethod
+    def from_config(cls, config) -> Optional["CrawlMetrics"]:
+        """None if neither metrics nor per-result timings are requested"""
+        if not (config.metrics or config.result_timings):
+            return None
+        return cls(attach_to_results=config.result_timings,
+                   sample_interval_ms=config.metrics_interval_ms)
+
+    def add_hook(self, hook: PageHook) -> None:
+        self._hooks.append(hook)
+
+    def page(self, url: str) -> PageTimings:
+        return PageTimings(url)
+
+    def page_done(self, timings: PageTimings, result: Dict[str, Any]) -> None:
+        """Fold one finished page into the aggregates and call the hooks"""
+        timings.finish()
+        self.pages += 1
+        for phase, ms in timings.phases.items():
+            histogram = self.histograms.get(phase)
+            if histogram is None:
+                histogram = self.histograms[phase] = LatencyHistogram()
+            histogram.add(ms)
+        if timings.error is not None:
+            self.errors[timings.error] = self.errors.get(timings.error, 0) + 1
+            if "Timeout" in timings.error:
+                self.timeouts += 1
+        if self.attach_to_results:
+            result["timings"] = {phase: round(ms, 3) for phase, ms in timings.phases.items()}
+        for hook in self._hooks:
+            hook(timings.url, timings.phases, result)
+
+    def sample_due(self) -> bool:
+        return time.monotonic() >= self._next_sample
+
+    def sample_queue(self, depth: int, in_flight: int) -> None:
+        now = time.monotonic()
+        self.queue_depth = depth
+        self.in_flight = in_flight
+        self.queue_samples.append((round(now - self._started, 3), depth, in_flight))
+        self._next_sample = now + self._sample_interval
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "phases": {
+                phase: self.histograms[phase].summary()
+                for phase in sorted(self.histograms, key=_phase_order)
+            },
+            "errors": dict(self.errors),
+            "timeouts": self.timeouts,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "queue_samples": [list(sample) for sample in self.queue_samples],
+        }
+
+    def to_prometheus(self, prefix: str = "scraper") -> str:
+        """Prometheus text exposition: phase summaries, counters and gauges"""
+        lines = [
+            f"# HELP {prefix}_phase_seconds Time spent per page in each visit phase",
+            f"# TYPE {prefix}_phase_seconds summary",
+        ]
+        for phase in sorted(self.histograms, key=_phase_order):
+            histogram = self.histograms[phase]
+            for q in (0.5, 0.95, 0.99):
+                lines.append(
+                    f'{prefix}_phase_seconds{{phase="{phase}",quantile="{q}"}} '
+                    f"{histogram.quantile(q) / 1000:.6f}"
+                )
+            lines.append(f'{prefix}_phase_seconds_sum{{phase="{phase}"}} {histogram.sum_ms / 1000:.6f}')
+            lines.append(f'{prefix}_phase_seconds_count{{phase="{phase}"}} {histogram.count}')
+        lines += [
+            f"# HELP {prefix}_pages_total Pages visited",
+            f"# TYPE {prefix}_pages_total counter",
+            f"{prefix}_pages_total {self.pages}",
+            f"# HELP {prefix}_errors_total Failed page visits by exception type",
+            f"# TYPE {prefix}_errors_total counter",
+        ]
+        for kind, count in sorted(self.errors.items()):
+            lines.append(f'{prefix}_errors_total{{type="{kind}"}} {count}')
+        lines += [
+            f"# HELP {prefix}_timeouts_total Page visits that failed with a timeout",
+            f"# TYPE {prefix}_timeouts_total counter",
+            f"{prefix}_timeouts_total {self.timeouts}",
+            f"# HELP {prefix}_queue_depth URLs waiting in the frontier",
+            f"# TYPE {prefix}_queue_depth gauge",
+            f"{prefix}_queue_depth {self.queue_depth}",
+            f"# HELP {prefix}_in_flight Pages being visited",
+            f"# TYPE {prefix}_in_flight gauge",
+            f"{prefix}_in_flight {self.in_flight}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _phase_order(phase: str) -> Tuple[int, str]:
+    return (PHASES.index(phase) if phase in PHASES else len(PHASES), phase)
@@ -0,0 +1,103 @@
+import re
+from collections import Counter
+from hashlib import blake2b
+from typing import Dict, List, Optional, Tuple
+
+
+_WORD = re.compile(r"\w+")
+
+
+def simhash(text: str, shingle: int = 1) -> int:
+    """64-bit SimHash of ``text`` over word ``shingle``-grams, weighted by count.
+
+    Texts that share most of their features get fingerprints a small Hamming
+    distance apart. Single words are the most stable features: changing a few
+    words of a page moves the fingerprint by at most a few bits. Bits are
+    accumulated per byte of the feature hashes, which keeps the per-feature
+    work to a few dictionary updates.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < shingle:
+        features = Counter([" ".join(words)]) if words else Counter()
+    else:
+        features = Counter(" ".join(words[i:i + shingle]) for i in range(len(words) - shingle + 1))
+
+    # byte_counts[pos][value] = total weight of features with that byte at pos
+    byte_counts: List[Counter] = [Counter() for _ in range(8)]
+    total = 0
+    for feature, weight in features.items():
+        digest = blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        for pos in range(8):
+            byte_counts[pos][digest[pos]] += weight
+        total += weight
+
+    fp = 0
+    for pos, counts in enumerate(byte_counts):
+        for bit in range(8):
+            mask = 1 << bit
+            ones = sum(w for value, w in counts.items() if value & mask)
+            if 2 * ones > total:
+                fp |= 1 << (pos * 8 + bit)
+    return fp
+
+
+class SimHashIndex:
+    """Index of 64-bit SimHash fingerprints for near-duplicate lookups.
+
+    Fingerprints are split into ``distance + 1`` bands; by the pigeonhole
+    principle two fingerprints within ``distance`` bits agree exactly on at
+    least one band, so a lookup only compares against fingerprints sharing
+    a band value instead of scanning the whole index.
+    """
+
+    def __init__(self, distance: int = 3) -> None:
+        self.distance = max(0, distance)
+        bands = self.distance + 1
+        width = 64 // bands
+        self._bands: List[Tuple[int, int]] = [
+            (i * width, (1 << (width if i < bands - 1 else 64 - i * width)) - 1)
+            for i in range(bands)
+        ]
+        self._tables: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in self._bands]
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def find(self, fp: int) -> Optional[str]:
+        """Key of an indexed fingerprint within ``distance`` bits of ``fp``"""
+        for (shift, mask), table in zip(self._bands, self._tables):
+            for other, key in table.get((fp >> shift) & mask, ()):
+                if (fp ^ other).bit_count() <= self.distance:
+                    return key
+        return None
+
+    def add(self, fp: int, key: str) -> None:
+        for (shift, mask), table in zip(self._bands, self._tables):
+            table.setdefault((fp >> shift) & mask, []).append((fp, key))
+        self._count += 1
+
+
+class NearDuplicateDetector:
+    """Flags pages whose extracted text is a near-duplicate of an earlier page.
+
+    Pages with fewer than ``min_words`` words are never flagged, so empty
+    and error pages do not collapse into one.
+    """
+
+    def __init__(self, distance: int = 3, min_words: int = 20) -> None:
+        self.index = SimHashIndex(distance)
+        self.min_words = min_words
+        self.flagged = 0
+
+    def check(self, url: str, text: str) -> Optional[str]:
+        """URL of an earlier near-duplicate of ``text``; otherwise index it and return None"""
+        if len(_WORD.findall(text)) < self.min_words:
+            return None
+        fp = simhash(text)
+        original = self.index.find(fp)
+        if original is not None:
+            self.flagged += 1
+            return original
+        self.index.add(fp, url)
+        return None
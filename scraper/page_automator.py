@@ -5,14 +5,17 @@ from typing import Optional
 from playwright.async_api import Page
 from .scraping_config import ScrapingConfig
 from .js_manager import JsManager
+from .wait_engine import WaitEngine
 
 
 class PageAutomator:
     """Handles page automation tasks like scrolling, clicking, and JavaScript execution"""
     
-    def __init__(self, config: ScrapingConfig, js_manager: Optional[JsManager] = None):
+    def __init__(self, config: ScrapingConfig, js_manager: Optional[JsManager] = None,
+                 wait_engine: Optional[WaitEngine] = None):
         self.config = config
         self.js_manager = js_manager or JsManager()
+        self.wait_engine = wait_engine or WaitEngine(js_manager=self.js_manager)
 
     async def run_page_automation(self, page: Page) -> None:
         """Run all configured page automation tasks"""
@@ -26,8 +29,8 @@ class PageAutomator:
             except Exception:
                 pass
 
-        # Auto scroll
-        if self.config.scrolls or self.config.scroll_until_end:
+        # Auto scroll; in harvest mode extraction does the scrolling
+        if (self.config.scrolls or self.config.scroll_until_end) and not self.config.scroll_harvest:
             await self._scroll_page(page)
 
         # Click selectors
@@ -43,24 +46,25 @@ class PageAutomator:
             tries=self.config.scrolls,
             wait_ms=self.config.scroll_wait_ms,
             until_end=self.config.scroll_until_end,
+            adaptive=self.wait_engine.adaptive,
+            quiet_ms=self.wait_engine.quiet_ms,
+            long_request_ms=self.wait_engine.long_request_ms,
         )
-        await page.evaluate(script)
+        info = await page.evaluate(script)
+        if info:
+            self.wait_engine.record(page, {"phase": "scroll", **info})
 
     async def _click_selector(self, page: Page, selector: str) -> None:
         """Click a specific selector on the page"""
         try:
             button = await page.query_selector(selector)
-            if button:
-                await button.click()
-                await page.wait_for_load_state(
-                    "networkidle", 
-                    timeout=self.config.post_click_wait_ms
-                )
+            if not button:
+                return
+            await button.click()
         except Exception:
-            try:
-                await page.wait_for_timeout(self.config.post_click_wait_ms)
-            except Exception:
-                pass
+            # Nothing was clicked, so there is nothing to wait for
+            return
+        await self.wait_engine.settle(page, "click", max_ms=self.config.post_click_wait_ms)
 
     async def _run_custom_js(self, page: Page) -> None:
         """Run custom JavaScript code on the page"""
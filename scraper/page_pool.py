@@ -0,0 +1,154 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List
+from playwright.async_api import BrowserContext, Page
+
+
+ContextFactory = Callable[[], Awaitable[BrowserContext]]
+
+
+class _PooledContext:
+    """Bookkeeping for one browser context owned by the pool"""
+
+    def __init__(self, context: BrowserContext) -> None:
+        self.context = context
+        self.idle: List[Page] = []
+        self.open_pages = 0
+        self.pages_served = 0
+        self.retiring = False
+
+
+class PagePool:
+    """Reusable pages spread over several browser contexts.
+
+    Released pages are reset by navigating to ``about:blank`` and kept for the
+    next visit, up to ``pool_size`` idle pages in total (0 disables reuse).
+    A context is retired once it has served ``context_max_pages`` pages or a
+    released page reports a JS heap above ``context_max_memory_mb``; it is
+    closed when its last page comes back and replaced by a fresh one.
+    """
+
+    _RESET_URL = "about:blank"
+    _HEAP_SCRIPT = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+    def __init__(self, context_factory: ContextFactory, contexts: int = 1, pool_size: int = 0,
+                 context_max_pages: int = 0, context_max_memory_mb: int = 0) -> None:
+        self.context_factory = context_factory
+        self.contexts = max(1, contexts)
+        self.pool_size = max(0, pool_size)
+        self.context_max_pages = max(0, context_max_pages)
+        self.context_max_memory = max(0, context_max_memory_mb) * 1024 * 1024
+        self._active: List[_PooledContext] = []
+        self._retired: List[_PooledContext] = []
+        self._owners: Dict[Page, _PooledContext] = {}
+        self._idle_count = 0
+        # Held while picking or creating a context, so concurrent acquires
+        # cannot all see room below ``contexts`` and each create one
+        self._context_lock = asyncio.Lock()
+        self.stats: Dict[str, int] = {
+            "pages_created": 0,
+            "reuse_hits": 0,
+            "contexts_created": 0,
+            "contexts_recycled": 0,
+        }
+
+    async def acquire(self) -> Page:
+        """Return an idle page if one is available, else open a new one"""
+        pooled = await self._pick_context()
+        pooled.open_pages += 1
+        if pooled.idle:
+            page = pooled.idle.pop()
+            self._idle_count -= 1
+            self.stats["reuse_hits"] += 1
+        else:
+            try:
+                page = await pooled.context.new_page()
+            except BaseException:
+                pooled.open_pages -= 1
+                raise
+            self.stats["pages_created"] += 1
+        # Retire after taking the page: _retire drops the remaining idle pages
+        # from the count, and none of them is handed out again
+        pooled.pages_served += 1
+        if self.context_max_pages and pooled.pages_served >= self.context_max_pages:
+            self._retire(pooled)
+        self._owners[page] = pooled
+        return page
+
+    async def release(self, page: Page) -> None:
+        """Return a page to the pool, resetting or closing it"""
+        pooled = self._owners.pop(page, None)
+        if pooled is None:
+            await self._close_page(page)
+            return
+        pooled.open_pages -= 1
+
+        # The heap check applies whether or not the page is kept for reuse
+        if self.context_max_memory and not pooled.retiring:
+            if await self._heap_size(page) > self.context_max_memory:
+                self._retire(pooled)
+        keep = not pooled.retiring and self._idle_count < self.pool_size
+        if keep:
+            try:
+                await page.goto(self._RESET_URL)
+            except Exception:
+                keep = False
+
+        if keep:
+            pooled.idle.append(page)
+            self._idle_count += 1
+        else:
+            await self._close_page(page)
+            if pooled.retiring and pooled.open_pages == 0:
+                await self._close_context(pooled)
+
+    async def close(self) -> None:
+        """Close every page and context owned by the pool"""
+        for pooled in self._active + self._retired:
+            await self._close_context(pooled)
+        self._active.clear()
+        self._owners.clear()
+        self._idle_count = 0
+
+    async def _pick_context(self) -> _PooledContext:
+        async with self._context_lock:
+            candidates = [c for c in self._active if c.idle]
+            if not candidates:
+                if len(self._active) < self.contexts:
+                    context = await self.context_factory()
+                    self.stats["contexts_created"] += 1
+                    pooled = _PooledContext(context)
+                    self._active.append(pooled)
+                    return pooled
+                candidates = self._active
+            return min(candidates, key=lambda c: c.open_pages)
+
+    def _retire(self, pooled: _PooledContext) -> None:
+        if pooled.retiring:
+            return
+        pooled.retiring = True
+        self._active.remove(pooled)
+        self._retired.append(pooled)
+        self._idle_count -= len(pooled.idle)
+        self.stats["contexts_recycled"] += 1
+
+    async def _close_context(self, pooled: _PooledContext) -> None:
+        if pooled in self._retired:
+            self._retired.remove(pooled)
+        pooled.idle.clear()
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass
+
+    async def _heap_size(self, page: Page) -> int:
+        try:
+            return int(await page.evaluate(self._HEAP_SCRIPT) or 0)
+        except Exception:
+            return 0
+
+    @staticmethod
+    async def _close_page(page: Page) -> None:
+        try:
+            await page.close()
+        except Exception:
+            pass
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict
+from .url_normalizer import URLNormalizer
+
+
+class PolitenessScheduler:
+    """Per-host pacing and concurrency caps, enforced before a page is dispatched.
+
+    Each host gets a minimum interval between dispatches and, optionally, a cap
+    on concurrently open pages. Waiting happens before the caller takes a
+    concurrency slot, so pages for other hosts can use the slot meanwhile.
+    ``clock`` and ``sleep`` can be swapped for a fake clock in tests.
+    """
+
+    def __init__(self, min_interval_ms: int = 0, per_host_concurrency: int = 0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep) -> None:
+        self.min_interval = max(0, min_interval_ms) / 1000
+        self.per_host_concurrency = max(0, per_host_concurrency)
+        self._clock = clock
+        self._sleep = sleep
+        self._next_dispatch: Dict[str, float] = {}
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        return URLNormalizer.normalize_host(url)
+
+    def delay_for(self, url: str) -> float:
+        """Seconds until ``url``'s host may be dispatched again"""
+        next_at = self._next_dispatch.get(self.host_key(url))
+        if next_at is None:
+            return 0.0
+        return max(0.0, next_at - self._clock())
+
+    def is_ready(self, url: str) -> bool:
+        """True if ``url`` could be dispatched now without waiting"""
+        host = self.host_key(url)
+        slots = self._host_slots.get(host)
+        if slots is not None and slots.locked():
+            return False
+        next_at = self._next_dispatch.get(host)
+        return next_at is None or next_at <= self._clock()
+
+    async def acquire(self, url: str) -> None:
+        """Wait until ``url``'s host has a free slot and its interval has passed"""
+        host = self.host_key(url)
+        if self.per_host_concurrency:
+            slots = self._host_slots.get(host)
+            if slots is None:
+                slots = self._host_slots[host] = asyncio.Semaphore(self.per_host_concurrency)
+            await slots.acquire()
+        try:
+            while True:
+                wait = self._next_dispatch.get(host, 0.0) - self._clock()
+                if wait <= 0:
+                    break
+                await self._sleep(wait)
+        except BaseException:
+            self._release_host(host)
+            raise
+        # Reserve the next dispatch time before yielding control
+        self._next_dispatch[host] = self._clock() + self.min_interval
+
+    def release(self, url: str) -> None:
+        self._release_host(self.host_key(url))
+
+    def _release_host(self, host: str) -> None:
+        slots = self._host_slots.get(host)
+        if slots is not None:
+            slots.release()
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Hold a per-host slot for the duration of a page visit"""
+        await self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(url)
@@ -0,0 +1,162 @@
+import heapq
+import itertools
+import urllib.parse
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .frontier import FrontierItem
+from .url_policy import compile_patterns
+
+
+# (url, depth, anchor text) -> priority; higher is visited first
+ScoreFn = Callable[[str, int, str], float]
+
+
+class URLScorer:
+    """Default frontier scoring: shallow pages, weighted URL patterns and anchor keywords.
+
+    ``score = pattern weights + keyword weights - depth_weight * depth``.
+    Pattern weights apply when a glob (or ``re:`` regex) matches the URL;
+    keyword weights when the keyword occurs in the link's anchor text
+    (case-insensitive). Weights can be negative to push noise such as
+    pagination or tag pages to the back of the frontier.
+    """
+
+    def __init__(self, depth_weight: float = 1.0,
+                 pattern_weights: Optional[Mapping[str, float]] = None,
+                 keyword_weights: Optional[Mapping[str, float]] = None) -> None:
+        self.depth_weight = depth_weight
+        self._patterns = [
+            (compile_patterns([pattern]).match, weight)
+            for pattern, weight in (pattern_weights or {}).items()
+        ]
+        self._keywords = [(kw.lower(), weight) for kw, weight in (keyword_weights or {}).items()]
+
+    @classmethod
+    def from_config(cls, config) -> "URLScorer":
+        return cls(
+            depth_weight=config.priority_depth_weight,
+            pattern_weights=config.priority_patterns,
+            keyword_weights=config.priority_keywords,
+        )
+
+    def __call__(self, url: str, depth: int, anchor: str = "") -> float:
+        score = -self.depth_weight * depth
+        for match, weight in self._patterns:
+            if match(url):
+                score += weight
+        if anchor and self._keywords:
+            anchor = anchor.lower()
+            for keyword, weight in self._keywords:
+                if keyword in anchor:
+                    score += weight
+        return score
+
+
+class PriorityFrontier:
+    """Best-first frontier of ``(url, depth)`` ordered by a scoring function.
+
+    A drop-in replacement for :class:`SpillingFrontier`: ``popleft`` returns
+    the highest-scoring entry, ties in insertion order. A URL already waiting
+    in the frontier is not queued twice. ``path_budgets`` caps how many URLs
+    under a path prefix (e.g. ``/tag/``) are handed out for visiting; the
+    longest matching prefix counts. Budgets are charged when an entry is
+    popped, so the best-scoring URLs under a prefix get its budget; once a
+    budget is spent, the prefix's waiting entries are dropped. Entries are
+    kept in memory.
+    """
+
+    def __init__(self, items: Iterable[FrontierItem] = (), scorer: Optional[ScoreFn] = None,
+                 path_budgets: Optional[Mapping[str, int]] = None) -> None:
+        self.scorer: ScoreFn = scorer or URLScorer()
+        # Longest prefix first so the most specific budget applies
+        self._budgets: List[Tuple[str, int]] = sorted(
+            (path_budgets or {}).items(), key=lambda kv: len(kv[0]), reverse=True
+        )
+        self._limits: Dict[str, int] = dict(self._budgets)
+        self._used: Dict[str, int] = {}
+        # Entries waiting under each budgeted prefix, and how many of all
+        # waiting entries sit under a spent budget and will be dropped
+        self._waiting: Dict[str, int] = {}
+        self._dead = 0
+        self._heap: List[Tuple[float, int, str, int, Optional[str]]] = []
+        self._queued: Set[str] = set()
+        self._seq = itertools.count()
+        self.over_budget = 0
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._dead
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def append(self, item: FrontierItem, anchor: str = "") -> None:
+        url, depth = item
+        if url in self._queued:
+            return
+        prefix = self._prefix(url) if self._budgets else None
+        if prefix is not None:
+            if self._spent(prefix):
+                self.over_budget += 1
+                return
+            self._waiting[prefix] = self._waiting.get(prefix, 0) + 1
+        self._queued.add(url)
+        score = self.scorer(url, depth, anchor)
+        heapq.heappush(self._heap, (-score, next(self._seq), url, depth, prefix))
+
+    def popleft(self) -> FrontierItem:
+        while True:
+            entry = heapq.heappop(self._heap)
+            if self._take(entry):
+                return entry[2], entry[3]
+
+    def pop_first(self, predicate: Callable[[str], bool], window: int) -> Optional[FrontierItem]:
+        """Remove and return the best of the top ``window`` entries whose URL matches"""
+        heap = self._heap
+        skipped = []
+        found = None
+        while heap and len(skipped) < window:
+            entry = heapq.heappop(heap)
+            if entry[4] is not None and self._spent(entry[4]):
+                self._take(entry)
+                continue
+            if predicate(entry[2]):
+                found = entry
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        if found is None:
+            return None
+        self._take(found)
+        return found[2], found[3]
+
+    def close(self) -> None:
+        pass
+
+    def _prefix(self, url: str) -> Optional[str]:
+        path = urllib.parse.urlsplit(url).path or "/"
+        for prefix, _ in self._budgets:
+            if path.startswith(prefix):
+                return prefix
+        return None
+
+    def _spent(self, prefix: str) -> bool:
+        return self._used.get(prefix, 0) >= self._limits[prefix]
+
+    def _take(self, entry: Tuple[float, int, str, int, Optional[str]]) -> bool:
+        """Charge a popped entry to its budget; False if the budget is spent and it is dropped"""
+        self._queued.discard(entry[2])
+        prefix = entry[4]
+        if prefix is None:
+            return True
+        self._waiting[prefix] -= 1
+        if self._spent(prefix):
+            self._dead -= 1
+            self.over_budget += 1
+            return False
+        self._used[prefix] = self._used.get(prefix, 0) + 1
+        if self._spent(prefix):
+            self._dead += self._waiting[prefix]
+        return True
@@ -0,0 +1,203 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import sqlite3
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from playwright.async_api import BrowserContext, Page, Route
+
+
+@dataclass
+class PageRecord:
+    """What the previous crawl saw for one URL"""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+    links: List[Dict[str, str]]
+
+
+class RecrawlIndex:
+    """Persistent per-URL validators and content fingerprints for incremental crawls.
+
+    For each URL the index keeps the ``ETag``/``Last-Modified`` validators and a
+    hash of the extracted text, links and tables. Revisits send conditional
+    requests, and a page is *unchanged* when the server answers ``304`` or the
+    extracted content hashes to the stored value. Unchanged pages are not
+    emitted; their stored links are re-queued so changed pages below them are
+    still found. Lookups and writes run on a dedicated thread.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS pages ("
+        " url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+        " content_hash TEXT NOT NULL, links TEXT NOT NULL, fetched_at REAL NOT NULL)",
+    )
+
+    def __init__(self, path: str, flush_interval_ms: int = 1000) -> None:
+        self.path = path
+        self.flush_interval = max(10, flush_interval_ms) / 1000
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recrawl-index")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: List[tuple] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._armed: "weakref.WeakKeyDictionary[Page, Dict[str, str]]" = weakref.WeakKeyDictionary()
+        self.stats: Dict[str, int] = {"new": 0, "changed": 0, "unchanged": 0, "not_modified": 0}
+
+    async def open(self) -> None:
+        await self._run(self._open_sync)
+        self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+        await self.flush()
+        await self._run(self._close_sync)
+        self._executor.shutdown(wait=True)
+
+    async def lookup(self, url: str) -> Optional[PageRecord]:
+        return await self._run(self._lookup_sync, url)
+
+    @staticmethod
+    def conditional_headers(record: Optional[PageRecord]) -> Dict[str, str]:
+        """Request headers that let the server answer 304 for ``record``"""
+        headers: Dict[str, str] = {}
+        if record is not None:
+            if record.etag:
+                headers["If-None-Match"] = record.etag
+            if record.last_modified:
+                headers["If-Modified-Since"] = record.last_modified
+        return headers
+
+    @staticmethod
+    def content_hash(result: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            [result.get("text", ""), result.get("links", []), result.get("tables")],
+            ensure_ascii=False, sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def reconcile(self, result: Dict[str, Any], previous: Optional[PageRecord],
+                  headers: Dict[str, str], not_modified: bool = False) -> Dict[str, Any]:
+        """Classify a visit as new, changed or unchanged and update the index.
+
+        Returns the result to use: unchanged pages become a stub carrying the
+        stored links and ``"unchanged": True``.
+        """
+        if "error" in result:
+            return result
+        if previous is not None and not_modified:
+            self.stats["not_modified"] += 1
+            return self._unchanged(result, previous, headers)
+
+        digest = self.content_hash(result)
+        if previous is not None and previous.content_hash == digest:
+            return self._unchanged(result, previous, headers)
+
+        self.stats["changed" if previous is not None else "new"] += 1
+        result["change"] = "changed" if previous is not None else "new"
+        self._pending.append((
+            result["url"], headers.get("etag"), headers.get("last-modified"), digest,
+            json.dumps(result.get("links", []), ensure_ascii=False), time.time(),
+        ))
+        return result
+
+    def _unchanged(self, result: Dict[str, Any], previous: PageRecord,
+                   headers: Dict[str, str]) -> Dict[str, Any]:
+        self.stats["unchanged"] += 1
+        # Keep the validators current: the server may rotate them without
+        # changing the content, and stale ones would never match again
+        self._pending.append((
+            previous.url, headers.get("etag") or previous.etag,
+            headers.get("last-modified") or previous.last_modified, previous.content_hash,
+            json.dumps(previous.links, ensure_ascii=False), time.time(),
+        ))
+        return {
+            "url": result["url"],
+            "depth": result.get("depth", 0),
+            "links": previous.links,
+            "unchanged": True,
+        }
+
+    # -- conditional navigation requests -----------------------------------
+
+    async def install(self, context: BrowserContext) -> None:
+        """Add conditional headers to armed pages' main navigation request"""
+        await context.route("**/*", self._handle_route)
+
+    def arm(self, page: Page, headers: Dict[str, str]) -> None:
+        if headers:
+            self._armed[page] = headers
+
+    def disarm(self, page: Page) -> None:
+        self._armed.pop(page, None)
+
+    async def _handle_route(self, route: Route) -> None:
+        request = route.request
+        headers = None
+        if request.is_navigation_request():
+            try:
+                page = request.frame.page
+                if request.frame == page.main_frame:
+                    headers = self._armed.pop(page, None)
+            except Exception:
+                headers = None
+        if headers:
+            await route.fallback(headers={**request.headers, **headers})
+        else:
+            await route.fallback()
+
+    # -- persistence ---------------------------------------------------------
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        await self._run(self._write_sync, pending)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _open_sync(self) -> None:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+        self._conn = conn
+
+    def _close_sync(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _lookup_sync(self, url: str) -> Optional[PageRecord]:
+        row = self._conn.execute(
+            "SELECT etag, last_modified, content_hash, links FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, content_hash, links = row
+        return PageRecord(url, etag, last_modified, content_hash, json.loads(links))
+
+    def _write_sync(self, rows: List[tuple]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages"
+                " (url, etag, last_modified, content_hash, links, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
@@ -0,0 +1,119 @@
+import asyncio
+import contextlib
+from collections import deque
+from dataclasses import replace
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+from playwright.async_api import Route
+
+from .page_pool import PagePool
+from .scraping_config import ScrapingConfig
+from .sinks import ResultSink
+from .snapshots import PageSnapshot, SnapshotStore
+from .static_fetcher import StaticFetcher
+from .web_scraper import WebScraper
+
+
+# Set by the browser for the body as it is served; the recorded body is already decoded
+_HOP_HEADERS = frozenset(["content-encoding", "content-length", "transfer-encoding"])
+
+
+class ReplayScraper(WebScraper):
+    """Re-runs extraction over recorded snapshots without touching the network.
+
+    Pages recorded from the HTTP path are re-parsed with the static parser.
+    Browser pages are loaded from their recorded DOM, with the recorded
+    responses served through Playwright routing: stylesheets and images
+    come back as recorded, scripts are not re-run, and anything not
+    recorded is aborted. ``ContentExtractor`` then runs as in a live crawl.
+    Pages are replayed ``config.concurrency`` at a time, without politeness
+    delays. Results match a crawl's and carry ``"replayed": True``.
+    """
+
+    def __init__(self, config: ScrapingConfig, store: str, sinks: Iterable[ResultSink] = ()) -> None:
+        # Replaying must not record over the store it reads
+        super().__init__(
+            replace(config, record_dir=None, state_file=None, incremental_db=None), sinks=sinks
+        )
+        self.store = SnapshotStore(store)
+        self.parser = self.static_fetcher or StaticFetcher(self.config, url_policy=self.url_policy)
+        self.replayed = 0
+
+    async def replay(self, urls: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Re-extract recorded pages; collects every result into ``self.results``"""
+        async for result in self.iter_replay(urls):
+            self.results.append(result)
+        return self.results
+
+    async def iter_replay(self, urls: Optional[Iterable[str]] = None
+                          ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield re-extracted results for ``urls`` (default: every recorded page)"""
+        async with contextlib.aclosing(self._iter_crawl(self._replay_all(urls))) as results:
+            async for result in results:
+                yield result
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["replayed"] = self.replayed
+        return stats
+
+    async def _replay_all(self, urls: Optional[Iterable[str]]) -> None:
+        async with self.store:
+            pending = deque(urls if urls is not None else await self.store.urls())
+            async with self._session() as (pool, semaphore):
+
+                async def worker() -> None:
+                    while pending:
+                        snapshot = await self.store.load(pending.popleft())
+                        if snapshot is None:
+                            continue
+                        async with semaphore:
+                            result = await self._replay_page(snapshot, pool)
+                        self.replayed += 1
+                        await self._emit(result)
+
+                workers = max(1, self.config.concurrency)
+                await asyncio.gather(*(worker() for _ in range(workers)))
+
+    async def _replay_page(self, snapshot: PageSnapshot, pool: PagePool) -> Dict[str, Any]:
+        if snapshot.fetch == "http":
+            page, _ = self.parser.parse(snapshot.dom, snapshot.final_url)
+            result = self._build_result(snapshot.url, snapshot.depth, page.text, page.links, page.tables)
+        else:
+            result = await self._replay_browser(snapshot, pool)
+        result["fetch"] = snapshot.fetch
+        result["replayed"] = True
+        return result
+
+    async def _replay_browser(self, snapshot: PageSnapshot, pool: PagePool) -> Dict[str, Any]:
+        recorded = {r.url: r for r in snapshot.responses}
+
+        async def serve(route: Route) -> None:
+            request = route.request
+            if request.is_navigation_request() and request.frame.parent_frame is None:
+                await route.fulfill(
+                    status=200, content_type="text/html; charset=utf-8", body=snapshot.dom
+                )
+                return
+            response = recorded.get(request.url)
+            if response is None or request.resource_type == "script":
+                await route.abort()
+                return
+            headers = {k: v for k, v in response.headers.items() if k.lower() not in _HOP_HEADERS}
+            await route.fulfill(status=response.status, headers=headers, body=response.body)
+
+        page = await pool.acquire()
+        try:
+            await page.route("**/*", serve)
+            await page.goto(snapshot.final_url, timeout=self.config.goto_timeout_ms, wait_until="load")
+            text, links, tables = await self.content_extractor.extract_content(
+                page, include_tables=self.config.include_tables
+            )
+            result = self._build_result(snapshot.url, snapshot.depth, text, links, tables)
+        except Exception as e:
+            result = self._build_result(snapshot.url, snapshot.depth, "", [], [])
+            result["error"] = str(e)
+        finally:
+            with contextlib.suppress(Exception):
+                await page.unroute("**/*", serve)
+            await pool.release(page)
+        return result
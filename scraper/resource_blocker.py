@@ -0,0 +1,131 @@
+import re
+import weakref
+from fnmatch import translate
+from typing import Dict, Iterable, List, Optional
+from playwright.async_api import BrowserContext, Page, Request, Route
+from .url_normalizer import URLNormalizer
+
+
+# Common analytics/ad hosts blocked by the presets
+TRACKER_PATTERNS: List[str] = [
+    "*://*.google-analytics.com/*",
+    "*://*.googletagmanager.com/*",
+    "*://*.doubleclick.net/*",
+    "*://*.googlesyndication.com/*",
+    "*://connect.facebook.net/*",
+    "*://*.hotjar.com/*",
+    "*://*.segment.io/*",
+    "*://cdn.segment.com/*",
+    "*://*.mixpanel.com/*",
+    "*://*.newrelic.com/*",
+    "*://*.nr-data.net/*",
+]
+
+
+class ResourceBlocker:
+    """Blocks subresources the extractors never need via context route interception.
+
+    Requests are blocked by Playwright resource type, by URL glob pattern, or
+    because they go to a different site than the page. Top-level documents are
+    never blocked. Blocked/allowed counts are kept per page.
+    """
+
+    PRESETS: Dict[str, Dict[str, object]] = {
+        # Drops CSS too: elements hidden only by stylesheets count as visible
+        "text-only": {
+            "types": ["image", "media", "font", "stylesheet"],
+            "patterns": TRACKER_PATTERNS,
+            "third_party": True,
+        },
+        "no-media": {
+            "types": ["image", "media", "font"],
+            "patterns": TRACKER_PATTERNS,
+            "third_party": False,
+        },
+    }
+
+    def __init__(self, resource_types: Iterable[str] = (), url_patterns: Iterable[str] = (),
+                 third_party: bool = False) -> None:
+        self.resource_types = frozenset(t.lower() for t in resource_types)
+        self.url_patterns = list(url_patterns)
+        self._pattern_re: Optional[re.Pattern] = (
+            re.compile("|".join(translate(p) for p in self.url_patterns), re.I)
+            if self.url_patterns else None
+        )
+        self.third_party = third_party
+        self._page_stats: "weakref.WeakKeyDictionary[Page, Dict[str, int]]" = weakref.WeakKeyDictionary()
+        self.totals: Dict[str, int] = {"blocked": 0, "allowed": 0}
+
+    @classmethod
+    def from_config(cls, preset: Optional[str] = None, resource_types: Iterable[str] = (),
+                    url_patterns: Iterable[str] = (), third_party: bool = False
+                    ) -> Optional["ResourceBlocker"]:
+        """Merge a preset with explicit settings; None if nothing is blocked"""
+        types = list(resource_types)
+        patterns = list(url_patterns)
+        if preset:
+            if preset not in cls.PRESETS:
+                raise ValueError(f"Unknown block preset: {preset!r}")
+            spec = cls.PRESETS[preset]
+            types += spec["types"]
+            patterns += spec["patterns"]
+            third_party = third_party or bool(spec["third_party"])
+        if not (types or patterns or third_party):
+            return None
+        return cls(types, patterns, third_party)
+
+    async def install(self, context: BrowserContext) -> None:
+        """Route every request of ``context`` through the blocker"""
+        await context.route("**/*", self._handle_route)
+
+    def should_block(self, url: str, resource_type: str, page_url: str = "",
+                     is_main_document: bool = False) -> bool:
+        if is_main_document:
+            return False
+        if resource_type in self.resource_types:
+            return True
+        if self._pattern_re is not None and self._pattern_re.match(url):
+            return True
+        if self.third_party and page_url.startswith("http"):
+            return self.site(url) != self.site(page_url)
+        return False
+
+    @staticmethod
+    def site(url: str) -> str:
+        """Approximate registrable domain: the last two host labels"""
+        host = URLNormalizer.normalize_host(url).split(":", 1)[0]
+        return ".".join(host.split(".")[-2:])
+
+    def take_stats(self, page: Page) -> Dict[str, int]:
+        """Return and reset the blocked/allowed counts for ``page``"""
+        return self._page_stats.pop(page, None) or {"blocked": 0, "allowed": 0}
+
+    async def _handle_route(self, route: Route) -> None:
+        request = route.request
+        page = self._page_of(request)
+        is_main_document = request.is_navigation_request() and (
+            page is None or request.frame == page.main_frame
+        )
+        page_url = page.url if page is not None else ""
+        blocked = self.should_block(request.url, request.resource_type, page_url, is_main_document)
+
+        key = "blocked" if blocked else "allowed"
+        self.totals[key] += 1
+        if page is not None:
+            counts = self._page_stats.get(page)
+            if counts is None:
+                counts = self._page_stats[page] = {"blocked": 0, "allowed": 0}
+            counts[key] += 1
+
+        if blocked:
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    @staticmethod
+    def _page_of(request: Request) -> Optional[Page]:
+        try:
+            return request.frame.page
+        except Exception:
+            # Service worker requests have no frame
+            return None
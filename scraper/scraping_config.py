@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -8,12 +8,23 @@ class ScrapingConfig:
     depth: int = 0
     max_pages: int = 50
     delay_ms: int = 500
+    host_delay_ms: int = 0
+    per_host_concurrency: int = 0
     concurrency: int = 5
     concurrent_batch: int = 10
+    scheduler: str = "pool"
+    fetch_mode: str = "browser"
     headful: bool = False
+    page_pool_size: int = 0
+    pool_contexts: int = 1
+    context_max_pages: int = 0
+    context_max_memory_mb: int = 0
     goto_timeout_ms: int = 30000
     wait_timeout_ms: int = 15000
     post_click_wait_ms: int = 2000
+    wait_strategy: str = "networkidle"
+    quiet_ms: int = 300
+    max_wait_ms: int = 5000
     user_agent: Optional[str] = None
     vw: int = 1366
     vh: int = 900
@@ -22,10 +33,63 @@ class ScrapingConfig:
     scrolls: int = 0
     scroll_wait_ms: int = 1000
     scroll_until_end: bool = False
+    scroll_harvest: bool = False
+    harvest_seen_limit: int = 20000
     eval_js: Optional[str] = None
     eval_js_file: Optional[str] = None
     include_tables: bool = False
+    combined_extraction: bool = True
+    block_preset: Optional[str] = None
+    block_resource_types: List[str] = None
+    block_url_patterns: List[str] = None
+    block_third_party: bool = False
+    result_buffer: int = 100
+    state_file: Optional[str] = None
+    resume: bool = False
+    checkpoint_interval_ms: int = 1000
+    incremental_db: Optional[str] = None
+    seen_store: str = "set"
+    bloom_fp_rate: float = 0.001
+    frontier_memory_limit: int = 0
+    spill_dir: Optional[str] = None
+    frontier: str = "fifo"
+    priority_depth_weight: float = 1.0
+    priority_patterns: Dict[str, float] = None
+    priority_keywords: Dict[str, float] = None
+    path_budgets: Dict[str, int] = None
+    near_duplicates: bool = False
+    simhash_distance: int = 3
+    max_segment_repeats: int = 0
+    max_query_variants: int = 0
+    include_patterns: List[str] = None
+    exclude_patterns: List[str] = None
+    deny_extensions: Optional[List[str]] = None
+    deny_mime_types: List[str] = None
+    strip_query_params: List[str] = None
+    strip_tracking_params: bool = False
+    metrics: bool = False
+    result_timings: bool = False
+    metrics_interval_ms: int = 1000
+    record_dir: Optional[str] = None
 
     def __post_init__(self):
         if self.click_selectors is None:
             self.click_selectors = []
+        if self.block_resource_types is None:
+            self.block_resource_types = []
+        if self.block_url_patterns is None:
+            self.block_url_patterns = []
+        if self.include_patterns is None:
+            self.include_patterns = []
+        if self.exclude_patterns is None:
+            self.exclude_patterns = []
+        if self.deny_mime_types is None:
+            self.deny_mime_types = []
+        if self.strip_query_params is None:
+            self.strip_query_params = []
+        if self.priority_patterns is None:
+            self.priority_patterns = {}
+        if self.priority_keywords is None:
+            self.priority_keywords = {}
+        if self.path_budgets is None:
+            self.path_budgets = {}
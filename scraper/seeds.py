@@ -0,0 +1,68 @@
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .seen_store import SeenStore
+
+if TYPE_CHECKING:
+    from .web_scraper import Frontier
+
+
+@dataclass
+class Seed:
+    """One start URL of a multi-seed crawl; unset limits fall back to the config"""
+    url: str
+    depth: Optional[int] = None
+    max_pages: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Seed":
+        if not isinstance(data.get("url"), str):
+            raise ValueError("Seed must have a \"url\" string")
+        unknown = sorted(set(data) - {"url", "depth", "max_pages"})
+        if unknown:
+            raise ValueError(f"Unknown seed fields: {', '.join(unknown)}")
+        return cls(data["url"], data.get("depth"), data.get("max_pages"))
+
+
+def load_seeds(path: str) -> List[Seed]:
+    """Read seeds from a file with one per line.
+
+    A line is either a JSON object (``{"url": ..., "depth": 2, "max_pages":
+    100}``) or a bare URL. Blank lines and lines starting with ``#`` are
+    skipped.
+    """
+    seeds = []
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if not line.startswith("{"):
+                seeds.append(Seed(line))
+                continue
+            try:
+                seeds.append(Seed.from_dict(json.loads(line)))
+            except (json.JSONDecodeError, ValueError) as e:
+                raise ValueError(f"{path}:{lineno}: {e}")
+    return seeds
+
+
+class SeedCrawl:
+    """Per-seed state of a multi-seed crawl: scope, limits, frontier and seen set"""
+
+    def __init__(self, seed: Seed, url: str, host: str, depth: int, max_pages: int,
+                 queue: "Frontier", seen: SeenStore) -> None:
+        self.seed = seed
+        self.url = url
+        self.host = host
+        self.depth = depth
+        self.max_pages = max_pages
+        self.queue = queue
+        self.seen = seen
+        self.in_flight = 0
+
+    @property
+    def exhausted(self) -> bool:
+        """Nothing left to dispatch: budget used up or frontier empty"""
+        return len(self.seen) >= self.max_pages or not self.queue
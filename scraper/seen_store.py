@@ -0,0 +1,137 @@
+import math
+from array import array
+from hashlib import blake2b
+from typing import Iterable, Set, Union
+
+
+def url_fingerprint(url: str) -> int:
+    """64-bit fingerprint of a normalized URL (never 0)"""
+    fp = int.from_bytes(blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+    return fp or 1
+
+
+class FingerprintSet:
+    """Set of URLs stored as 64-bit fingerprints in an open-addressing table.
+
+    Costs about 8 bytes per slot (at most 70% full) instead of a full string
+    plus set entry per URL. Two distinct URLs collide with probability about
+    n / 2**64, negligible even at billions of URLs.
+    """
+
+    _MAX_LOAD = 0.7
+
+    def __init__(self, capacity: int = 1024) -> None:
+        size = 1 << max(4, math.ceil(math.log2(max(1, capacity) / self._MAX_LOAD)))
+        self._slots = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, url: str) -> bool:
+        fp = url_fingerprint(url)
+        slots, mask = self._slots, self._mask
+        i = fp & mask
+        while True:
+            value = slots[i]
+            if value == fp:
+                return True
+            if value == 0:
+                return False
+            i = (i + 1) & mask
+
+    def add(self, url: str) -> None:
+        if self._insert(url_fingerprint(url)):
+            self._count += 1
+            if self._count > self._MAX_LOAD * len(self._slots):
+                self._grow()
+
+    def update(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.add(url)
+
+    def _insert(self, fp: int) -> bool:
+        slots, mask = self._slots, self._mask
+        i = fp & mask
+        while True:
+            value = slots[i]
+            if value == fp:
+                return False
+            if value == 0:
+                slots[i] = fp
+                return True
+            i = (i + 1) & mask
+
+    def _grow(self) -> None:
+        old = self._slots
+        self._slots = array("Q", bytes(16 * len(old)))
+        self._mask = len(self._slots) - 1
+        for fp in old:
+            if fp:
+                self._insert(fp)
+
+
+class BloomFilter:
+    """Probabilistic URL set with a bounded false-positive rate.
+
+    Sized for ``capacity`` URLs at ``fp_rate``: about 1.2 bytes per URL at
+    0.1%. A false positive makes the crawler skip a URL it has not visited;
+    URLs are never visited twice. Past ``capacity`` the real false-positive
+    rate rises above ``fp_rate``.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float = 0.001) -> None:
+        capacity = max(1, capacity)
+        fp_rate = min(max(fp_rate, 1e-12), 0.5)
+        bits = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+        self._bits = bytearray((bits + 7) // 8)
+        self._nbits = len(self._bits) * 8
+        self._hashes = max(1, round(bits / capacity * math.log(2)))
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _positions(self, url: str):
+        digest = blake2b(url.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        nbits = self._nbits
+        for i in range(self._hashes):
+            yield (h1 + i * h2) % nbits
+
+    def __contains__(self, url: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(url))
+
+    def add(self, url: str) -> None:
+        bits = self._bits
+        new = False
+        for pos in self._positions(url):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self._count += 1
+
+    def update(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.add(url)
+
+
+SeenStore = Union[Set[str], FingerprintSet, BloomFilter]
+
+
+def make_seen_store(kind: str = "set", capacity: int = 1024, fp_rate: float = 0.001) -> SeenStore:
+    """Build the dedup store for visited URLs: ``set``, ``fingerprint`` or ``bloom``"""
+    if kind == "set":
+        return set()
+    if kind == "fingerprint":
+        return FingerprintSet(capacity)
+    if kind == "bloom":
+        return BloomFilter(capacity, fp_rate)
+    raise ValueError(f"Unknown seen store: {kind!r}")
@@ -0,0 +1,266 @@
+import asyncio
+import json
+import math
+import multiprocessing
+import queue as queue_module
+import traceback
+from hashlib import blake2b
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .frontier import SpillingFrontier
+from .politeness import PolitenessScheduler
+from .priority_frontier import PriorityFrontier, ScoreFn, URLScorer
+from .scraping_config import ScrapingConfig
+from .seen_store import make_seen_store
+from .url_normalizer import URLNormalizer
+from .url_policy import URLPolicy
+from .web_scraper import Frontier, WebScraper
+
+
+def shard_for(url: str, shards: int, by: str = "host") -> int:
+    """Shard index of ``url``: by host hash (default) or by full-URL hash"""
+    key = URLNormalizer.normalize_host(url) if by == "host" else url
+    return int.from_bytes(blake2b(key.encode("utf-8"), digest_size=8).digest(), "little") % shards
+
+
+class ShardScraper(WebScraper):
+    """WebScraper run inside a shard process.
+
+    It visits the URLs the coordinator sends over ``inbox`` and answers each
+    with ``("page", shard, line, links, depth)``: the result already
+    serialized as an NDJSON line (None if not emitted) and the in-scope links
+    worth queueing. Dedup and frontier ordering stay with the coordinator.
+    """
+
+    def __init__(self, shard: int, config: ScrapingConfig, seeds: List[str],
+                 politeness: Optional[PolitenessScheduler] = None) -> None:
+        super().__init__(config, politeness=politeness)
+        self.shard = shard
+        self.url_policy.set_seeds(seeds)
+
+    async def _emit(self, result: Dict[str, Any]) -> None:
+        # Results go back to the coordinator from serve()
+        pass
+
+    async def serve(self, inbox, outbox) -> None:
+        loop = asyncio.get_running_loop()
+        jobs: asyncio.Queue = asyncio.Queue()
+
+        async def read_inbox() -> None:
+            while True:
+                job = await loop.run_in_executor(None, inbox.get)
+                await jobs.put(job)
+                if job is None:
+                    return
+
+        async def worker(pool, semaphore) -> None:
+            while True:
+                job = await jobs.get()
+                if job is None:
+                    # Let the other workers see the stop signal too
+                    await jobs.put(None)
+                    return
+                url, depth = job
+                self.seen_urls.add(url)
+                result = await self._visit_url(url, depth, pool, semaphore)
+                line = None if result.get("unchanged") else json.dumps(result, ensure_ascii=False)
+                links = (
+                    [(link["href"], link["text"]) for link in self._frontier_links(result)]
+                    if depth < self.config.depth else []
+                )
+                outbox.put(("page", self.shard, line, links, depth))
+
+        reader = asyncio.create_task(read_inbox())
+        try:
+            async with self._crawl_stores(), self._session() as (pool, semaphore):
+                workers = max(1, self.config.concurrency)
+                await asyncio.gather(*(worker(pool, semaphore) for _ in range(workers)))
+        finally:
+            reader.cancel()
+        outbox.put(("stats", self.shard, self.stats()))
+
+
+def _shard_main(shard: int, config: ScrapingConfig, seeds: List[str], shard_by: str,
+                shards: int, inbox, outbox) -> None:
+    """Entry point of a shard process"""
+    politeness = None
+    if shard_by == "url":
+        # Every shard sees every host, so split each host's allowance between them
+        politeness = PolitenessScheduler(
+            min_interval_ms=config.host_delay_ms * shards,
+            per_host_concurrency=math.ceil(config.per_host_concurrency / shards),
+        )
+    try:
+        asyncio.run(ShardScraper(shard, config, seeds, politeness).serve(inbox, outbox))
+    except BaseException:
+        outbox.put(("error", shard, traceback.format_exc()))
+        raise
+
+
+class ShardedCrawler:
+    """Crawl with one browser and ``WebScraper`` event loop per worker process.
+
+    URLs are sharded by host hash (``shard_by="host"``), so each host is
+    paced by exactly one process. With ``shard_by="url"`` a single-host
+    crawl also spreads over all workers, and each worker paces a host at
+    ``1/workers`` of the configured rate. The coordinator in this process
+    owns the seen set, ``max_pages`` and one frontier per shard, and keeps
+    each shard supplied with ``2 * concurrency`` URLs in flight. Workers send
+    results back as ready-made NDJSON lines, which the coordinator streams
+    out without re-serializing.
+
+    Checkpointing (``state_file``), incremental crawls (``incremental_db``)
+    and recording (``record_dir``) are not supported; near-duplicate and trap
+    detection see one shard's pages each.
+    """
+
+    _POLL_S = 1.0
+
+    def __init__(self, config: ScrapingConfig, workers: int, shard_by: str = "host",
+                 scorer: Optional[ScoreFn] = None) -> None:
+        if config.state_file:
+            raise ValueError("Checkpointing (state_file) is not supported with multiple workers")
+        # Every shard process would open the same SQLite index or snapshot directory
+        if config.incremental_db or config.record_dir:
+            raise ValueError("incremental_db and record_dir are not supported with multiple workers")
+        if shard_by not in ("host", "url"):
+            raise ValueError(f"Unknown shard key: {shard_by!r}")
+        self.config = config
+        self.workers = max(1, workers)
+        self.shard_by = shard_by
+        self.scorer: ScoreFn = scorer or URLScorer.from_config(config)
+        self.url_policy = URLPolicy.from_config(config)
+        self.seen_urls = make_seen_store(
+            config.seen_store, capacity=max(config.max_pages, 1024), fp_rate=config.bloom_fp_rate
+        )
+        self.shard_stats: Dict[int, Dict[str, Any]] = {}
+
+    def scrape(self, start_url: str) -> List[Dict[str, Any]]:
+        return list(self.iter_scrape(start_url))
+
+    def iter_scrape(self, start_url: str) -> Iterator[Dict[str, Any]]:
+        for line in self.iter_lines(start_url):
+            yield json.loads(line)
+
+    def iter_lines(self, start_url: str) -> Iterator[str]:
+        """Yield each emitted result as a JSON line while the crawl runs"""
+        start_url = self.url_policy.normalize(start_url)
+        ctx = multiprocessing.get_context("spawn")
+        outbox = ctx.Queue()
+        inboxes = [ctx.Queue() for _ in range(self.workers)]
+        procs = [
+            ctx.Process(
+                target=_shard_main,
+                args=(i, self.config, [start_url], self.shard_by, self.workers, inboxes[i], outbox),
+                daemon=True,
+            )
+            for i in range(self.workers)
+        ]
+        for proc in procs:
+            proc.start()
+        try:
+            yield from self._coordinate(start_url, inboxes, outbox, procs)
+            self._shutdown(inboxes, outbox, procs)
+        finally:
+            for proc in procs:
+                if proc.is_alive():
+                    proc.terminate()
+                proc.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Coordinator counters plus the shards' counters summed"""
+        merged: Dict[str, Any] = {}
+        for shard in self.shard_stats.values():
+            _merge_counts(merged, shard)
+        merged["pages_visited"] = len(self.seen_urls)
+        merged["workers"] = self.workers
+        return merged
+
+    # -- coordinator ---------------------------------------------------------
+
+    def _new_frontier(self) -> Frontier:
+        if self.config.frontier == "priority":
+            return PriorityFrontier(scorer=self.scorer, path_budgets=self.config.path_budgets)
+        return SpillingFrontier(
+            memory_limit=self.config.frontier_memory_limit, spill_dir=self.config.spill_dir
+        )
+
+    def _coordinate(self, start_url: str, inboxes, outbox, procs) -> Iterator[str]:
+        frontiers = [self._new_frontier() for _ in range(self.workers)]
+        in_flight = [0] * self.workers
+        cap = 2 * max(1, self.config.concurrency)
+        max_pages = self.config.max_pages
+        bounded = self.config.frontier != "priority"
+        frontiers[self._shard(start_url)].append((start_url, 0))
+        try:
+            while True:
+                for shard, frontier in enumerate(frontiers):
+                    while frontier and in_flight[shard] < cap and len(self.seen_urls) < max_pages:
+                        url, depth = frontier.popleft()
+                        if url in self.seen_urls:
+                            continue
+                        self.seen_urls.add(url)
+                        inboxes[shard].put((url, depth))
+                        in_flight[shard] += 1
+                if not any(in_flight):
+                    return
+
+                kind, shard, *payload = self._receive(outbox, procs)
+                if kind != "page":
+                    continue
+                line, links, depth = payload
+                in_flight[shard] -= 1
+                if line is not None:
+                    yield line
+                if bounded:
+                    # Same cap as WebScraper._expand_frontier for FIFO frontiers
+                    budget = max_pages - len(self.seen_urls) - sum(len(f) for f in frontiers)
+                else:
+                    budget = float("inf")
+                for href, text in links:
+                    if budget <= 0:
+                        break
+                    if href in self.seen_urls:
+                        continue
+                    frontier = frontiers[self._shard(href)]
+                    size = len(frontier)
+                    frontier.append((href, depth + 1), text)
+                    budget -= len(frontier) - size
+        finally:
+            for frontier in frontiers:
+                frontier.close()
+
+    def _shard(self, url: str) -> int:
+        return shard_for(url, self.workers, self.shard_by)
+
+    def _receive(self, outbox, procs) -> Tuple:
+        """Next message from the shards; raises if a shard failed or died"""
+        while True:
+            try:
+                message = outbox.get(timeout=self._POLL_S)
+            except queue_module.Empty:
+                dead = [i for i, proc in enumerate(procs) if not proc.is_alive()]
+                if dead:
+                    raise RuntimeError(f"Shard worker {dead[0]} exited unexpectedly")
+                continue
+            if message[0] == "error":
+                raise RuntimeError(f"Shard worker {message[1]} failed:\n{message[2]}")
+            if message[0] == "stats":
+                self.shard_stats[message[1]] = message[2]
+            return message
+
+    def _shutdown(self, inboxes, outbox, procs) -> None:
+        for inbox in inboxes:
+            inbox.put(None)
+        while len(self.shard_stats) < len(procs):
+            self._receive(outbox, procs)
+        for proc in procs:
+            proc.join()
+
+
+def _merge_counts(into: Dict[str, Any], counts: Dict[str, Any]) -> None:
+    for key, value in counts.items():
+        if isinstance(value, dict):
+            _merge_counts(into.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)):
+            into[key] = into.get(key, 0) + value
@@ -0,0 +1,272 @@
+import asyncio
+import gzip
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Union
+
+
+Record = Union[Dict[str, Any], str]
+
+
+class ResultSink:
+    """Destination for crawl results, fed as pages complete.
+
+    Results are handed to a dedicated thread in batches of ``batch_size``,
+    so compression and disk I/O never run on the event loop.
+    Only one batch is written at a time and :meth:`write` waits for it when
+    the next batch is full: a slow disk slows the crawl down instead of
+    buffering without bound. A record may be a result dict or an
+    already-serialized JSON line. Subclasses implement the ``_sync`` methods.
+    """
+
+    def __init__(self, batch_size: int = 256) -> None:
+        self.batch_size = max(1, batch_size)
+        self.records = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-sink")
+        self._batch: List[Record] = []
+        self._pending: Optional[asyncio.Future] = None
+
+    async def open(self) -> None:
+        await self._run(self._open_sync)
+
+    async def write(self, record: Record) -> None:
+        self._batch.append(record)
+        self.records += 1
+        if len(self._batch) >= self.batch_size:
+            await self._submit()
+
+    async def flush(self) -> None:
+        """Write everything buffered so far"""
+        await self._submit()
+        if self._pending is not None:
+            await self._pending
+            self._pending = None
+
+    async def close(self) -> None:
+        try:
+            await self.flush()
+            await self._run(self._close_sync)
+        finally:
+            self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "ResultSink":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _submit(self) -> None:
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        if self._pending is not None:
+            await self._pending
+        self._pending = asyncio.get_running_loop().run_in_executor(
+            self._executor, self._write_sync, batch
+        )
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # -- executor thread ---------------------------------------------------
+
+    def _open_sync(self) -> None:
+        pass
+
+    def _write_sync(self, batch: List[Record]) -> None:
+        raise NotImplementedError
+
+    def _close_sync(self) -> None:
+        pass
+
+
+def _zstd_opener() -> Callable[[BinaryIO], BinaryIO]:
+    """Factory for zstd streams from the standard library (3.14+) or ``zstandard``"""
+    try:
+        from compression import zstd
+        return lambda raw: zstd.ZstdFile(raw, mode="wb")
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd compression needs Python 3.14+ or the zstandard package")
+    return lambda raw: zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+
+
+class NDJSONSink(ResultSink):
+    """Buffered NDJSON file with optional compression and size-based rotation.
+
+    ``compression`` is ``"gzip"``, ``"zstd"`` or ``"none"``; by default it
+    follows the file suffix (``.gz``, ``.zst``). With ``rotate_bytes`` a new
+    file is started once the current one passes that many bytes on disk;
+    files are numbered before the extension (``results-00001.ndjson.gz``)
+    and listed in ``paths``. A path of ``-`` writes uncompressed to stdout.
+    """
+
+    def __init__(self, path: str, compression: Optional[str] = None, rotate_bytes: int = 0,
+                 batch_size: int = 256) -> None:
+        super().__init__(batch_size)
+        if compression is None:
+            compression = "gzip" if path.endswith(".gz") else "zstd" if path.endswith(".zst") else "none"
+        if compression not in ("gzip", "zstd", "none"):
+            raise ValueError(f"Unknown compression: {compression!r}")
+        if path == "-" and (compression != "none" or rotate_bytes):
+            raise ValueError("stdout output cannot be compressed or rotated")
+        self.path = path
+        self.compression = compression
+        self.rotate_bytes = max(0, rotate_bytes)
+        self.paths: List[str] = []
+        self._zstd = _zstd_opener() if compression == "zstd" else None
+        self._raw: Optional[BinaryIO] = None
+        self._out: Optional[BinaryIO] = None
+
+    def _part_path(self, part: int) -> str:
+        if not self.rotate_bytes:
+            return self.path
+        head, name = os.path.split(self.path)
+        stem, dot, ext = name.partition(".")
+        return os.path.join(head, f"{stem}-{part:05d}{dot}{ext}")
+
+    async def write(self, record: Record) -> None:
+        # Serializing one record here is cheap; a whole batch on the writer
+        # thread would hold the GIL long enough to stall the event loop
+        if not isinstance(record, str):
+            record = json.dumps(record, ensure_ascii=False)
+        await super().write(record)
+
+    # -- executor thread ---------------------------------------------------
+
+    def _open_sync(self) -> None:
+        if self.path == "-":
+            self._raw = self._out = sys.stdout.buffer
+            return
+        path = self._part_path(len(self.paths))
+        self._raw = open(path, "wb")
+        if self.compression == "gzip":
+            self._out = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+        elif self.compression == "zstd":
+            self._out = self._zstd(self._raw)
+        else:
+            self._out = self._raw
+        self.paths.append(path)
+
+    def _write_sync(self, batch: List[Record]) -> None:
+        if self.rotate_bytes and self._raw.tell() >= self.rotate_bytes:
+            self._close_sync()
+            self._open_sync()
+        batch.append("")
+        self._out.write("\n".join(batch).encode("utf-8"))
+        if self.path == "-":
+            self._out.flush()
+        elif self.rotate_bytes and self._out is not self._raw:
+            # Compressors hold output back; push it to the file so tell() sees it
+            self._out.flush()
+
+    def _close_sync(self) -> None:
+        if self._out is None:
+            return
+        if self.path == "-":
+            self._out.flush()
+        else:
+            if self._out is not self._raw:
+                self._out.close()
+            self._raw.close()
+        self._raw = self._out = None
+
+
+def flatten_tables(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One record per body row of each table in ``result``.
+
+    Records carry the page ``url``, the ``table`` and ``row`` index, the
+    column ``headers`` (multi-row headers joined with `` / ``) and the row's
+    ``cells``.
+    """
+    records = []
+    for t, table in enumerate(result.get("tables") or []):
+        header_rows = table.get("headers") or []
+        width = max((len(row) for row in header_rows), default=0)
+        headers = [
+            " / ".join(row[i] for row in header_rows if i < len(row) and row[i])
+            for i in range(width)
+        ]
+        for r, cells in enumerate(table.get("rows") or []):
+            records.append({
+                "url": result.get("url", ""),
+                "table": t,
+                "row": r,
+                "headers": headers,
+                "cells": list(cells),
+            })
+    return records
+
+
+class TableSink(ResultSink):
+    """Columnar export of extracted tables to Parquet or Arrow IPC (needs ``pyarrow``).
+
+    Each table body row becomes one record (see :func:`flatten_tables`);
+    pages without tables add nothing. Rows are written in groups of
+    ``row_group_size``. The format follows the suffix (``.parquet``, else
+    Arrow IPC) unless ``format`` is ``"parquet"`` or ``"arrow"``.
+    """
+
+    def __init__(self, path: str, format: Optional[str] = None, row_group_size: int = 65536,
+                 batch_size: int = 256) -> None:
+        super().__init__(batch_size)
+        if format is None:
+            format = "parquet" if path.endswith(".parquet") else "arrow"
+        if format not in ("parquet", "arrow"):
+            raise ValueError(f"Unknown table format: {format!r}")
+        try:
+            import pyarrow
+        except ImportError:
+            raise RuntimeError("Table export needs the pyarrow package")
+        self._pa = pyarrow
+        self.path = path
+        self.format = format
+        self.row_group_size = max(1, row_group_size)
+        self.rows = 0
+        self._schema = pyarrow.schema([
+            ("url", pyarrow.string()),
+            ("table", pyarrow.int32()),
+            ("row", pyarrow.int32()),
+            ("headers", pyarrow.list_(pyarrow.string())),
+            ("cells", pyarrow.list_(pyarrow.string())),
+        ])
+        self._writer = None
+        self._rows: List[Dict[str, Any]] = []
+
+    # -- executor thread ---------------------------------------------------
+
+    def _open_sync(self) -> None:
+        if self.format == "parquet":
+            import pyarrow.parquet
+            self._writer = pyarrow.parquet.ParquetWriter(self.path, self._schema)
+        else:
+            import pyarrow.ipc
+            self._writer = pyarrow.ipc.new_file(self.path, self._schema)
+
+    def _write_sync(self, batch: List[Record]) -> None:
+        for record in batch:
+            if isinstance(record, str):
+                record = json.loads(record)
+            self._rows.extend(flatten_tables(record))
+        if len(self._rows) >= self.row_group_size:
+            self._write_rows()
+
+    def _write_rows(self) -> None:
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+        self.rows += len(rows)
+
+    def _close_sync(self) -> None:
+        if self._writer is None:
+            return
+        self._write_rows()
+        self._writer.close()
+        self._writer = None
@@ -0,0 +1,243 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from playwright.async_api import Page, Response
+
+
+@dataclass
+class RecordedResponse:
+    """One network response of a recorded page"""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    resource_type: str = ""
+
+
+@dataclass
+class PageSnapshot:
+    """A visited page as recorded: its final DOM and the responses that built it"""
+    url: str
+    depth: int
+    fetch: str
+    status: int
+    headers: Dict[str, str]
+    dom: str
+    final_url: str = ""
+    responses: List[RecordedResponse] = field(default_factory=list)
+
+
+@dataclass
+class _ArmedPage:
+    """Responses collected for a page between :meth:`SnapshotStore.arm` and ``disarm``"""
+    responses: List[Response]
+    listener: Callable[[Response], None]
+
+
+class SnapshotStore:
+    """Content-addressed store of page snapshots for offline re-extraction.
+
+    Bodies (DOMs and responses) are zlib-compressed blobs under ``blobs/``
+    named by their SHA-256, so assets shared by many pages are stored once.
+    A SQLite index maps each URL to its latest snapshot. Recorded snapshots
+    are buffered and written in batches on a dedicated thread, like
+    :class:`CrawlStateStore`.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS pages ("
+        " url TEXT PRIMARY KEY, depth INTEGER NOT NULL, fetch TEXT NOT NULL,"
+        " status INTEGER NOT NULL, headers TEXT NOT NULL, dom TEXT NOT NULL,"
+        " final_url TEXT NOT NULL, responses TEXT NOT NULL, recorded_at REAL NOT NULL)",
+    )
+
+    def __init__(self, root: str, flush_interval_ms: int = 1000) -> None:
+        self.root = root
+        self.flush_interval = max(10, flush_interval_ms) / 1000
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot-store")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: List[PageSnapshot] = []
+        self._flusher: Optional[asyncio.Task] = None
+        # Strong references: the collected responses point back at their page,
+        # so weak keys would not expire anyway. Callers disarm in a ``finally``.
+        self._armed: Dict[Page, _ArmedPage] = {}
+        self.stats: Dict[str, int] = {"pages": 0, "blobs_written": 0, "blobs_reused": 0}
+
+    async def open(self) -> None:
+        await self._run(self._open_sync)
+        self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+        await self.flush()
+        await self._run(self._close_sync)
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "SnapshotStore":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def add(self, snapshot: PageSnapshot) -> None:
+        """Queue a snapshot for the next batched write"""
+        self._pending.append(snapshot)
+        self.stats["pages"] += 1
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        await self._run(self._write_sync, pending)
+
+    async def urls(self) -> List[str]:
+        """Recorded URLs in recording order"""
+        return await self._run(self._urls_sync)
+
+    async def load(self, url: str) -> Optional[PageSnapshot]:
+        return await self._run(self._load_sync, url)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # -- recording browser pages -------------------------------------------
+
+    def arm(self, page: Page) -> None:
+        """Start collecting ``page``'s responses for the next :meth:`capture`"""
+        responses: List[Response] = []
+        armed = self._armed[page] = _ArmedPage(responses, responses.append)
+        page.on("response", armed.listener)
+
+    def disarm(self, page: Page) -> None:
+        """Stop collecting ``page``'s responses and drop those collected"""
+        armed = self._armed.pop(page, None)
+        if armed is not None:
+            # The page may already be closed or crashed
+            with contextlib.suppress(Exception):
+                page.remove_listener("response", armed.listener)
+
+    async def capture(self, page: Page, url: str, depth: int,
+                      response: Optional[Response]) -> None:
+        """Record ``page``'s current DOM and the bodies of its collected responses"""
+        armed = self._armed.get(page)
+        recorded = []
+        for resp in (armed.responses if armed is not None else []):
+            if 300 <= resp.status < 400:
+                # Redirects have no body; the target is recorded on its own
+                continue
+            try:
+                body = await resp.body()
+            except Exception:
+                continue
+            recorded.append(RecordedResponse(
+                resp.url, resp.status, await resp.all_headers(), body,
+                resp.request.resource_type,
+            ))
+        self.add(PageSnapshot(
+            url=url,
+            depth=depth,
+            fetch="browser",
+            status=response.status if response is not None else 200,
+            headers=response.headers if response is not None else {},
+            dom=await page.content(),
+            final_url=page.url,
+            responses=recorded,
+        ))
+
+    # -- executor thread ---------------------------------------------------
+
+    def _open_sync(self) -> None:
+        os.makedirs(os.path.join(self.root, "blobs"), exist_ok=True)
+        conn = sqlite3.connect(os.path.join(self.root, "index.sqlite"), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+        self._conn = conn
+
+    def _close_sync(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], digest[2:] + ".z")
+
+    def _put_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            self.stats["blobs_reused"] += 1
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so concurrent recorders never see a partial blob
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(zlib.compress(data, 6))
+        os.replace(tmp, path)
+        self.stats["blobs_written"] += 1
+        return digest
+
+    def _get_blob(self, digest: str) -> bytes:
+        with open(self._blob_path(digest), "rb") as f:
+            return zlib.decompress(f.read())
+
+    def _write_sync(self, snapshots: List[PageSnapshot]) -> None:
+        rows = []
+        for snap in snapshots:
+            responses = [
+                [r.url, r.status, r.headers, self._put_blob(r.body), r.resource_type]
+                for r in snap.responses
+            ]
+            rows.append((
+                snap.url, snap.depth, snap.fetch, snap.status,
+                json.dumps(snap.headers), self._put_blob(snap.dom.encode("utf-8")),
+                snap.final_url or snap.url, json.dumps(responses), time.time(),
+            ))
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def _urls_sync(self) -> List[str]:
+        return [row[0] for row in self._conn.execute("SELECT url FROM pages ORDER BY recorded_at")]
+
+    def _load_sync(self, url: str) -> Optional[PageSnapshot]:
+        row = self._conn.execute(
+            "SELECT depth, fetch, status, headers, dom, final_url, responses FROM pages WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        depth, fetch, status, headers, dom, final_url, responses = row
+        return PageSnapshot(
+            url=url,
+            depth=depth,
+            fetch=fetch,
+            status=status,
+            headers=json.loads(headers),
+            dom=self._get_blob(dom).decode("utf-8"),
+            final_url=final_url,
+            responses=[
+                RecordedResponse(r_url, r_status, r_headers, self._get_blob(digest), r_type)
+                for r_url, r_status, r_headers, digest, r_type in json.loads(responses)
+            ],
+        )
@@ -0,0 +1,373 @@
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Set, Tuple
+from playwright.async_api import APIRequestContext, Playwright
+from .scraping_config import ScrapingConfig
+from .url_normalizer import URLNormalizer
+from .url_policy import URLPolicy
+
+
+_TEXT_TAGS = frozenset(["main", "article", "section", "h1", "h2", "h3", "h4", "h5", "h6", "p"])
+_SKIP_TAGS = frozenset(["head", "script", "style", "noscript", "template", "svg", "iframe"])
+_VOID_TAGS = frozenset([
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "source", "track", "wbr",
+])
+_BLOCK_TAGS = frozenset([
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table", "tr", "ul",
+])
+# Start tags that implicitly close an open element, as in the HTML parsing spec
+_IMPLIED_END: Dict[str, frozenset] = {
+    "p": _BLOCK_TAGS - {"li", "tr", "dd", "dt"},
+    "li": frozenset(["li"]),
+    "dt": frozenset(["dt", "dd"]),
+    "dd": frozenset(["dt", "dd"]),
+    "td": frozenset(["td", "th", "tr", "tbody", "thead", "tfoot"]),
+    "th": frozenset(["td", "th", "tr", "tbody", "thead", "tfoot"]),
+    "tr": frozenset(["tr", "tbody", "thead", "tfoot"]),
+    "thead": frozenset(["tbody", "tfoot"]),
+    "tbody": frozenset(["tbody", "tfoot"]),
+}
+_SPA_ROOT_IDS = frozenset(["root", "app", "__next", "__nuxt", "___gatsby", "svelte"])
+_HIDDEN_STYLE = re.compile(r"(display\s*:\s*none|visibility\s*:\s*hidden)", re.I)
+_WS = re.compile(r"\s+")
+
+
+class _Element:
+    __slots__ = ("tag", "hidden", "text", "link", "cell", "table", "section", "spa_root")
+
+    def __init__(self, tag: str, hidden: bool) -> None:
+        self.tag = tag
+        self.hidden = hidden
+        self.text: Optional[List[str]] = None
+        self.link: Optional[Dict[str, Any]] = None
+        self.cell: Optional[List[str]] = None
+        self.table: Optional[Dict[str, Any]] = None
+        self.section: Optional[str] = None
+        self.spa_root: Optional[List[int]] = None
+
+
+class StaticPageParser(HTMLParser):
+    """Extracts text, links and tables from raw HTML.
+
+    Mirrors the bundled ``extract_*.js`` scripts as far as possible without a
+    layout engine: visibility is approximated from ``hidden`` attributes,
+    inline ``display:none``/``visibility:hidden`` styles and non-rendered tags.
+    """
+
+    def __init__(self, include_tables: bool = False) -> None:
+        super().__init__(convert_charrefs=True)
+        self.include_tables = include_tables
+        self.base_href: Optional[str] = None
+        self.empty_spa_root = False
+        self._stack: List[_Element] = []
+        self._hidden_depth = 0
+        self._text_items: List[List[str]] = []
+        self._open_text: List[List[str]] = []
+        self._links: List[Dict[str, Any]] = []
+        self._open_links: List[Dict[str, Any]] = []
+        self._open_cells: List[List[str]] = []
+        self._tables: List[Dict[str, Any]] = []
+        self._open_tables: List[Dict[str, Any]] = []
+        self._spa_roots: List[List[int]] = []
+        self._rows: List[Tuple[Dict[str, Any], str, List[str]]] = []
+
+    # -- results -----------------------------------------------------------
+
+    def text(self) -> str:
+        out: List[str] = []
+        seen: Set[str] = set()
+        for buf in self._text_items:
+            line = "\n".join(
+                s for s in (_WS.sub(" ", part).strip() for part in "".join(buf).split("\n")) if s
+            )
+            if not line:
+                continue
+            norm = _WS.sub(" ", line)[:200]
+            if norm not in seen:
+                seen.add(norm)
+                out.append(line)
+        return "\n".join(out)
+
+    def links(self) -> List[Dict[str, str]]:
+        return [
+            {"text": _WS.sub(" ", "".join(link["text"])).strip(), "href": link["href"]}
+            for link in self._links
+        ]
+
+    def tables(self) -> List[Dict[str, List[List[str]]]]:
+        return [t for t in (
+            {"headers": t["headers"], "rows": t["rows"]} for t in self._tables
+        ) if t["headers"] or t["rows"]]
+
+    # -- parser callbacks --------------------------------------------------
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._close_implied(tag)
+        attr = dict(attrs)
+
+        if tag == "base" and self.base_href is None and attr.get("href"):
+            self.base_href = attr["href"]
+
+        hidden = (
+            tag in _SKIP_TAGS
+            or "hidden" in attr
+            or bool(_HIDDEN_STYLE.search(attr.get("style") or ""))
+            or (tag == "input" and (attr.get("type") or "").lower() == "hidden")
+        )
+        if tag in _BLOCK_TAGS or tag == "br":
+            self._append_text("\n")
+        elif tag in ("td", "th"):
+            self._append_text(" ")
+        if tag in _VOID_TAGS:
+            return
+
+        el = _Element(tag, hidden)
+        self._stack.append(el)
+        if hidden:
+            self._hidden_depth += 1
+        visible = self._hidden_depth == 0
+
+        if attr.get("id") in _SPA_ROOT_IDS or "ng-app" in attr or "data-reactroot" in attr:
+            el.spa_root = [0]
+            self._spa_roots.append(el.spa_root)
+
+        if not visible:
+            return
+        if tag in _TEXT_TAGS:
+            el.text = []
+            self._text_items.append(el.text)
+            self._open_text.append(el.text)
+        if tag == "a" and attr.get("href") is not None:
+            el.link = {"text": [], "href": attr["href"]}
+            self._links.append(el.link)
+            self._open_links.append(el.link)
+        if self.include_tables:
+            self._start_table_element(el)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if not any(el.tag == tag for el in self._stack):
+            return
+        while self._stack:
+            el = self._stack.pop()
+            self._close(el)
+            if el.tag == tag:
+                break
+        if tag in _BLOCK_TAGS:
+            self._append_text("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._hidden_depth:
+            return
+        if self._spa_roots and data.strip():
+            for counter in self._spa_roots:
+                counter[0] += 1
+        # Source whitespace collapses; line breaks come from block elements
+        self._append_text(_WS.sub(" ", data))
+
+    def close(self) -> None:
+        super().close()
+        while self._stack:
+            self._close(self._stack.pop())
+
+    # -- helpers -----------------------------------------------------------
+
+    def _append_text(self, data: str) -> None:
+        if self._hidden_depth:
+            return
+        for buf in self._open_text:
+            buf.append(data)
+        for link in self._open_links:
+            link["text"].append(data)
+        for cell in self._open_cells:
+            cell.append(data)
+
+    def _close_implied(self, tag: str) -> None:
+        while self._stack:
+            top = self._stack[-1].tag
+            closers = _IMPLIED_END.get(top)
+            if closers is None or tag not in closers:
+                return
+            self._close(self._stack.pop())
+
+    def _close(self, el: _Element) -> None:
+        if el.hidden:
+            self._hidden_depth -= 1
+        if el.text is not None:
+            self._open_text.remove(el.text)
+        if el.link is not None:
+            self._open_links.remove(el.link)
+        if el.cell is not None:
+            self._open_cells.remove(el.cell)
+            if self._rows:
+                self._rows[-1][2].append(_WS.sub(" ", "".join(el.cell)).strip())
+        if el.tag == "tr" and self._rows:
+            table, section, cells = self._rows.pop()
+            if any(cells) and section != "tfoot":
+                (table["headers"] if section == "thead" else table["rows"]).append(cells)
+        if el.tag in ("thead", "tfoot") and self._open_tables:
+            self._open_tables[-1]["section"] = "tbody"
+        if el.table is not None:
+            self._open_tables.remove(el.table)
+        if el.spa_root is not None:
+            self._spa_roots.remove(el.spa_root)
+            if el.spa_root[0] == 0:
+                self.empty_spa_root = True
+
+    def _start_table_element(self, el: _Element) -> None:
+        tag = el.tag
+        if tag == "table":
+            el.table = {"headers": [], "rows": [], "section": "tbody"}
+            self._tables.append(el.table)
+            self._open_tables.append(el.table)
+        elif not self._open_tables:
+            return
+        elif tag in ("thead", "tbody", "tfoot"):
+            self._open_tables[-1]["section"] = tag
+        elif tag == "tr":
+            table = self._open_tables[-1]
+            self._rows.append((table, table["section"], []))
+        elif tag in ("td", "th") and self._rows:
+            el.cell = []
+            self._open_cells.append(el.cell)
+
+
+@dataclass
+class StaticPage:
+    """Content extracted by the HTTP path plus the response's cache validators"""
+    text: str = ""
+    links: List[Dict[str, str]] = field(default_factory=list)
+    tables: Optional[List[Dict[str, List[List[str]]]]] = None
+    status: int = 200
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Response body and final URL, kept for snapshot recording
+    html: str = ""
+    url: str = ""
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+class StaticFetcher:
+    """HTTP-first fetch path that skips the browser for server-rendered pages.
+
+    Pages are fetched with Playwright's pooled ``APIRequestContext`` and parsed
+    with :class:`StaticPageParser`. ``fetch`` returns ``None`` when a page
+    needs JavaScript (non-HTML response, empty body, empty SPA root), in which
+    case the caller renders it in the browser. A host whose last
+    ``_LEARN_AFTER`` HTML pages all needed rendering goes straight to the
+    browser afterwards; a single stub or error page does not move a site off
+    the HTTP path.
+    """
+
+    _HTML_TYPES = ("text/html", "application/xhtml+xml")
+    # Consecutive HTML pages of a host that must need rendering before the
+    # host is always rendered
+    _LEARN_AFTER = 3
+
+    def __init__(self, config: ScrapingConfig, url_policy: Optional[URLPolicy] = None) -> None:
+        self.config = config
+        self.url_policy = url_policy or URLPolicy.from_config(config)
+        self.js_hosts: Set[str] = set()
+        self._escalations: Dict[str, int] = {}
+        self._request: Optional[APIRequestContext] = None
+        self.stats: Dict[str, int] = {"static": 0, "escalated": 0}
+
+    @staticmethod
+    def config_needs_browser(config: ScrapingConfig) -> bool:
+        """True if page automation is configured, which only a browser can run"""
+        return bool(
+            config.wait_selector or config.click_selectors or config.scrolls
+            or config.scroll_until_end or config.scroll_harvest
+            or config.eval_js or config.eval_js_file
+        )
+
+    async def start(self, playwright: Playwright) -> None:
+        self._request = await playwright.request.new_context(
+            user_agent=self.config.user_agent or "Mozilla/5.0 (compatible; PlaywrightScraper/2.0)",
+        )
+
+    async def close(self) -> None:
+        if self._request is not None:
+            await self._request.dispose()
+            self._request = None
+
+    def should_try(self, url: str) -> bool:
+        return (
+            self._request is not None
+            and not self.config_needs_browser(self.config)
+            and URLNormalizer.normalize_host(url) not in self.js_hosts
+        )
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[StaticPage]:
+        """Fetch and extract ``url``; None means render it in the browser.
+
+        ``headers`` are sent with the request, e.g. conditional-request
+        validators; a ``304 Not Modified`` comes back as an empty page.
+        """
+        assert self._request is not None, "StaticFetcher.start() was not called"
+        response = await self._request.get(
+            url, headers=headers or None, timeout=self.config.goto_timeout_ms,
+            fail_on_status_code=False,
+        )
+        try:
+            if response.status == 304:
+                self.stats["static"] += 1
+                return StaticPage(status=304, headers=response.headers)
+            content_type = response.headers.get("content-type", "").lower()
+            if not self.url_policy.allows_mime(content_type):
+                # Denied outright; rendering it in the browser would not help
+                self.stats["static"] += 1
+                return StaticPage(status=response.status, headers=response.headers)
+            if not content_type.startswith(self._HTML_TYPES):
+                self._escalate(url, learn=False)
+                return None
+            html = await response.text()
+            final_url = response.url
+            status, response_headers = response.status, response.headers
+        finally:
+            await response.dispose()
+
+        page, needs_browser = self.parse(html, final_url)
+        if needs_browser:
+            self._escalate(url, learn=True)
+            return None
+        self._escalations.pop(URLNormalizer.normalize_host(url), None)
+        page.status, page.headers = status, response_headers
+        self.stats["static"] += 1
+        return page
+
+    def parse(self, html: str, url: str) -> Tuple[StaticPage, bool]:
+        """Extract ``html`` served from ``url``; the flag is True if it needs JavaScript"""
+        parser = StaticPageParser(include_tables=self.config.include_tables)
+        parser.feed(html)
+        parser.close()
+
+        text = parser.text()
+        raw_links = parser.links()
+        base_url = URLNormalizer.absolutize(url, parser.base_href) if parser.base_href else url
+        links = self.url_policy.clean_links(raw_links, base_url)
+        tables = parser.tables() if self.config.include_tables else None
+        page = StaticPage(text, links, tables, html=html, url=url)
+        return page, parser.empty_spa_root or not (text or raw_links)
+
+    def _escalate(self, url: str, learn: bool) -> None:
+        self.stats["escalated"] += 1
+        if not learn:
+            return
+        host = URLNormalizer.normalize_host(url)
+        count = self._escalations.get(host, 0) + 1
+        if count >= self._LEARN_AFTER:
+            self._escalations.pop(host, None)
+            self.js_hosts.add(host)
+        else:
+            self._escalations[host] = count
@@ -0,0 +1,68 @@
+import urllib.parse
+from collections import Counter
+from typing import Dict, Optional, Set
+from .seen_store import url_fingerprint
+
+
+class TrapDetector:
+    """URL heuristics that prune crawler traps before a page is visited.
+
+    - Repeating path segments: a segment that occurs more than
+      ``max_segment_repeats`` times (``/a/b/a/b/a/b``), typical of relative
+      links resolving against an ever-deeper path.
+    - Exploding query combinations: at most ``max_query_variants`` distinct
+      query strings are accepted per host and path; faceted filters,
+      calendars and sort orders beyond that are dropped.
+
+    Each heuristic is off when its limit is 0. ``stats`` counts each rejected
+    URL once, however many pages link to it.
+    """
+
+    def __init__(self, max_segment_repeats: int = 0, max_query_variants: int = 0) -> None:
+        self.max_segment_repeats = max_segment_repeats
+        self.max_query_variants = max_query_variants
+        self._variants: Dict[str, Set[str]] = {}
+        self._rejected: Set[int] = set()
+        self.stats: Dict[str, int] = {"repeating_path": 0, "query_explosion": 0}
+
+    @classmethod
+    def from_config(cls, config) -> Optional["TrapDetector"]:
+        """None if both heuristics are off"""
+        if not (config.max_segment_repeats or config.max_query_variants):
+            return None
+        return cls(config.max_segment_repeats, config.max_query_variants)
+
+    def is_trap(self, url: str) -> bool:
+        parts = urllib.parse.urlsplit(url)
+        if self.max_segment_repeats and self._repeats_segments(parts.path):
+            self._count("repeating_path", url)
+            return True
+        if self.max_query_variants and parts.query and self._explodes(parts):
+            self._count("query_explosion", url)
+            return True
+        return False
+
+    def _count(self, heuristic: str, url: str) -> None:
+        # A rejected URL stays rejected, so only its first rejection counts
+        fp = url_fingerprint(url)
+        if fp not in self._rejected:
+            self._rejected.add(fp)
+            self.stats[heuristic] += 1
+
+    def _repeats_segments(self, path: str) -> bool:
+        segments = [s for s in path.split("/") if s]
+        if len(segments) <= self.max_segment_repeats:
+            return False
+        _, count = Counter(segments).most_common(1)[0]
+        return count > self.max_segment_repeats
+
+    def _explodes(self, parts: urllib.parse.SplitResult) -> bool:
+        seen = self._variants.setdefault(f"{parts.netloc}{parts.path}", set())
+        # Parameter order does not make a new combination
+        query = "&".join(sorted(parts.query.split("&")))
+        if query in seen:
+            return False
+        if len(seen) >= self.max_query_variants:
+            return True
+        seen.add(query)
+        return False
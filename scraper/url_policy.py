@@ -0,0 +1,194 @@
+import fnmatch
+import functools
+import re
+import urllib.parse
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .url_normalizer import URLNormalizer
+
+
+# Links to these are never worth rendering
+DEFAULT_DENY_EXTENSIONS = (
+    "pdf", "zip", "gz", "tar", "rar", "7z", "exe", "dmg", "iso",
+    "jpg", "jpeg", "png", "gif", "webp", "svg", "ico", "bmp",
+    "mp4", "mov", "avi", "webm", "mkv", "mp3", "wav", "ogg",
+    "woff", "woff2", "ttf", "css", "js",
+)
+
+# Query parameters that only track the visitor or carry a session
+TRACKING_PARAMS = (
+    "utm_*", "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "_ga", "_hsenc",
+    "_hsmi", "yclid", "sessionid", "session_id", "sid", "phpsessid", "jsessionid",
+    "aspsessionid*", "cfid", "cftoken",
+)
+
+_SKIP_SCHEMES = ("#", "javascript:", "mailto:", "tel:")
+
+
+def compile_patterns(patterns: Sequence[str]) -> Optional[re.Pattern]:
+    """Compile globs and ``re:``-prefixed regexes into one alternation"""
+    parts = []
+    for pattern in patterns:
+        if pattern.startswith("re:"):
+            parts.append(f"(?:{pattern[3:]})")
+        else:
+            parts.append(f"(?:{fnmatch.translate(pattern)})")
+    return re.compile("|".join(parts)) if parts else None
+
+
+class URLPolicy:
+    """Normalization and scope rules for the links of one crawl, compiled once.
+
+    Normalizing and classifying a URL goes through an LRU cache, so the
+    navigation links repeated on every page of a site are parsed once.
+    A URL is in scope when its host matches a seed host (if seeds are set),
+    its path extension is not denied, it matches an include pattern (if any)
+    and no exclude pattern. Patterns are globs over the normalized URL, or
+    regexes when prefixed with ``re:``.
+    """
+
+    def __init__(self, seeds: Iterable[str] = (),
+                 include_patterns: Sequence[str] = (),
+                 exclude_patterns: Sequence[str] = (),
+                 deny_extensions: Sequence[str] = DEFAULT_DENY_EXTENSIONS,
+                 deny_mime_types: Sequence[str] = (),
+                 strip_params: Sequence[str] = (),
+                 cache_size: int = 1 << 17) -> None:
+        self._include = compile_patterns(include_patterns)
+        self._exclude = compile_patterns(exclude_patterns)
+        self._deny_extensions = frozenset(ext.lower().lstrip(".") for ext in deny_extensions)
+        self._deny_mime_types = tuple(mime.lower() for mime in deny_mime_types)
+        strip = compile_patterns([p.lower() for p in strip_params])
+        self._strip_param = strip.match if strip is not None else None
+        self.seed_hosts: frozenset = frozenset()
+        self._analyze = functools.lru_cache(maxsize=cache_size)(self._analyze_uncached)
+        self._join = functools.lru_cache(maxsize=cache_size)(urllib.parse.urljoin)
+        self._host = functools.lru_cache(maxsize=cache_size)(URLNormalizer.normalize_host)
+        self.set_seeds(seeds)
+
+    @classmethod
+    def from_config(cls, config, seeds: Iterable[str] = ()) -> "URLPolicy":
+        strip = list(config.strip_query_params)
+        if config.strip_tracking_params:
+            strip.extend(TRACKING_PARAMS)
+        return cls(
+            seeds=seeds,
+            include_patterns=config.include_patterns,
+            exclude_patterns=config.exclude_patterns,
+            deny_extensions=(
+                DEFAULT_DENY_EXTENSIONS if config.deny_extensions is None else config.deny_extensions
+            ),
+            deny_mime_types=config.deny_mime_types,
+            strip_params=strip,
+        )
+
+    def set_seeds(self, seeds: Iterable[str]) -> None:
+        """Restrict the crawl to the hosts of ``seeds`` (no restriction when empty)"""
+        self.seed_hosts = frozenset(URLNormalizer.normalize_host(self.normalize(s)) for s in seeds)
+        # Cached scope decisions depend on the seed hosts
+        self._analyze.cache_clear()
+
+    def normalize(self, url: str) -> str:
+        return self._analyze(url)[0]
+
+    def host(self, url: str) -> str:
+        """Host of ``url`` as compared against the seed hosts"""
+        return self._host(url)
+
+    def allows(self, url: str) -> bool:
+        """Whether ``url`` is in scope for the crawl"""
+        return self._analyze(url)[1]
+
+    def allows_mime(self, content_type: str) -> bool:
+        """Whether a response with this ``Content-Type`` should be extracted"""
+        if not self._deny_mime_types:
+            return True
+        return not content_type.lower().lstrip().startswith(self._deny_mime_types)
+
+    def filter_links(self, links: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Normalize a batch of links and keep the in-scope ones, in order"""
+        analyze = self._analyze
+        out = []
+        for link in links:
+            normalized, allowed = analyze(link["href"])
+            if allowed:
+                out.append({"href": normalized, "text": link.get("text", "")})
+        return out
+
+    def clean_links(self, links: Iterable[Dict[str, str]], base_url: str) -> List[Dict[str, str]]:
+        """Absolutize, normalize and de-dupe extracted links, keeping the first non-empty text"""
+        join, analyze = self._join, self._analyze
+        base = urllib.parse.urlsplit(base_url)
+        origin = f"{base.scheme}://{base.netloc}"
+        dedup: Dict[str, str] = {}
+        for link in links:
+            href = (link.get("href") or "").strip()
+            if not href or href.startswith(_SKIP_SCHEMES):
+                continue
+            if href.startswith("/") and not href.startswith("//") and "/." not in href:
+                href = origin + href
+            elif not href.startswith(("http://", "https://")):
+                href = join(base_url, href)
+            href_n = analyze(href)[0]
+            text = link.get("text", "")
+            if href_n not in dedup or (not dedup[href_n] and text):
+                dedup[href_n] = text
+        return [{"href": k, "text": v} for k, v in dedup.items()]
+
+    def cache_info(self) -> Dict[str, int]:
+        info = self._analyze.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+    def _analyze_uncached(self, url: str) -> Tuple[str, bool]:
+        try:
+            p = urllib.parse.urlparse(url)
+        except ValueError:
+            return url, False
+        scheme = p.scheme.lower()
+        if scheme not in ("http", "https"):
+            return URLNormalizer.normalize_url(url), False
+
+        # Same rules as URLNormalizer.normalize_url, from a single parse
+        host = p.netloc.lower()
+        if scheme == "http" and host.endswith(":80"):
+            host = host[:-3]
+        elif scheme == "https" and host.endswith(":443"):
+            host = host[:-4]
+        if host.startswith("www."):
+            host = host[4:]
+        host = host.rstrip(".")
+        path = p.path
+        path = "" if path == "/" else path.rstrip("/")
+        if path and host and not path.startswith("/"):
+            path = "/" + path
+        query = p.query
+        if query and self._strip_param is not None:
+            query = self._strip_query(query)
+        normalized = f"{scheme}://{host}{path}?{query}" if query else f"{scheme}://{host}{path}"
+        return normalized, self._in_scope(normalized, host, path)
+
+    def _strip_query(self, query: str) -> str:
+        strip = self._strip_param
+        return "&".join(
+            pair for pair in query.split("&")
+            if pair and not strip(urllib.parse.unquote_plus(pair.split("=", 1)[0]).lower())
+        )
+
+    def _in_scope(self, url: str, host: str, path: str) -> bool:
+        if self.seed_hosts:
+            # URLNormalizer.normalize_host also drops a mismatched default port
+            if host.endswith(":80"):
+                host = host[:-3]
+            elif host.endswith(":443"):
+                host = host[:-4]
+            if host not in self.seed_hosts:
+                return False
+        if self._deny_extensions:
+            name = path.rsplit("/", 1)[-1]
+            if "." in name and name.rsplit(".", 1)[1].lower() in self._deny_extensions:
+                return False
+        if self._include is not None and not self._include.match(url):
+            return False
+        if self._exclude is not None and self._exclude.match(url):
+            return False
+        return True
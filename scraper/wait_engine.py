@@ -0,0 +1,82 @@
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+from playwright.async_api import BrowserContext, Page
+from .js_manager import JsManager
+
+
+class WaitEngine:
+    """Waits for pages to settle and records each wait per page.
+
+    With the ``networkidle`` strategy waits use Playwright's network-idle
+    state. The ``adaptive`` strategy installs an init script that tracks DOM
+    mutations and in-flight fetch/XHR requests and returns as soon as the DOM
+    has been quiet for ``quiet_ms``. Requests open longer than
+    ``long_request_ms`` (long-polling, streams) do not hold the wait open.
+    Every wait is bounded and logged as ``{phase, waited_ms, reason}``.
+    """
+
+    def __init__(self, strategy: str = "networkidle", quiet_ms: int = 300, max_wait_ms: int = 5000,
+                 long_request_ms: int = 2000, js_manager: Optional[JsManager] = None) -> None:
+        if strategy not in ("networkidle", "adaptive"):
+            raise ValueError(f"Unknown wait strategy: {strategy!r}")
+        self.strategy = strategy
+        self.quiet_ms = quiet_ms
+        self.max_wait_ms = max_wait_ms
+        self.long_request_ms = long_request_ms
+        self.js_manager = js_manager or JsManager()
+        self._logs: "weakref.WeakKeyDictionary[Page, List[Dict[str, Any]]]" = weakref.WeakKeyDictionary()
+
+    @property
+    def adaptive(self) -> bool:
+        return self.strategy == "adaptive"
+
+    async def install(self, context: BrowserContext) -> None:
+        """Add the request/mutation tracking init script to ``context``"""
+        if self.adaptive:
+            await context.add_init_script(self.js_manager.quiescence_init())
+
+    async def settle(self, page: Page, phase: str, max_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Wait until ``page`` settles or ``max_ms`` passes, and log the wait"""
+        max_ms = self.max_wait_ms if max_ms is None else max_ms
+        start = time.perf_counter()
+        reason: Optional[str] = None
+        if self.adaptive:
+            reason = await self._settle_adaptive(page, max_ms)
+        if reason is None:
+            reason = await self._settle_networkidle(page, max_ms)
+        return self.record(page, {
+            "phase": phase,
+            "waited_ms": round((time.perf_counter() - start) * 1000),
+            "reason": reason,
+        })
+
+    def record(self, page: Page, entry: Dict[str, Any]) -> Dict[str, Any]:
+        self._logs.setdefault(page, []).append(entry)
+        return entry
+
+    def take_log(self, page: Page) -> List[Dict[str, Any]]:
+        """Return and reset the waits recorded for ``page``"""
+        return self._logs.pop(page, None) or []
+
+    async def _settle_adaptive(self, page: Page, max_ms: int) -> Optional[str]:
+        script = self.js_manager.wait_quiescence(self.quiet_ms, max_ms, self.long_request_ms)
+        try:
+            info = await page.evaluate(script)
+        except Exception:
+            # The page navigated away mid-wait; wait for the new document instead
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=max_ms)
+            except Exception:
+                return "timeout"
+            return "navigated"
+        # None: tracking script missing (e.g. about:blank), fall back to networkidle
+        return info["reason"] if info else None
+
+    @staticmethod
+    async def _settle_networkidle(page: Page, max_ms: int) -> str:
+        try:
+            await page.wait_for_load_state("networkidle", timeout=max_ms)
+        except Exception:
+            return "timeout"
+        return "networkidle"
@@ -1,65 +1,412 @@
-from collections import deque
-from typing import List, Dict, Set, Any
+from dataclasses import asdict
+from typing import AsyncContextManager, AsyncIterator, Awaitable, Iterable, List, Dict, Any, Optional, Tuple, Union
 import asyncio
-import re
-from playwright.async_api import async_playwright, BrowserContext
+import json
+import sys
+import contextlib
+from collections import deque
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
 from .url_normalizer import URLNormalizer
+from .url_policy import URLPolicy
 from .page_automator import PageAutomator
 from .content_extractor import ContentExtractor
 from .scraping_config import ScrapingConfig
 from .js_manager import JsManager
+from .politeness import PolitenessScheduler
+from .page_pool import PagePool
+from .resource_blocker import ResourceBlocker
+from .static_fetcher import StaticFetcher
+from .wait_engine import WaitEngine
+from .browser_session import BrowserSession
+from .crawl_state import CrawlStateStore
+from .recrawl_index import RecrawlIndex
+from .seen_store import SeenStore, make_seen_store
+from .frontier import FrontierItem, SpillingFrontier
+from .near_duplicates import NearDuplicateDetector
+from .trap_detector import TrapDetector
+from .priority_frontier import PriorityFrontier, ScoreFn, URLScorer
+from .seeds import Seed, SeedCrawl
+from .metrics import NULL_TIMINGS, CrawlMetrics, PageTimings
+from .sinks import ResultSink
+from .snapshots import PageSnapshot, SnapshotStore
+
+
+Frontier = Union[SpillingFrontier, PriorityFrontier]
+
+
+class _CrawlFinished:
+    """Marker put on the result queue once the crawl task ends"""
+
+    def __init__(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
 
 
 class WebScraper:
     """Main scraper class that orchestrates the crawling process"""
+
+    # How far into a frontier a worker looks for a URL whose host is ready
+    _READY_SCAN_WINDOW = 32
     
-    def __init__(self, config: ScrapingConfig, js_manager: JsManager | None = None):
+    def __init__(self, config: ScrapingConfig, js_manager: JsManager | None = None,
+                 politeness: PolitenessScheduler | None = None,
+                 scorer: ScoreFn | None = None, session: BrowserSession | None = None,
+                 sinks: Iterable[ResultSink] = ()):
         self.config = config
+        # Opened and closed by the caller; every emitted result is written to each
+        self.sinks: List[ResultSink] = list(sinks)
         self.js_manager = js_manager or JsManager()
         self.url_normalizer = URLNormalizer()
-        self.page_automator = PageAutomator(config, js_manager=self.js_manager)
-        self.content_extractor = ContentExtractor(js_manager=self.js_manager)
-        self.seen_urls: Set[str] = set()
+        self.url_policy = URLPolicy.from_config(config)
+        # A shared session brings a running browser whose contexts already
+        # carry its wait engine and resource blocker
+        self.session = session
+        self.wait_engine = session.wait_engine if session is not None else WaitEngine(
+            strategy=config.wait_strategy,
+            quiet_ms=config.quiet_ms,
+            max_wait_ms=config.max_wait_ms,
+            js_manager=self.js_manager,
+        )
+        self.page_automator = PageAutomator(
+            config, js_manager=self.js_manager, wait_engine=self.wait_engine
+        )
+        self.content_extractor = ContentExtractor(
+            js_manager=self.js_manager, combined=config.combined_extraction,
+            wait_engine=self.wait_engine, url_policy=self.url_policy,
+        )
+        self.politeness = politeness or PolitenessScheduler(
+            min_interval_ms=config.host_delay_ms,
+            per_host_concurrency=config.per_host_concurrency,
+        )
+        self.seen_urls: SeenStore = make_seen_store(
+            config.seen_store,
+            capacity=max(config.max_pages, 1024),
+            fp_rate=config.bloom_fp_rate,
+        )
+        self.scorer: ScoreFn = scorer or URLScorer.from_config(config)
+        self.near_duplicates: Optional[NearDuplicateDetector] = (
+            NearDuplicateDetector(config.simhash_distance) if config.near_duplicates else None
+        )
+        self.trap_detector = TrapDetector.from_config(config)
+        self.metrics = CrawlMetrics.from_config(config)
         self.results: List[Dict[str, Any]] = []
+        self._result_queue: Optional[asyncio.Queue] = None
+        self.page_pool: Optional[PagePool] = None
+        self.state_store: Optional[CrawlStateStore] = None
+        self.recrawl_index: Optional[RecrawlIndex] = None
+        self.snapshot_store: Optional[SnapshotStore] = None
+        self.seed_crawls: List[SeedCrawl] = []
+        self.resource_blocker = session.resource_blocker if session is not None else (
+            ResourceBlocker.from_config(
+                preset=config.block_preset,
+                resource_types=config.block_resource_types,
+                url_patterns=config.block_url_patterns,
+                third_party=config.block_third_party,
+            )
+        )
+        self.static_fetcher: Optional[StaticFetcher] = (
+            StaticFetcher(config, url_policy=self.url_policy) if config.fetch_mode == "hybrid" else None
+        )
 
     async def scrape(self, start_url: str) -> List[Dict[str, Any]]:
-        """Main scraping method"""
+        """Main scraping method; collects every result into ``self.results``"""
+        async for result in self.iter_scrape(start_url):
+            self.results.append(result)
+        return self.results
+
+    async def iter_scrape(self, start_url: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield results as pages complete without accumulating them.
+
+        At most ``config.result_buffer`` results are held between the crawl and
+        the consumer; a slow consumer applies backpressure to the crawl.
+        """
+        async with contextlib.aclosing(self._iter_crawl(self._crawl(start_url))) as results:
+            async for result in results:
+                yield result
+
+    async def scrape_many(self, seeds: Iterable[Union[Seed, str]]) -> List[Dict[str, Any]]:
+        """Crawl several seeds in one browser session; collects into ``self.results``"""
+        async for result in self.iter_scrape_many(seeds):
+            self.results.append(result)
+        return self.results
+
+    async def iter_scrape_many(self, seeds: Iterable[Union[Seed, str]]
+                               ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield results of a multi-seed crawl as pages complete.
+
+        All seeds share the browser, page pool, concurrency limit and
+        politeness scheduler; each keeps its own host scope, depth,
+        ``max_pages`` budget, frontier and seen set. Workers take URLs from
+        the seeds in turn, so a large site cannot starve the others. Every
+        result carries the ``seed`` URL it was reached from.
+        """
+        seeds = [seed if isinstance(seed, Seed) else Seed(seed) for seed in seeds]
+        async with contextlib.aclosing(self._iter_crawl(self._crawl_many(seeds))) as results:
+            async for result in results:
+                yield result
+
+    async def _iter_crawl(self, crawl_run: Awaitable[None]) -> AsyncIterator[Dict[str, Any]]:
+        """Run a crawl in the background and yield its results"""
+        results: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.config.result_buffer))
+        self._result_queue = results
+        crawl = asyncio.create_task(self._run_crawl(crawl_run, results))
+        try:
+            while True:
+                item = await results.get()
+                if isinstance(item, _CrawlFinished):
+                    if item.error is not None:
+                        raise item.error
+                    break
+                yield item
+        finally:
+            self._result_queue = None
+            if not crawl.done():
+                crawl.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await crawl
+
+    async def _run_crawl(self, crawl_run: Awaitable[None], results: asyncio.Queue) -> None:
+        """Run the crawl and signal its end (or failure) on the result queue"""
+        try:
+            await crawl_run
+        except Exception as e:
+            await results.put(_CrawlFinished(e))
+        else:
+            await results.put(_CrawlFinished())
+
+    async def _emit(self, result: Dict[str, Any]) -> None:
+        """Hand a finished result to the sinks and the active consumer"""
+        for sink in self.sinks:
+            await sink.write(result)
+        if self._result_queue is not None:
+            await self._result_queue.put(result)
+        else:
+            self.results.append(result)
+
+    async def _crawl(self, start_url: str) -> None:
+        """Launch the browser and crawl from ``start_url``"""
         # Normalize the start URL before seeding the queue
-        start_url = self.url_normalizer.normalize_url(start_url)
-        queue = deque([(start_url, 0)])
-        
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=not self.config.headful)
-            context = await browser.new_context(
-                user_agent=self.config.user_agent or "Mozilla/5.0 (compatible; PlaywrightScraper/2.0)",
-                viewport={"width": self.config.vw, "height": self.config.vh}
+        start_url = self.url_policy.normalize(start_url)
+        self.url_policy.set_seeds([start_url])
+        async with self._crawl_stores():
+            await self._crawl_with_state(start_url)
+
+    async def _crawl_many(self, seeds: List[Seed]) -> None:
+        """Launch one browser session and crawl every seed in it"""
+        if self.config.state_file:
+            raise ValueError("Checkpointing (state_file) is not supported for multi-seed crawls")
+        # Links to any seed's host pass the shared policy; each seed then keeps its own
+        self.url_policy.set_seeds(seed.url for seed in seeds)
+        self.seed_crawls = crawls = [self._new_seed_crawl(seed) for seed in seeds]
+        try:
+            async with self._crawl_stores(), self._session() as (pool, semaphore):
+                await self._run_seed_pool(crawls, pool, semaphore)
+        finally:
+            for crawl in crawls:
+                crawl.queue.close()
+
+    def _new_seed_crawl(self, seed: Seed) -> SeedCrawl:
+        url = self.url_policy.normalize(seed.url)
+        max_pages = self.config.max_pages if seed.max_pages is None else seed.max_pages
+        return SeedCrawl(
+            seed, url, self.url_policy.host(url),
+            depth=self.config.depth if seed.depth is None else seed.depth,
+            max_pages=max_pages,
+            queue=self._new_frontier([(url, 0)]),
+            seen=make_seen_store(self.config.seen_store, capacity=max_pages,
+                                 fp_rate=self.config.bloom_fp_rate),
+        )
+
+    @contextlib.asynccontextmanager
+    async def _crawl_stores(self) -> AsyncIterator[None]:
+        """Open the recrawl index and snapshot store for a crawl, if configured"""
+        if self.config.incremental_db:
+            self.recrawl_index = RecrawlIndex(
+                self.config.incremental_db, flush_interval_ms=self.config.checkpoint_interval_ms
             )
-            
-            semaphore = asyncio.Semaphore(self.config.concurrency)
-            
+            await self.recrawl_index.open()
+        try:
+            if self.config.record_dir:
+                self.snapshot_store = SnapshotStore(
+                    self.config.record_dir, flush_interval_ms=self.config.checkpoint_interval_ms
+                )
+                await self.snapshot_store.open()
             try:
-                await self._process_queue(queue, context, semaphore, start_url)
+                yield
             finally:
-                await context.close()
-                await browser.close()
-        
-        return self.results
+                if self.snapshot_store is not None:
+                    await self.snapshot_store.close()
+        finally:
+            if self.recrawl_index is not None:
+                await self.recrawl_index.close()
+
+    async def _crawl_with_state(self, start_url: str) -> None:
+        """Crawl, checkpointing to the state file if one is configured"""
+        if not self.config.state_file:
+            await self._crawl_from(start_url, self._new_frontier([(start_url, 0)]))
+            return
+
+        store = self.state_store = CrawlStateStore(
+            self.config.state_file, flush_interval_ms=self.config.checkpoint_interval_ms
+        )
+        await store.open()
+        try:
+            queue = await self._restore_state(store, start_url)
+            await self._crawl_from(start_url, queue)
+        finally:
+            await store.close()
+
+    async def _restore_state(self, store: CrawlStateStore, start_url: str) -> Frontier:
+        """Resume from the store with ``config.resume``, else clear it and start fresh"""
+        meta, visited, frontier = await store.load()
+        if self.config.resume:
+            if meta.get("start_url") != start_url:
+                raise ValueError(f"{self.config.state_file} holds no crawl of {start_url} to resume")
+            if not frontier:
+                print(json.dumps({"_warning": f"The crawl in {self.config.state_file} is already finished"}),
+                      file=sys.stderr)
+            self.seen_urls.update(visited)
+            return self._new_frontier(frontier)
+
+        if meta:
+            print(json.dumps({"_warning": (
+                f"Discarding the crawl of {meta.get('start_url')} in {self.config.state_file}; "
+                "use --resume to continue it"
+            )}), file=sys.stderr)
+            await store.reset()
+        await store.save_meta({"start_url": start_url, "config": asdict(self.config)})
+        store.enqueued(start_url, 0)
+        return self._new_frontier([(start_url, 0)])
+
+    def _new_frontier(self, items: Iterable[FrontierItem]) -> Frontier:
+        if self.config.frontier == "priority":
+            return PriorityFrontier(items, scorer=self.scorer, path_budgets=self.config.path_budgets)
+        return SpillingFrontier(
+            items,
+            memory_limit=self.config.frontier_memory_limit,
+            spill_dir=self.config.spill_dir,
+        )
+
+    async def _crawl_from(self, start_url: str, queue: Frontier) -> None:
+        """Run the scheduler over ``queue`` with a fresh browser session"""
+        try:
+            await self._run_session(start_url, queue)
+        finally:
+            queue.close()
+
+    async def _run_session(self, start_url: str, queue: Frontier) -> None:
+        """Launch a browser session and drain ``queue``"""
+        async with self._session() as (pool, semaphore):
+            if self.config.scheduler == "batch":
+                await self._process_queue(queue, pool, semaphore, start_url)
+            else:
+                await self._run_worker_pool(queue, pool, semaphore, start_url)
+
+    def _session(self) -> AsyncContextManager[Tuple[PagePool, asyncio.Semaphore]]:
+        """Page pool and concurrency limit for one crawl"""
+        return self._shared_session() if self.session is not None else self._own_session()
+
+    @contextlib.asynccontextmanager
+    async def _own_session(self) -> AsyncIterator[Tuple[PagePool, asyncio.Semaphore]]:
+        """Playwright session with the page pool and HTTP fetcher set up"""
+        async with async_playwright() as p:
+            # The browser is launched by the pool on first use, so crawls served
+            # entirely by the HTTP path never start Chromium
+            browsers: List[Browser] = []
+            pool = self.page_pool = self._create_page_pool(p, browsers)
+            if self.static_fetcher is not None:
+                await self.static_fetcher.start(p)
+            try:
+                yield pool, asyncio.Semaphore(self.config.concurrency)
+            finally:
+                if self.static_fetcher is not None:
+                    await self.static_fetcher.close()
+                await pool.close()
+                for browser in browsers:
+                    await browser.close()
+
+    @contextlib.asynccontextmanager
+    async def _shared_session(self) -> AsyncIterator[Tuple[PagePool, asyncio.Semaphore]]:
+        """Borrow the shared session's pool; only the HTTP fetcher is per crawl"""
+        session = self.session
+        self.page_pool = session.pool
+        if self.static_fetcher is not None:
+            await self.static_fetcher.start(session.playwright)
+        try:
+            yield session.pool, session.semaphore
+        finally:
+            if self.static_fetcher is not None:
+                await self.static_fetcher.close()
+
+    def _create_page_pool(self, playwright: Playwright, browsers: List[Browser]) -> PagePool:
+        """Build the page pool used for one crawl, launching the browser lazily"""
+        launch_lock = asyncio.Lock()
 
-    async def _process_queue(self, queue: deque, context: BrowserContext, 
+        async def new_context() -> BrowserContext:
+            async with launch_lock:
+                if not browsers:
+                    browsers.append(await playwright.chromium.launch(headless=not self.config.headful))
+            return await self._new_context(browsers[0])
+
+        return PagePool(
+            new_context,
+            contexts=self.config.pool_contexts,
+            pool_size=self.config.page_pool_size,
+            context_max_pages=self.config.context_max_pages,
+            context_max_memory_mb=self.config.context_max_memory_mb,
+        )
+
+    async def _new_context(self, browser: Browser) -> BrowserContext:
+        """Create a browser context configured for crawling"""
+        context = await browser.new_context(
+            user_agent=self.config.user_agent or "Mozilla/5.0 (compatible; PlaywrightScraper/2.0)",
+            viewport={"width": self.config.vw, "height": self.config.vh}
+        )
+        if self.resource_blocker is not None:
+            await self.resource_blocker.install(context)
+        await self.wait_engine.install(context)
+        if self.recrawl_index is not None:
+            await self.recrawl_index.install(context)
+        return context
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters collected during the last crawl"""
+        stats: Dict[str, Any] = {"pages_visited": len(self.seen_urls)}
+        if self.seed_crawls:
+            stats["pages_visited"] = sum(len(crawl.seen) for crawl in self.seed_crawls)
+            stats["seeds"] = len(self.seed_crawls)
+        if self.page_pool is not None:
+            stats["page_pool"] = dict(self.page_pool.stats)
+        if self.resource_blocker is not None:
+            stats["resources"] = dict(self.resource_blocker.totals)
+        if self.static_fetcher is not None:
+            stats["static_fetch"] = dict(self.static_fetcher.stats)
+        if self.recrawl_index is not None:
+            stats["incremental"] = dict(self.recrawl_index.stats)
+        if self.snapshot_store is not None:
+            stats["snapshots"] = dict(self.snapshot_store.stats)
+        if self.near_duplicates is not None:
+            stats["near_duplicates"] = self.near_duplicates.flagged
+        if self.trap_detector is not None:
+            stats["traps"] = dict(self.trap_detector.stats)
+        return stats
+
+    async def _process_queue(self, queue: Frontier, pool: PagePool, 
                            semaphore: asyncio.Semaphore, start_url: str) -> None:
         """Process the URL queue"""
         tasks = []
         
         while queue and len(self.seen_urls) < self.config.max_pages:
             url, depth = queue.popleft()
-            url = self.url_normalizer.normalize_url(url)
+            if self.metrics is not None and self.metrics.sample_due():
+                self.metrics.sample_queue(len(queue), len(tasks))
+            url = self.url_policy.normalize(url)
             
             if url in self.seen_urls:
                 continue
                 
             self.seen_urls.add(url)
             tasks.append(asyncio.create_task(
-                self._visit_url(url, depth, context, semaphore)
+                self._visit_url(url, depth, pool, semaphore)
             ))
 
             # Drain a batch, then expand from each result's own depth
@@ -71,61 +418,317 @@ class WebScraper:
                     result_depth = result.get("depth", 0)
                     if result_depth < self.config.depth:
                         await self._expand_frontier(result, queue, start_url, result_depth)
+                    self._checkpoint(result["url"], result)
+
+    async def _run_worker_pool(self, queue: Frontier, pool: PagePool,
+                               semaphore: asyncio.Semaphore, start_url: str) -> None:
+        """Process the URL queue with long-lived workers sharing one frontier.
+
+        Each worker expands the frontier as soon as its own page finishes, so a
+        slow page only occupies its own slot instead of stalling a whole batch.
+        """
+        wakeup = asyncio.Condition()
+        active = 0
+        metrics = self.metrics
+
+        async def worker() -> None:
+            nonlocal active
+            while True:
+                async with wakeup:
+                    # Idle workers wait for links from pages still in flight
+                    while not queue and active:
+                        await wakeup.wait()
+                    if not queue or len(self.seen_urls) >= self.config.max_pages:
+                        wakeup.notify_all()
+                        return
+
+                    url, depth = self._pop_ready(queue)
+                    if metrics is not None and metrics.sample_due():
+                        metrics.sample_queue(len(queue), active)
+                    url = self.url_policy.normalize(url)
+                    if url in self.seen_urls:
+                        continue
+                    self.seen_urls.add(url)
+                    active += 1
+
+                try:
+                    result = await self._visit_url(url, depth, pool, semaphore)
+                    if depth < self.config.depth:
+                        await self._expand_frontier(result, queue, start_url, depth)
+                    self._checkpoint(url, result)
+                finally:
+                    async with wakeup:
+                        active -= 1
+                        wakeup.notify_all()
+
+        workers = max(1, self.config.concurrency)
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+    async def _run_seed_pool(self, crawls: List[SeedCrawl], pool: PagePool,
+                             semaphore: asyncio.Semaphore) -> None:
+        """Worker pool over the frontiers of many seeds, taking from each in turn"""
+        wakeup = asyncio.Condition()
+        ring = deque(crawls)
+        active = 0
+        metrics = self.metrics
 
-    async def _visit_url(self, url: str, depth: int, context: BrowserContext, 
-                        semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        def take() -> Optional[Tuple[SeedCrawl, FrontierItem]]:
+            # Round-robin over the seeds, taking from the first whose next
+            # host is ready; one pass over the ring at most, so a ready host
+            # is found however many busy seeds sit in front of it
+            fallback = None
+            for _ in range(len(ring)):
+                crawl = ring.popleft()
+                if crawl.exhausted:
+                    if crawl.in_flight:
+                        # Pages in flight may still add links; revisit it later
+                        ring.append(crawl)
+                    continue
+                ring.append(crawl)
+                item = crawl.queue.pop_first(self.politeness.is_ready, 1)
+                if item is not None:
+                    return crawl, item
+                if fallback is None:
+                    fallback = crawl
+            if fallback is not None:
+                return fallback, fallback.queue.popleft()
+            return None
+
+        async def worker() -> None:
+            nonlocal active
+            while True:
+                async with wakeup:
+                    job = take()
+                    # Idle workers wait for links from pages still in flight
+                    while job is None and active:
+                        await wakeup.wait()
+                        job = take()
+                    if job is None:
+                        wakeup.notify_all()
+                        return
+
+                    crawl, (url, depth) = job
+                    if metrics is not None and metrics.sample_due():
+                        metrics.sample_queue(sum(len(c.queue) for c in ring), active)
+                    url = self.url_policy.normalize(url)
+                    if url in crawl.seen:
+                        continue
+                    crawl.seen.add(url)
+                    crawl.in_flight += 1
+                    active += 1
+
+                try:
+                    result = await self._visit_url(url, depth, pool, semaphore, seed=crawl.url)
+                    if depth < crawl.depth:
+                        self._enqueue_links(
+                            self._frontier_links(result), crawl.queue, crawl.seen,
+                            crawl.max_pages, depth + 1, host=crawl.host,
+                        )
+                finally:
+                    async with wakeup:
+                        active -= 1
+                        crawl.in_flight -= 1
+                        wakeup.notify_all()
+
+        workers = max(1, self.config.concurrency)
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+    def _pop_ready(self, queue: Frontier) -> FrontierItem:
+        """Pop the first queued URL whose host can be dispatched without waiting.
+
+        Falls back to the head of the queue when no host in the scan window is
+        ready, in which case the politeness layer makes the worker wait.
+        """
+        item = queue.pop_first(self.politeness.is_ready, self._READY_SCAN_WINDOW)
+        return item if item is not None else queue.popleft()
+
+    async def _visit_url(self, url: str, depth: int, pool: PagePool, 
+                        semaphore: asyncio.Semaphore, seed: Optional[str] = None) -> Dict[str, Any]:
         """Visit a single URL and extract content"""
-        async with semaphore:
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=self.config.goto_timeout_ms, 
-                               wait_until="domcontentloaded")
-                await self.page_automator.run_page_automation(page)
-                text, links, tables = await self.content_extractor.extract_content(
-                    page, include_tables=self.config.include_tables
-                )
-                
-                result: Dict[str, Any] = {
-                    "url": url, 
-                    "text": text, 
-                    "links": links,
-                    "depth": depth
-                }
-                if self.config.include_tables:
-                    result["tables"] = tables or []
-                self.results.append(result)
-                
-                await asyncio.sleep(self.config.delay_ms / 1000)
-                return result
-                
-            except Exception as e:
-                result = {
-                    "url": url, 
-                    "error": str(e), 
-                    "text": "", 
-                    "links": [], 
-                    "depth": depth
-                }
-                if self.config.include_tables:
-                    result["tables"] = []
-                self.results.append(result)
-                return result
-            finally:
-                await page.close()
+        timings = self.metrics.page(url) if self.metrics is not None else NULL_TIMINGS
+        start = timings.clock()
+        async with self.politeness.slot(url):
+            timings.record("politeness", start)
+            start = timings.clock()
+            async with semaphore:
+                timings.record("slot", start)
+                previous = None
+                if self.recrawl_index is not None:
+                    with timings.phase("lookup"):
+                        previous = await self.recrawl_index.lookup(url)
+                conditional = RecrawlIndex.conditional_headers(previous)
+                result: Optional[Dict[str, Any]] = None
+                if self.static_fetcher is not None and self.static_fetcher.should_try(url):
+                    result = await self._visit_static(url, depth, conditional, timings)
+                if result is None:
+                    result = await self._visit_browser(url, depth, pool, conditional, timings)
+
+        # Status and headers of the main response, used by incremental crawls
+        response = result.pop("_response", None) or {}
+        content_type = response.get("headers", {}).get("content-type", "")
+        if content_type and not self.url_policy.allows_mime(content_type):
+            result = {**self._build_result(url, depth, "", [], []), "skipped": content_type}
+        if self.recrawl_index is not None:
+            result = self.recrawl_index.reconcile(
+                result, previous, response.get("headers", {}),
+                not_modified=response.get("status") == 304,
+            )
+        if (self.near_duplicates is not None and "error" not in result
+                and not result.get("unchanged")):
+            original = self.near_duplicates.check(url, result.get("text", ""))
+            if original is not None:
+                result["near_duplicate_of"] = original
+        if seed is not None:
+            result["seed"] = seed
+        if self.metrics is not None:
+            self.metrics.page_done(timings, result)
+        if not result.get("unchanged"):
+            await self._emit(result)
+        # The pause holds no slot, so other workers and hosts carry on meanwhile
+        if self.config.delay_ms > 0:
+            await asyncio.sleep(self.config.delay_ms / 1000)
+        return result
+
+    def _checkpoint(self, url: str, result: Dict[str, Any]) -> None:
+        """Mark ``url`` done in the state file; call after its links are enqueued.
+
+        Both updates then land in the same batch, or the links in an earlier
+        one, so a crash never leaves a page done with its links unrecorded.
+        """
+        if self.state_store is not None:
+            self.state_store.completed(url, result)
+
+    async def _visit_static(self, url: str, depth: int, headers: Optional[Dict[str, str]] = None,
+                            timings: PageTimings = NULL_TIMINGS) -> Optional[Dict[str, Any]]:
+        """Fetch a page over HTTP; None if it has to be rendered in the browser"""
+        try:
+            with timings.phase("static_fetch"):
+                fetched = await self.static_fetcher.fetch(url, headers=headers)
+        except Exception:
+            return None
+        if fetched is None:
+            return None
+        result = self._build_result(url, depth, fetched.text, fetched.links, fetched.tables)
+        if self.snapshot_store is not None and fetched.html:
+            self.snapshot_store.add(PageSnapshot(
+                url=url, depth=depth, fetch="http", status=fetched.status,
+                headers=fetched.headers, dom=fetched.html, final_url=fetched.url,
+            ))
+        result["fetch"] = "http"
+        result["_response"] = {"status": fetched.status, "headers": fetched.headers}
+        return result
+
+    async def _visit_browser(self, url: str, depth: int, pool: PagePool,
+                             headers: Optional[Dict[str, str]] = None,
+                             timings: PageTimings = NULL_TIMINGS) -> Dict[str, Any]:
+        """Render a page in the browser, automate it and extract content"""
+        with timings.phase("pool_acquire"):
+            page = await pool.acquire()
+        try:
+            if headers and self.recrawl_index is not None:
+                self.recrawl_index.arm(page, headers)
+            if self.snapshot_store is not None:
+                self.snapshot_store.arm(page)
+            with timings.phase("goto"):
+                response = await page.goto(url, timeout=self.config.goto_timeout_ms, 
+                                           wait_until="domcontentloaded")
+            if response is not None and response.status == 304:
+                # Unchanged since the last crawl; nothing to automate or extract
+                result = self._build_result(url, depth, "", [], [])
+            else:
+                with timings.phase("automation"):
+                    await self.page_automator.run_page_automation(page)
+                with timings.phase("extraction"):
+                    if self.config.scroll_harvest:
+                        text, links, tables = await self.content_extractor.harvest_content(
+                            page, include_tables=self.config.include_tables,
+                            max_steps=self.config.scrolls, wait_ms=self.config.scroll_wait_ms,
+                            seen_limit=self.config.harvest_seen_limit,
+                        )
+                    else:
+                        text, links, tables = await self.content_extractor.extract_content(
+                            page, include_tables=self.config.include_tables
+                        )
+                result = self._build_result(url, depth, text, links, tables)
+                if self.snapshot_store is not None:
+                    await self.snapshot_store.capture(page, url, depth, response)
+            if response is not None:
+                result["_response"] = {"status": response.status, "headers": response.headers}
+            
+        except Exception as e:
+            timings.failed(e)
+            result = self._build_result(url, depth, "", [], [])
+            result["error"] = str(e)
+        finally:
+            if self.recrawl_index is not None:
+                self.recrawl_index.disarm(page)
+            if self.snapshot_store is not None:
+                self.snapshot_store.disarm(page)
+            resources = (
+                self.resource_blocker.take_stats(page) if self.resource_blocker is not None else None
+            )
+            waits = self.wait_engine.take_log(page)
+            await pool.release(page)
+
+        result["waits"] = waits
+        if resources is not None:
+            result["resources"] = resources
+        if self.static_fetcher is not None:
+            result["fetch"] = "browser"
+        return result
+
+    def _build_result(self, url: str, depth: int, text: str, links: List[Dict[str, str]],
+                      tables: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "url": url, 
+            "text": text, 
+            "links": links,
+            "depth": depth
+        }
+        if self.config.include_tables:
+            result["tables"] = tables or []
+        return result
 
-    async def _expand_frontier(self, result: Dict[str, Any], queue: deque, 
+    def _frontier_links(self, result: Dict[str, Any]) -> List[Dict[str, str]]:
+        """In-scope, non-trap links of ``result``, normalized"""
+        if result.get("near_duplicate_of"):
+            # Its links are the original page's links again
+            return []
+        links = self.url_policy.filter_links(result.get("links", []))
+        if self.trap_detector is not None:
+            links = [link for link in links if not self.trap_detector.is_trap(link["href"])]
+        return links
+
+    async def _expand_frontier(self, result: Dict[str, Any], queue: Frontier, 
                               start_url: str, current_depth: int) -> None:
         """Expand the crawling frontier with new URLs"""
-        for link in result.get("links", []):
-            href = self.url_normalizer.normalize_url(link["href"])
-            
-            if (self.url_normalizer.same_domain(start_url, href) and
-                href not in self.seen_urls and
-                len(self.seen_urls) + len(queue) < self.config.max_pages):
-                
-                # Skip typical binary files
-                if re.search(r"\.(pdf|zip|jpg|jpeg|png|gif|webp|mp4|mov|avi|mp3)(\?.*)?$", 
-                            href, re.I):
-                    continue
-                    
-                queue.append((href, current_depth + 1))
+        self._enqueue_links(
+            self._frontier_links(result), queue, self.seen_urls,
+            self.config.max_pages, current_depth + 1,
+        )
+
+    def _enqueue_links(self, links: List[Dict[str, str]], queue: Frontier, seen: SeenStore,
+                       max_pages: int, depth: int, host: Optional[str] = None) -> None:
+        """Queue unseen ``links`` at ``depth``, only those on ``host`` if given"""
+        # FIFO never reaches entries past max_pages, so stop queueing there; a
+        # priority frontier keeps them because later links may outrank earlier ones
+        if isinstance(queue, PriorityFrontier):
+            budget = float("inf")
+        else:
+            budget = max_pages - len(seen) - len(queue)
+        for link in links:
+            if budget <= 0:
+                break
+            href = link["href"]
+            if host is not None and self.url_policy.host(href) != host:
+                continue
+            if href in seen:
+                continue
+            size = len(queue)
+            queue.append((href, depth), link["text"])
+            if len(queue) == size:
+                # Already queued, or over its path budget
+                continue
+            budget -= 1
+            if self.state_store is not None:
+                self.state_store.enqueued(href, depth)
@@ -0,0 +1,310 @@
+// Just enough DOM to run the bundled page scripts under node.
+//
+// Not a browser: there is no CSS or layout. Styles come from each element's
+// inline ``style`` object, visible elements measure 100x20 unless the style
+// sets ``width``/``height``, and innerText follows block and table structure
+// only roughly. Pages are built from JSON: a node is a string (text) or
+// ``[tag, {attributes, style: {...}}, ...children]``.
+
+const BLOCK_TAGS = new Set([
+  "address", "article", "aside", "blockquote", "body", "dd", "div", "dl", "dt", "fieldset",
+  "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+  "hr", "html", "li", "main", "nav", "ol", "p", "pre", "section", "table", "tbody", "thead",
+  "tfoot", "tr", "ul",
+]);
+const SKIP_TAGS = new Set(["head", "script", "style", "noscript", "template"]);
+
+const observers = new Set();
+
+function notify(target) {
+  for (const obs of observers) obs._queue(target);
+}
+
+class Text {
+  constructor(data) {
+    this.nodeType = 3;
+    this.parentElement = null;
+    this._data = data;
+  }
+
+  get data() {
+    return this._data;
+  }
+
+  set data(value) {
+    this._data = value;
+    notify(this);
+  }
+}
+
+class Element {
+  constructor(tag, attrs = {}) {
+    const { style, ...rest } = attrs;
+    this.nodeType = 1;
+    this.localName = tag;
+    this.attributes = rest;
+    this.style = { ...(style || {}) };
+    this.childNodes = [];
+    this.parentElement = null;
+    this.listeners = {};
+  }
+
+  get children() {
+    return this.childNodes.filter(n => n.nodeType === 1);
+  }
+
+  get firstElementChild() {
+    return this.children[0] || null;
+  }
+
+  get id() {
+    return this.attributes.id || "";
+  }
+
+  getAttribute(name) {
+    return name in this.attributes ? String(this.attributes[name]) : null;
+  }
+
+  hasAttribute(name) {
+    return name in this.attributes;
+  }
+
+  setAttribute(name, value) {
+    this.attributes[name] = String(value);
+    notify(this);
+  }
+
+  appendChild(node) {
+    if (node.parentElement) node.parentElement._detach(node);
+    node.parentElement = this;
+    this.childNodes.push(node);
+    notify(this);
+    return node;
+  }
+
+  append(...nodes) {
+    for (const node of nodes) this.appendChild(typeof node === "string" ? new Text(node) : node);
+  }
+
+  remove() {
+    if (this.parentElement) this.parentElement._detach(this);
+  }
+
+  _detach(node) {
+    this.childNodes.splice(this.childNodes.indexOf(node), 1);
+    node.parentElement = null;
+    notify(this);
+  }
+
+  addEventListener(type, listener) {
+    (this.listeners[type] || (this.listeners[type] = [])).push(listener);
+  }
+
+  get tHead() {
+    return this.children.find(c => c.localName === "thead") || null;
+  }
+
+  get tBodies() {
+    return this.children.filter(c => c.localName === "tbody");
+  }
+
+  get rows() {
+    return this.children.filter(c => c.localName === "tr");
+  }
+
+  get cells() {
+    return this.children.filter(c => c.localName === "td" || c.localName === "th");
+  }
+
+  getBoundingClientRect() {
+    // Nothing inside a display:none subtree gets a box
+    for (let e = this; e; e = e.parentElement) {
+      if (getComputedStyle(e).display === "none") return { width: 0, height: 0 };
+    }
+    const size = v => (v === undefined ? null : parseFloat(v));
+    return { width: size(this.style.width) ?? 100, height: size(this.style.height) ?? 20 };
+  }
+
+  get innerText() {
+    const out = [];
+    render(this, out);
+    return out.join("")
+      .split("\n")
+      .map(line => line.replace(/[ \t]+/g, " ").trim())
+      .filter(Boolean)
+      .join("\n");
+  }
+
+  get textContent() {
+    return this.childNodes.map(n => (n.nodeType === 3 ? n.data : n.textContent)).join("");
+  }
+}
+
+function render(node, out) {
+  if (node.nodeType === 3) {
+    if (getComputedStyle(node.parentElement).visibility !== "hidden") {
+      out.push(node.data.replace(/\s+/g, " "));
+    }
+    return;
+  }
+  const tag = node.localName;
+  if (SKIP_TAGS.has(tag) || getComputedStyle(node).display === "none") return;
+  if (tag === "br") {
+    out.push("\n");
+    return;
+  }
+  const block = BLOCK_TAGS.has(tag) || node.style.display === "block";
+  if (block) out.push("\n");
+  for (const child of node.childNodes) render(child, out);
+  if (tag === "td" || tag === "th") out.push("\t");
+  if (block) out.push("\n");
+}
+
+function getComputedStyle(el) {
+  let display = el.style.display;
+  if (display === undefined) display = el.hasAttribute("hidden") ? "none" : "block";
+  let visibility = "visible";
+  for (let e = el; e; e = e.parentElement) {
+    if (e.style.visibility !== undefined) {
+      visibility = e.style.visibility;
+      break;
+    }
+  }
+  return { display, visibility };
+}
+
+function build(spec) {
+  if (typeof spec === "string") return new Text(spec);
+  const [tag, attrs, ...children] = spec;
+  const el = new Element(tag, attrs || {});
+  for (const child of children) {
+    const node = build(child);
+    node.parentElement = el;
+    el.childNodes.push(node);
+  }
+  return el;
+}
+
+// Comma-separated list of ``tag`` or ``tag[attr]`` selectors, in document order
+function querySelectorAll(root, selectors) {
+  const tests = selectors.split(",").map(s => {
+    const m = s.trim().match(/^([a-z0-9]+)(?:\[([a-z-]+)\])?$/);
+    if (!m) throw new Error("Unsupported selector: " + s);
+    return el => el.localName === m[1] && (!m[2] || el.hasAttribute(m[2]));
+  });
+  const found = [];
+  (function walk(el) {
+    for (const child of el.children) {
+      if (tests.some(t => t(child))) found.push(child);
+      walk(child);
+    }
+  })(root);
+  return found;
+}
+
+class MutationObserver {
+  constructor(callback) {
+    this.callback = callback;
+    this.records = [];
+  }
+
+  observe() {
+    observers.add(this);
+  }
+
+  disconnect() {
+    observers.delete(this);
+    this.records = [];
+  }
+
+  _queue(target) {
+    if (this.records.push({ target }) === 1) {
+      queueMicrotask(() => {
+        const records = this.records;
+        this.records = [];
+        if (observers.has(this)) this.callback(records, this);
+      });
+    }
+  }
+}
+
+// Every request ends ``XMLHttpRequest.latency`` ms after send()
+class XMLHttpRequest {
+  constructor() {
+    this.listeners = [];
+  }
+
+  open(method, url) {
+    this.url = url;
+  }
+
+  send() {
+    setTimeout(() => {
+      for (const listener of this.listeners) listener({ type: "loadend" });
+    }, XMLHttpRequest.latency);
+  }
+
+  addEventListener(type, listener) {
+    if (type === "loadend") this.listeners.push(listener);
+  }
+}
+XMLHttpRequest.latency = 0;
+
+// Installs ``page`` (an ``["html", ...]`` spec) as the global document
+function install(page, { innerHeight = 800 } = {}) {
+  const html = build(page);
+  const find = tag => querySelectorAll(html, tag)[0] || null;
+  const listeners = {};
+  const document = {
+    documentElement: html,
+    get body() {
+      return find("body");
+    },
+    get head() {
+      return find("head");
+    },
+    scrollingElement: { scrollHeight: innerHeight },
+    querySelectorAll: selectors => querySelectorAll(html, selectors),
+    querySelector: selectors => querySelectorAll(html, selectors)[0] || null,
+    getElementById: id => {
+      let found = null;
+      (function walk(el) {
+        for (const child of el.children) {
+          if (found) return;
+          if (child.id === id) found = child;
+          else walk(child);
+        }
+      })(html);
+      return found;
+    },
+    createElement: tag => new Element(tag),
+    createTextNode: data => new Text(data),
+  };
+  Object.assign(globalThis, {
+    window: globalThis,
+    document,
+    getComputedStyle,
+    MutationObserver,
+    XMLHttpRequest,
+    innerHeight,
+    scrollY: 0,
+    addEventListener: (type, listener) => {
+      (listeners[type] || (listeners[type] = [])).push(listener);
+    },
+    scrollBy: (x, y) => {
+      const max = Math.max(0, document.scrollingElement.scrollHeight - globalThis.innerHeight);
+      globalThis.scrollY = Math.min(max, globalThis.scrollY + y);
+      for (const listener of listeners.scroll || []) listener({ type: "scroll" });
+    },
+  });
+  return document;
+}
+
+// Runs a bundled script the way page.evaluate does: a function is called with ``arg``
+async function evaluate(source, arg) {
+  let value = (0, eval)(source);
+  if (typeof value === "function") value = value(arg);
+  return await value;
+}
+
+module.exports = { build, install, evaluate, Element, Text };
@@ -0,0 +1,43 @@
+"""Runs the bundled page scripts under node against ``tests/js/dom_shim.js``.
+
+Tests call :func:`run_page` with a page as nested lists
+(``["html", {}, ["body", {}, ["p", {}, "text"]]]``) and a JavaScript body
+that may ``await evaluate(script, arg)``, add nodes made with ``build(spec)``
+and returns a JSON value.
+"""
+import json
+import os
+import shutil
+import subprocess
+from typing import Any
+
+import pytest
+
+
+NODE = shutil.which("node")
+SHIM = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js", "dom_shim.js")
+
+needs_node = pytest.mark.skipif(NODE is None, reason="node is not installed")
+
+
+def js(value: Any) -> str:
+    """``value`` as a JavaScript literal"""
+    return json.dumps(value)
+
+
+def run_page(page: list, body: str, inner_height: int = 800, timeout: float = 30) -> Any:
+    program = f"""
+const {{ install, evaluate, build }} = require({js(SHIM)});
+install({js(page)}, {{ innerHeight: {inner_height} }});
+(async () => {{
+{body}
+}})().then(
+  // Exit rather than wait for timers the page left running
+  result => process.stdout.write(JSON.stringify(result === undefined ? null : result), () => process.exit(0)),
+  error => {{ process.stderr.write(String(error && error.stack || error)); process.exit(1); }},
+);
+"""
+    proc = subprocess.run([NODE, "-"], input=program, capture_output=True, text=True, timeout=timeout)
+    if proc.returncode != 0:
+        raise AssertionError(f"node failed:\n{proc.stderr}")
+    return json.loads(proc.stdout)
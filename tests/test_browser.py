@@ -0,0 +1,155 @@
+"""End-to-end browser paths against the benchmark fixture site.
+
+Skipped when Chromium cannot be launched (``playwright install chromium``).
+"""
+import asyncio
+from dataclasses import replace
+
+import pytest
+from playwright.async_api import async_playwright
+
+from benchmarks.fixture_site import FixtureSite, FixtureSiteConfig
+from scraper import ReplayScraper, ScrapingConfig, WebScraper
+
+
+@pytest.fixture(scope="module")
+def chromium():
+    async def probe() -> None:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch()
+            await browser.close()
+
+    try:
+        asyncio.run(probe())
+    except Exception as e:
+        pytest.skip(f"Chromium is not available: {str(e).splitlines()[0]}")
+
+
+def browser_config(**kwargs) -> ScrapingConfig:
+    defaults = dict(depth=2, max_pages=12, delay_ms=0, concurrency=3, fetch_mode="browser",
+                    wait_strategy="adaptive", max_wait_ms=2000)
+    defaults.update(kwargs)
+    return ScrapingConfig(**defaults)
+
+
+def crawl(config: ScrapingConfig, url: str):
+    scraper = WebScraper(config)
+    results = asyncio.run(scraper.scrape(url))
+    assert results, "the crawl returned nothing"
+    assert not [r for r in results if "error" in r], [r["error"] for r in results if "error" in r]
+    return scraper, results
+
+
+def test_page_pool_reuses_pages_and_recycles_contexts(chromium):
+    with FixtureSite(FixtureSiteConfig(pages=30, fanout=3)) as site:
+        scraper, results = crawl(
+            browser_config(depth=3, page_pool_size=3, pool_contexts=2, context_max_pages=4, max_pages=15),
+            site.url(),
+        )
+    assert 10 <= len(results) <= 15
+    pool = scraper.stats()["page_pool"]
+    assert pool["reuse_hits"] > 0
+    assert pool["contexts_recycled"] > 0
+    assert pool["contexts_created"] >= 2
+    assert all("lorem ipsum" in r["text"] for r in results)
+
+
+# Adds an image, a stylesheet and a same-site fetch once the page has loaded
+_ADD_SUBRESOURCES = """
+const img = new Image(); img.src = "/page/1?as=image"; document.body.appendChild(img);
+const css = document.createElement("link"); css.rel = "stylesheet"; css.href = "/page/2?as=css";
+document.head.appendChild(css);
+await fetch("/page/3?as=fetch");
+await new Promise(resolve => setTimeout(resolve, 200));
+"""
+
+
+def test_resource_blocking_drops_media_and_styles(chromium):
+    with FixtureSite(FixtureSiteConfig(pages=10, fanout=2)) as site:
+        scraper, results = crawl(
+            browser_config(depth=0, block_preset="text-only", eval_js=_ADD_SUBRESOURCES), site.url()
+        )
+    resources = results[0]["resources"]
+    assert resources["blocked"] >= 2
+    # The document and the fetch go through
+    assert resources["allowed"] >= 2
+    assert scraper.stats()["resources"]["blocked"] == resources["blocked"]
+    assert "lorem ipsum" in results[0]["text"]
+
+
+def test_combined_extraction_matches_separate_scripts(chromium):
+    with FixtureSite(FixtureSiteConfig(pages=10, fanout=3, tables=2, table_rows=5, dom_nodes=200)) as site:
+        _, combined = crawl(browser_config(depth=1, include_tables=True), site.url())
+        _, separate = crawl(browser_config(depth=1, include_tables=True, combined_extraction=False), site.url())
+
+    def content(results):
+        return {r["url"]: (r["text"], r["links"], r["tables"]) for r in results}
+
+    assert content(combined) == content(separate)
+    first = next(r for r in combined if r["depth"] == 0)
+    assert len(first["tables"]) == 2 and len(first["tables"][0]["rows"]) == 5
+    assert len(first["links"]) == 3
+
+
+# Starts a slow request and only renders its content when it completes
+_LATE_CONTENT = """
+fetch("/page/4").then(r => r.text()).then(() => {
+  document.querySelector("main").insertAdjacentHTML("beforeend", "<p>late content</p>");
+});
+"""
+
+
+def test_adaptive_wait_holds_for_in_flight_requests(chromium):
+    with FixtureSite(FixtureSiteConfig(pages=10, slow_every=5, slow_ms=600)) as site:
+        _, results = crawl(
+            browser_config(depth=0, quiet_ms=200, max_wait_ms=3000, eval_js=_LATE_CONTENT), site.url()
+        )
+    result = results[0]
+    assert "late content" in result["text"]
+    load = next(w for w in result["waits"] if w["phase"] == "load")
+    assert load["reason"] == "quiet"
+    assert 400 <= load["waited_ms"] < 3000
+
+
+def test_adaptive_wait_returns_quickly_on_static_pages(chromium):
+    with FixtureSite(FixtureSiteConfig(pages=10, fanout=2)) as site:
+        _, results = crawl(browser_config(depth=1, quiet_ms=150, max_wait_ms=5000), site.url())
+    loads = [w for r in results for w in r["waits"] if w["phase"] == "load"]
+    assert loads and all(w["reason"] == "quiet" for w in loads)
+    assert max(w["waited_ms"] for w in loads) < 2000
+
+
+def test_browser_replay_matches_the_recording_offline(chromium, tmp_path):
+    record_dir = str(tmp_path / "snapshots")
+    config = browser_config(depth=1, include_tables=True)
+    with FixtureSite(FixtureSiteConfig(pages=10, fanout=3, tables=1, table_rows=3)) as site:
+        recorder, recorded = crawl(replace(config, record_dir=record_dir), site.url())
+    assert recorder.stats()["snapshots"]["pages"] == len(recorded)
+
+    # The site is gone: everything must come from the snapshots
+    replayed = asyncio.run(ReplayScraper(config, record_dir).replay())
+    assert all(r.get("replayed") for r in replayed)
+    assert not [r for r in replayed if "error" in r]
+
+    def content(results):
+        return {r["url"]: (r["text"], r["links"], r["tables"]) for r in results}
+
+    assert content(replayed) == content(recorded)
+
+
+@pytest.mark.parametrize("feed_divs", [False, True])
+def test_harvest_keeps_items_a_virtualized_feed_drops(chromium, feed_divs):
+    feed = FixtureSiteConfig(pages=5, scroll_every=1, feed_items=120, feed_batch=20,
+                             feed_virtualized=True, feed_window=40, feed_divs=feed_divs)
+    with FixtureSite(feed) as site:
+        _, harvested = crawl(browser_config(depth=0, scroll_harvest=True, scroll_wait_ms=300), site.url())
+        _, scrolled = crawl(browser_config(depth=0, scroll_until_end=True, scroll_wait_ms=300), site.url())
+
+    def items(result):
+        return {i for i in range(120) if f"Feed 0 item {i}:" in result["text"]}
+
+    assert items(harvested[0]) == set(range(120))
+    # A plain scroll only sees what is left in the DOM at the end
+    assert len(items(scrolled[0])) <= 40
+    scroll = next(w for w in harvested[0]["waits"] if w["phase"] == "scroll")
+    assert scroll["steps"] > 1
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import pytest
+
+from scraper import ScrapingConfig
+from scraper.__main__ import ScraperCLI
+from scraper.sharded import ShardedCrawler
+
+
+def test_iter_async_keeps_the_event_loop_running():
+    def slow_lines():
+        for i in range(3):
+            time.sleep(0.05)
+            yield str(i)
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        lines = [line async for line in ScraperCLI.iter_async(slow_lines())]
+        ticker.cancel()
+        return lines, ticks
+
+    lines, ticks = asyncio.run(run())
+    assert lines == ["0", "1", "2"]
+    assert ticks >= 10
+
+
+def test_iter_async_closes_the_source_when_stopped_early():
+    closed = []
+
+    def lines():
+        try:
+            yield from ("a", "b", "c")
+        finally:
+            closed.append(True)
+
+    async def run():
+        source = ScraperCLI.iter_async(lines())
+        first = await source.__anext__()
+        await source.aclose()
+        return first
+
+    assert asyncio.run(run()) == "a"
+    assert closed == [True]
+
+
+def test_write_lines_flushes_every_n(tmp_path):
+    path = tmp_path / "out.ndjson"
+    with open(path, "w", encoding="utf-8") as out:
+        assert ScraperCLI.write_lines(iter(['{"a": 1}', '{"b": 2}']), out, flush_every=2) == 2
+    assert path.read_text(encoding="utf-8") == '{"a": 1}\n{"b": 2}\n'
+
+
+@pytest.mark.parametrize("option", [
+    {"state_file": "state.db"}, {"incremental_db": "index.db"}, {"record_dir": "snapshots"},
+])
+def test_sharded_crawler_rejects_shared_files(option):
+    with pytest.raises(ValueError):
+        ShardedCrawler(ScrapingConfig(**option), workers=2)
@@ -0,0 +1,149 @@
+import asyncio
+import contextlib
+import sqlite3
+
+import pytest
+
+from benchmarks.fixture_site import FixtureSite, FixtureSiteConfig
+from scraper import ScrapingConfig, WebScraper
+from scraper.crawl_state import CrawlStateStore
+
+
+def crawl_config(state_file: str, **kwargs) -> ScrapingConfig:
+    # Fixture pages are static, so hybrid mode crawls them without a browser
+    defaults = dict(depth=3, max_pages=20, delay_ms=0, concurrency=4, fetch_mode="hybrid",
+                    state_file=state_file, checkpoint_interval_ms=10)
+    defaults.update(kwargs)
+    return ScrapingConfig(**defaults)
+
+
+def url_rows(path: str) -> dict:
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT url, status FROM urls"))
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def site():
+    with FixtureSite(FixtureSiteConfig(pages=50, fanout=3)) as site:
+        yield site
+
+
+def test_store_round_trip(tmp_path):
+    path = str(tmp_path / "state.db")
+
+    async def run():
+        store = CrawlStateStore(path)
+        await store.open()
+        await store.save_meta({"start_url": "https://a.test/"})
+        store.enqueued("https://a.test/", 0)
+        store.enqueued("https://a.test/x", 1)
+        store.enqueued("https://a.test/y", 1)
+        store.completed("https://a.test/", {"url": "https://a.test/", "depth": 0})
+        store.completed("https://a.test/x", {"url": "https://a.test/x", "depth": 1, "error": "boom"})
+        await store.close()
+
+        store = CrawlStateStore(path)
+        await store.open()
+        try:
+            return await store.load()
+        finally:
+            await store.close()
+
+    meta, visited, frontier = asyncio.run(run())
+    assert meta == {"start_url": "https://a.test/"}
+    assert visited == ["https://a.test/"]
+    assert frontier == [("https://a.test/x", 1), ("https://a.test/y", 1)]
+
+
+def test_reset_drops_previous_crawl(tmp_path):
+    path = str(tmp_path / "state.db")
+
+    async def run():
+        store = CrawlStateStore(path)
+        await store.open()
+        await store.save_meta({"start_url": "https://a.test/"})
+        store.enqueued("https://a.test/", 0)
+        await store.flush()
+        store.enqueued("https://a.test/pending", 1)
+        await store.reset()
+        await store.close()
+
+    asyncio.run(run())
+    assert CrawlStateStore.read_meta(path) == {}
+    assert url_rows(path) == {}
+
+
+def test_page_is_done_only_after_its_links_are_queued(tmp_path, site):
+    path = str(tmp_path / "state.db")
+    # No page budget, so every page below the depth limit enqueues all its links
+    scraper = WebScraper(crawl_config(path, depth=2, max_pages=100))
+    emit = scraper._emit
+    snapshots = []
+
+    async def flushing_emit(result):
+        # Flush where the periodic flusher could run, then record what a crash would leave
+        await scraper.state_store.flush()
+        snapshots.append(url_rows(path))
+        await emit(result)
+
+    scraper._emit = flushing_emit
+    asyncio.run(scraper.scrape(site.url()))
+
+    depths = {r["url"]: r["depth"] for r in scraper.results}
+    assert snapshots
+    for rows in snapshots:
+        for url, status in rows.items():
+            if status != "done" or depths[url] >= scraper.config.depth:
+                continue
+            n = int(url.rsplit("/", 1)[1])
+            children = {site.url(f"/page/{(n * 3 + i + 1) % 50}") for i in range(3)}
+            assert children <= rows.keys(), url
+
+
+def test_fresh_crawl_clears_state_of_another_crawl(tmp_path, site, capsys):
+    path = str(tmp_path / "state.db")
+    asyncio.run(WebScraper(crawl_config(path)).scrape(site.url("/page/10")))
+    old = set(url_rows(path))
+
+    results = asyncio.run(WebScraper(crawl_config(path, max_pages=5)).scrape(site.url()))
+
+    assert '"_warning"' in capsys.readouterr().err
+    assert CrawlStateStore.read_meta(path)["start_url"] == site.url()
+    rows = url_rows(path)
+    assert {r["url"] for r in results} <= rows.keys()
+    assert not (old - {r["url"] for r in results}) & {u for u, s in rows.items() if s == "done"}
+
+
+def test_rerun_without_resume_crawls_again(tmp_path, site):
+    path = str(tmp_path / "state.db")
+    first = asyncio.run(WebScraper(crawl_config(path)).scrape(site.url()))
+    again = asyncio.run(WebScraper(crawl_config(path)).scrape(site.url()))
+    assert len(again) == len(first) > 0
+
+
+def test_resume_requires_matching_crawl(tmp_path, site):
+    path = str(tmp_path / "state.db")
+    asyncio.run(WebScraper(crawl_config(path, max_pages=3)).scrape(site.url()))
+    with pytest.raises(ValueError):
+        asyncio.run(WebScraper(crawl_config(path, resume=True)).scrape(site.url("/page/7")))
+
+
+def test_resume_continues_a_stopped_crawl(tmp_path, site):
+    path = str(tmp_path / "state.db")
+
+    async def stop_early():
+        urls = []
+        async with contextlib.aclosing(WebScraper(crawl_config(path)).iter_scrape(site.url())) as results:
+            async for result in results:
+                urls.append(result["url"])
+                if len(urls) == 5:
+                    break
+        return urls
+
+    first = asyncio.run(stop_early())
+    rest = asyncio.run(WebScraper(crawl_config(path, resume=True)).scrape(site.url()))
+    assert rest
+    assert not set(first) & {r["url"] for r in rest}
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import os
+import socket
+
+import pytest
+
+from benchmarks.fixture_site import FixtureSite, FixtureSiteConfig
+from scraper import DaemonClient, ScrapeDaemon, ScrapingConfig
+
+
+def job(**fields) -> bytes:
+    return json.dumps(fields).encode("utf-8") + b"\n"
+
+
+def test_parse_job_accepts_job_fields():
+    url, config = ScrapeDaemon._parse_job(job(url="https://a.test/", config={"depth": 2, "max_pages": 9}))
+    assert url == "https://a.test/"
+    assert (config.depth, config.max_pages) == (2, 9)
+
+
+@pytest.mark.parametrize("field, value", [
+    ("eval_js_file", "/etc/passwd"),
+    ("record_dir", "/tmp/x"),
+    ("spill_dir", "/tmp/x"),
+    ("state_file", "/tmp/x.db"),
+    ("incremental_db", "/tmp/x.db"),
+    ("host_delay_ms", 0),
+    ("headful", True),
+    ("eval_js", "document.title"),
+    ("no_such_field", 1),
+])
+def test_parse_job_refuses_other_fields(field, value):
+    with pytest.raises(ValueError, match=field):
+        ScrapeDaemon._parse_job(job(url="https://a.test/", config={field: value}))
+
+
+def test_parse_job_accepts_eval_js_only_when_allowed():
+    line = job(url="https://a.test/", config={"eval_js": "document.title"})
+    assert ScrapeDaemon._parse_job(line, allow_eval_js=True)[1].eval_js == "document.title"
+
+
+def test_parse_job_lowers_fields_to_limits():
+    line = job(url="https://a.test/", config={
+        "max_pages": 10 ** 9, "concurrency": 500, "harvest_seen_limit": 10 ** 9, "result_buffer": 10 ** 9,
+    })
+    daemon = ScrapeDaemon(prelaunch=False, max_concurrency=8, job_limits={"max_pages": 100})
+    config = daemon._parse_job(line, limits=daemon.job_limits)[1]
+    assert config.max_pages == 100
+    assert config.concurrency == 8
+    assert config.harvest_seen_limit == 100000
+    assert config.result_buffer == 1000
+    # Values under the limits are left alone
+    assert ScrapeDaemon._parse_job(job(url="https://a.test/", config={"max_pages": 9}))[1].max_pages == 9
+    with pytest.raises(ValueError, match="max_pages"):
+        ScrapeDaemon._parse_job(job(url="https://a.test/", config={"max_pages": "lots"}))
+
+
+def test_parse_job_checks_token():
+    line = job(url="https://a.test/", token="secret")
+    assert ScrapeDaemon._parse_job(line, "secret")[0] == "https://a.test/"
+    with pytest.raises(ValueError, match="token"):
+        ScrapeDaemon._parse_job(line, "other")
+    with pytest.raises(ValueError, match="token"):
+        ScrapeDaemon._parse_job(job(url="https://a.test/"), "secret")
+
+
+@pytest.mark.parametrize("line", [b"not json\n", job(config={}), job(url="https://a.test/", config=[1])])
+def test_parse_job_rejects_malformed_jobs(line):
+    with pytest.raises(ValueError):
+        ScrapeDaemon._parse_job(line)
+
+
+def test_tcp_daemon_is_loopback_only_and_has_a_token():
+    with pytest.raises(ValueError):
+        ScrapeDaemon(host="0.0.0.0")
+    assert ScrapeDaemon(host="127.0.0.1").token
+    assert ScrapeDaemon(host="::1", token="mine").token == "mine"
+    assert ScrapeDaemon(socket_path="/tmp/unused.sock").token is None
+
+
+def test_client_sends_only_job_fields():
+    config = ScrapingConfig(depth=1, host_delay_ms=0, state_file="x.db", record_dir="snaps")
+    assert DaemonClient._job_options(config) == {"depth": 1}
+
+
+def test_jobs_share_one_politeness_scheduler():
+    daemon = ScrapeDaemon(prelaunch=False, host_delay_ms=250, per_host_concurrency=2)
+    assert daemon.politeness.min_interval == 0.25
+    assert daemon.politeness.per_host_concurrency == 2
+
+
+def test_tcp_job_round_trip():
+    config = ScrapingConfig(fetch_mode="hybrid", depth=1, max_pages=4)
+
+    async def run(site):
+        async with ScrapeDaemon(prelaunch=False) as daemon:
+            results = await DaemonClient(daemon.address, token=daemon.token).scrape(site.url(), config)
+            with pytest.raises(RuntimeError, match="token"):
+                await DaemonClient(daemon.address).scrape(site.url(), config)
+            return results
+
+    with FixtureSite(FixtureSiteConfig(pages=10, fanout=3)) as site:
+        results = asyncio.run(run(site))
+        assert len(results) == 4
+        assert results[0]["url"] == site.url()
+
+
+def test_unix_socket_is_private(tmp_path):
+    path = str(tmp_path / "scraper.sock")
+
+    async def run():
+        async with ScrapeDaemon(socket_path=path, prelaunch=False):
+            return os.stat(path).st_mode & 0o777
+
+    umask = os.umask(0)
+    try:
+        assert asyncio.run(run()) == 0o600
+    finally:
+        os.umask(umask)
+    assert not os.path.exists(path)
+
+
+def test_unix_socket_checks_token_when_set(tmp_path):
+    path = str(tmp_path / "scraper.sock")
+    config = ScrapingConfig(fetch_mode="hybrid", depth=0)
+
+    async def run(site):
+        async with ScrapeDaemon(socket_path=path, prelaunch=False, token="secret") as daemon:
+            results = await DaemonClient(daemon.address, token="secret").scrape(site.url(), config)
+            with pytest.raises(RuntimeError, match="token"):
+                await DaemonClient(daemon.address).scrape(site.url(), config)
+            return results
+
+    with FixtureSite(FixtureSiteConfig(pages=5)) as site:
+        assert len(asyncio.run(run(site))) == 1
+
+
+def test_unix_socket_replaces_a_stale_socket(tmp_path):
+    path = str(tmp_path / "scraper.sock")
+
+    async def run():
+        async with ScrapeDaemon(socket_path=path, prelaunch=False):
+            pass
+        stale = socket.socket(socket.AF_UNIX)
+        stale.bind(path)
+        stale.close()
+        async with ScrapeDaemon(socket_path=path, prelaunch=False):
+            return os.stat(path).st_mode & 0o777
+
+    assert asyncio.run(run()) == 0o600
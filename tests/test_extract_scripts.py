@@ -0,0 +1,68 @@
+from node_dom import js, needs_node, run_page
+from scraper.js_manager import JsManager
+
+
+pytestmark = needs_node
+
+JS = JsManager()
+
+PAGE = ["html", {},
+    ["head", {}, ["title", {}, "Ignored"], ["style", {}, "p { color: red }"]],
+    ["body", {},
+        ["nav", {}, ["a", {"href": "/"}, "Home"], ["a", {"href": "/about"}, " About\n us "]],
+        ["main", {},
+            ["h1", {}, "Heading"],
+            ["p", {}, "First   paragraph with ", ["a", {"href": "/more"}, "a link"], "."],
+            ["p", {}, "Repeated"],
+            ["section", {}, ["p", {}, "Repeated"]],
+            ["p", {"style": {"display": "none"}}, "Hidden by display"],
+            ["p", {"hidden": ""}, "Hidden by attribute", ["a", {"href": "/hidden"}, "gone"]],
+            ["div", {"style": {"visibility": "hidden"}}, ["p", {}, "Invisible"], ["a", {"href": "/invisible"}, "x"]],
+            ["p", {"style": {"height": "0"}}, "Zero height"],
+            ["a", {}, "No href"],
+            ["table", {},
+                ["thead", {}, ["tr", {}, ["th", {}, "Name"], ["th", {}, "Price"]]],
+                ["tbody", {},
+                    ["tr", {}, ["td", {}, "Apple"], ["td", {}, " 1.00 "]],
+                    ["tr", {}, ["td", {}, ""], ["td", {}, ""]],
+                    ["tr", {}, ["td", {}, "Pear"], ["td", {}, "2.00"]]]],
+            ["table", {"style": {"display": "none"}},
+                ["tbody", {}, ["tr", {}, ["td", {}, "Hidden table"]]]],
+            ["table", {}, ["tbody", {}, ["tr", {}, ["td", {}, ""]]]]]]]
+
+
+def extract(page: list, text: bool = True, links: bool = True, tables: bool = True) -> dict:
+    body = f"""
+const combined = await evaluate({js(JS.extract_all(text=text, links=links, tables=tables))});
+const separate = {{
+  text: await evaluate({js(JS.extract_text())}),
+  links: await evaluate({js(JS.extract_links())}),
+  tables: await evaluate({js(JS.extract_tables())}),
+}};
+return {{ combined, separate }};
+"""
+    return run_page(page, body)
+
+
+def test_combined_pass_matches_the_separate_scripts():
+    out = extract(PAGE)
+    assert out["combined"] == out["separate"]
+
+
+def test_combined_pass_keeps_visible_content_only():
+    combined = extract(PAGE)["combined"]
+    lines = combined["text"].split("\n")
+    assert "Heading" in lines and "First paragraph with a link." in lines
+    assert not [line for line in lines if "Hidden" in line or "Invisible" in line]
+    assert combined["links"] == [
+        {"text": "Home", "href": "/"},
+        {"text": "About us", "href": "/about"},
+        {"text": "a link", "href": "/more"},
+    ]
+    assert combined["tables"] == [{"headers": [["Name", "Price"]], "rows": [["Apple", "1.00"], ["Pear", "2.00"]]}]
+
+
+def test_unrequested_parts_come_back_as_null():
+    combined = extract(PAGE, links=False, tables=False)["combined"]
+    assert combined["links"] is None and combined["tables"] is None
+    assert combined["text"] == extract(PAGE)["separate"]["text"]
@@ -0,0 +1,86 @@
+from scraper.frontier import SpillingFrontier
+from scraper.priority_frontier import PriorityFrontier, URLScorer
+
+
+def drain(frontier):
+    items = []
+    while frontier:
+        items.append(frontier.popleft())
+    return items
+
+
+def test_spilling_frontier_keeps_fifo_order_across_spills(tmp_path):
+    items = [(f"https://a.test/{i}", i % 3) for i in range(25)]
+    frontier = SpillingFrontier(items[:10], memory_limit=4, spill_dir=str(tmp_path))
+    assert frontier.spilled == 6
+    popped = [frontier.popleft() for _ in range(5)]
+    for item in items[10:]:
+        frontier.append(item)
+    assert len(frontier) == 20
+    assert popped + drain(frontier) == items
+    frontier.close()
+
+
+def test_spilling_frontier_pop_first_skips_non_matching():
+    frontier = SpillingFrontier([("https://a.test/1", 0), ("https://b.test/1", 0), ("https://a.test/2", 0)])
+    assert frontier.pop_first(lambda url: url.startswith("https://b."), 2) == ("https://b.test/1", 0)
+    assert frontier.pop_first(lambda url: url.startswith("https://c."), 5) is None
+    assert drain(frontier) == [("https://a.test/1", 0), ("https://a.test/2", 0)]
+
+
+def test_url_scorer_weights():
+    scorer = URLScorer(depth_weight=1.0, pattern_weights={"*/product/*": 5, "*/tag/*": -3},
+                       keyword_weights={"price": 2})
+    assert scorer("https://a.test/product/1", 2) == 3
+    assert scorer("https://a.test/tag/x", 0) == -3
+    assert scorer("https://a.test/x", 1, "Best PRICE") == 1
+
+
+def test_priority_frontier_orders_by_score_then_insertion():
+    frontier = PriorityFrontier(scorer=lambda url, depth, anchor: -depth)
+    for item in [("https://a.test/b", 1), ("https://a.test/a", 0), ("https://a.test/c", 1)]:
+        frontier.append(item)
+    frontier.append(("https://a.test/b", 1))
+    assert drain(frontier) == [("https://a.test/a", 0), ("https://a.test/b", 1), ("https://a.test/c", 1)]
+
+
+def test_path_budget_is_charged_when_popped():
+    # The low-scoring /tag/ URLs come first, the best one last
+    scores = {"https://a.test/tag/1": 1, "https://a.test/tag/2": 2, "https://a.test/tag/3": 9}
+    frontier = PriorityFrontier(scorer=lambda url, depth, anchor: scores.get(url, 0),
+                                path_budgets={"/tag/": 2})
+    for url in scores:
+        frontier.append((url, 1))
+    frontier.append(("https://a.test/other", 1))
+    assert len(frontier) == 4
+
+    assert frontier.popleft() == ("https://a.test/tag/3", 1)
+    assert frontier.popleft() == ("https://a.test/tag/2", 1)
+    # Budget spent: the last /tag/ entry no longer counts and is dropped
+    assert len(frontier) == 1
+    assert drain(frontier) == [("https://a.test/other", 1)]
+    assert frontier.over_budget == 1
+
+    frontier.append(("https://a.test/tag/4", 1))
+    assert not frontier
+    assert frontier.over_budget == 2
+
+
+def test_path_budget_longest_prefix_wins():
+    frontier = PriorityFrontier(path_budgets={"/blog/": 1, "/blog/archive/": 0})
+    frontier.append(("https://a.test/blog/archive/1", 1))
+    frontier.append(("https://a.test/blog/1", 1))
+    frontier.append(("https://a.test/blog/2", 1))
+    assert drain(frontier) == [("https://a.test/blog/1", 1)]
+
+
+def test_pop_first_charges_budget_and_drops_spent_entries():
+    frontier = PriorityFrontier(scorer=lambda url, depth, anchor: -int(url[-1]), path_budgets={"/t/": 1})
+    for i in range(1, 4):
+        frontier.append((f"https://a.test/t/{i}", 0))
+    frontier.append(("https://b.test/4", 0))
+    assert frontier.pop_first(lambda url: True, 2) == ("https://a.test/t/1", 0)
+    assert frontier.pop_first(lambda url: url.startswith("https://a."), 5) is None
+    assert len(frontier) == 1
+    assert frontier.pop_first(lambda url: True, 1) == ("https://b.test/4", 0)
+    assert not frontier
@@ -0,0 +1,71 @@
+from node_dom import js, needs_node, run_page
+from scraper.js_manager import JsManager
+
+
+JS = JsManager()
+
+ITEM_PX = 80
+
+
+def item(i: int, divs: bool) -> list:
+    link = ["a", {"href": f"/page/{i}"}, f"Item {i}"]
+    if divs:
+        return ["div", {"class": "item"}, f"Feed item {i}: lorem ipsum. ", link]
+    return ["article", {"class": "item"}, ["p", {}, f"Feed item {i}: lorem ipsum."], link]
+
+
+def harvest_feed(divs: bool, total: int = 60, batch: int = 10, window: int = 20) -> list:
+    """Harvest a virtualized feed step by step; returns every step's chunk"""
+    page = ["html", {}, ["body", {}, ["main", {},
+        ["h1", {}, "Feed"],
+        ["div", {"id": "feed"}, *(item(i, divs) for i in range(batch))],
+    ]]]
+    body = f"""
+const items = {js([item(i, divs) for i in range(total)])};
+const feed = document.getElementById("feed");
+let offset = {batch};
+document.scrollingElement.scrollHeight = offset * {ITEM_PX};
+// Each scroll loads a batch and drops items past the window, like a virtualized list
+addEventListener("scroll", () => {{
+  for (const spec of items.slice(offset, offset + {batch})) feed.appendChild(build(spec));
+  offset = Math.min(offset + {batch}, {total});
+  while (feed.children.length > {window}) feed.firstElementChild.remove();
+  document.scrollingElement.scrollHeight = offset * {ITEM_PX};
+}});
+const script = {js(JS.harvest(0, seen_limit=1000))};
+const chunks = [await evaluate(script, false)];
+for (let step = 0; step < 40; step++) {{
+  const chunk = await evaluate(script, true);
+  chunks.push(chunk);
+  if (chunk.at_end && !chunk.text.length && !chunk.links.length) break;
+}}
+return chunks;
+"""
+    return run_page(page, body, inner_height=400)
+
+
+@needs_node
+def test_harvest_returns_each_item_of_a_div_feed_once():
+    chunks = harvest_feed(divs=True)
+    lines = [line for chunk in chunks for line in chunk["text"]]
+    items = [line for line in lines if line.startswith("Feed item")]
+    assert items == [f"Feed item {i}: lorem ipsum. Item {i}" for i in range(60)]
+    assert lines.count("Feed") == 1
+    assert [link["href"] for chunk in chunks for link in chunk["links"]] == [f"/page/{i}" for i in range(60)]
+
+
+@needs_node
+def test_harvest_steps_only_return_new_lines():
+    chunks = harvest_feed(divs=True)
+    # The first step reads the page so far; later steps carry one batch each
+    assert len(chunks[0]["text"]) == 11
+    assert all(len(chunk["text"]) <= 10 for chunk in chunks[1:])
+
+
+@needs_node
+def test_harvest_article_feed_matches_the_div_feed():
+    lines = [line for chunk in harvest_feed(divs=False) for line in chunk["text"]]
+    assert [line for line in lines if line.startswith("Feed item")] == [
+        f"Feed item {i}: lorem ipsum." for i in range(60)
+    ]
+    assert len(lines) == len(set(lines))
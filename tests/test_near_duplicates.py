@@ -0,0 +1,65 @@
+import random
+
+from scraper import ScrapingConfig, WebScraper
+from scraper.near_duplicates import NearDuplicateDetector, SimHashIndex, simhash
+
+
+def article(seed: int, words: int = 200) -> str:
+    rng = random.Random(seed)
+    return " ".join(f"word{rng.randrange(5000)}" for _ in range(words))
+
+
+def test_simhash_is_close_for_small_edits():
+    text = article(1)
+    edited = text.replace(text.split()[10], "changed", 1)
+    assert (simhash(text) ^ simhash(edited)).bit_count() <= 3
+    assert (simhash(text) ^ simhash(article(2))).bit_count() > 10
+
+
+def test_index_finds_fingerprints_within_distance():
+    index = SimHashIndex(distance=3)
+    index.add(0b1011 << 40, "a")
+    assert index.find((0b1011 << 40) ^ 0b111) == "a"
+    assert index.find((0b1011 << 40) ^ 0b1111) is None
+    assert len(index) == 1
+
+
+def test_detector_flags_near_duplicates_only():
+    detector = NearDuplicateDetector(distance=3)
+    text = article(1)
+    assert detector.check("https://a.test/1", text) is None
+    assert detector.check("https://a.test/1?print=1", text + " footer") == "https://a.test/1"
+    assert detector.check("https://a.test/2", article(2)) is None
+    # Short pages are never flagged
+    assert detector.check("https://a.test/e1", "Not found") is None
+    assert detector.check("https://a.test/e2", "Not found") is None
+    assert detector.flagged == 1
+
+
+def test_index_agrees_with_a_linear_scan():
+    rng = random.Random(7)
+    index = SimHashIndex(distance=3)
+    stored = {}
+    for i in range(2000):
+        fp = rng.getrandbits(64)
+        index.add(fp, str(i))
+        stored[fp] = str(i)
+    for base in rng.sample(list(stored), 200):
+        for flips in range(6):
+            probe = base
+            for bit in rng.sample(range(64), flips):
+                probe ^= 1 << bit
+            expected = [key for fp, key in stored.items() if (fp ^ probe).bit_count() <= 3]
+            found = index.find(probe)
+            assert (found is None) == (not expected)
+            if found is not None:
+                assert found in expected
+
+
+def test_links_of_near_duplicates_are_not_followed():
+    scraper = WebScraper(ScrapingConfig(near_duplicates=True))
+    links = [{"href": "https://a.test/next", "text": "next"}]
+    assert scraper._frontier_links({"url": "https://a.test/1", "links": links}) == links
+    assert scraper._frontier_links(
+        {"url": "https://a.test/1?print=1", "links": links, "near_duplicate_of": "https://a.test/1"}
+    ) == []
@@ -0,0 +1,144 @@
+import asyncio
+
+from scraper.page_pool import PagePool
+
+
+class FakePage:
+    def __init__(self, heap: int = 0) -> None:
+        self.heap = heap
+        self.closed = False
+        self.url = ""
+
+    async def goto(self, url: str) -> None:
+        self.url = url
+
+    async def evaluate(self, script: str) -> int:
+        return self.heap
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.closed = False
+        self.pages = []
+
+    async def new_page(self) -> FakePage:
+        await asyncio.sleep(0)
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self) -> None:
+        # Closing a context closes its pages, as in Playwright
+        self.closed = True
+        for page in self.pages:
+            page.closed = True
+
+
+def make_pool(**kwargs):
+    contexts = []
+
+    async def factory() -> FakeContext:
+        # Yield so concurrent acquires interleave while a context is created
+        await asyncio.sleep(0.01)
+        context = FakeContext()
+        contexts.append(context)
+        return context
+
+    return PagePool(factory, **kwargs), contexts
+
+
+def test_concurrent_acquire_respects_context_limit():
+    async def run():
+        pool, contexts = make_pool(contexts=2)
+        pages = await asyncio.gather(*(pool.acquire() for _ in range(8)))
+        assert len(contexts) == 2
+        assert pool.stats["contexts_created"] == 2
+        for page in pages:
+            await pool.release(page)
+
+    asyncio.run(run())
+
+
+def test_idle_count_stays_consistent_when_context_retires():
+    async def run():
+        pool, contexts = make_pool(pool_size=4, context_max_pages=3)
+        for _ in range(3):
+            pages = [await pool.acquire() for _ in range(2)]
+            for page in pages:
+                await pool.release(page)
+            assert 0 <= pool._idle_count <= pool.pool_size
+            assert pool._idle_count == sum(len(c.idle) for c in pool._active)
+        assert pool.stats["contexts_recycled"] >= 1
+
+    asyncio.run(run())
+
+
+def test_retired_context_does_not_hand_out_idle_pages():
+    async def run():
+        pool, contexts = make_pool(pool_size=4, context_max_pages=2)
+        first, second = await pool.acquire(), await pool.acquire()
+        await pool.release(first)
+        await pool.release(second)
+        # The first context served its two pages and was retired
+        assert contexts[0].closed
+        page = await pool.acquire()
+        assert page not in (first, second)
+        assert pool._idle_count == 0
+
+    asyncio.run(run())
+
+
+def test_memory_limit_retires_context_without_page_reuse():
+    async def run():
+        pool, contexts = make_pool(pool_size=0, context_max_memory_mb=1)
+        page = await pool.acquire()
+        page.heap = 2 * 1024 * 1024
+        await pool.release(page)
+        assert pool.stats["contexts_recycled"] == 1
+        assert contexts[0].closed
+        await pool.release(await pool.acquire())
+        assert len(contexts) == 2
+
+    asyncio.run(run())
+
+
+def test_pages_are_reset_and_reused():
+    async def run():
+        pool, contexts = make_pool(pool_size=2)
+        page = await pool.acquire()
+        page.url = "https://a.test/"
+        await pool.release(page)
+        assert page.url == "about:blank" and not page.closed
+        assert await pool.acquire() is page
+        assert pool.stats == {"pages_created": 1, "reuse_hits": 1, "contexts_created": 1,
+                              "contexts_recycled": 0}
+
+    asyncio.run(run())
+
+
+def test_crawl_recycles_contexts_and_closes_everything():
+    async def visit(pool: PagePool) -> None:
+        page = await pool.acquire()
+        await asyncio.sleep(0)
+        # Retiring a context must not close it under a page still in use
+        assert not page.closed
+        await pool.release(page)
+
+    async def run():
+        pool, contexts = make_pool(contexts=2, pool_size=3, context_max_pages=4)
+        # Fifteen visits, three at a time, like a crawl with --concurrency 3
+        for _ in range(5):
+            await asyncio.gather(*(visit(pool) for _ in range(3)))
+        stats = dict(pool.stats)
+        retired = [c for c in contexts if c.closed]
+        assert stats["reuse_hits"] > 0
+        assert stats["contexts_recycled"] == len(retired) >= 2
+        assert stats["pages_created"] + stats["reuse_hits"] == 15
+        await pool.close()
+        return contexts
+
+    contexts = asyncio.run(run())
+    assert all(context.closed for context in contexts)
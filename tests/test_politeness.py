@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+import pytest
+
+from benchmarks.fixture_site import FixtureSite, FixtureSiteConfig
+from scraper import ScrapingConfig, WebScraper
+from scraper.seeds import Seed
+from scraper.politeness import PolitenessScheduler
+
+
+class FakeClock:
+    """Monotonic clock that only moves when the scheduler sleeps"""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+def scheduler(clock: FakeClock, **kwargs) -> PolitenessScheduler:
+    return PolitenessScheduler(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_same_host_is_paced_by_the_interval():
+    clock = FakeClock()
+    polite = scheduler(clock, min_interval_ms=500)
+
+    async def run():
+        for _ in range(3):
+            async with polite.slot("https://a.test/x"):
+                pass
+
+    asyncio.run(run())
+    assert clock.sleeps == [0.5, 0.5]
+    assert clock.now == pytest.approx(101.0)
+
+
+def test_hosts_are_paced_independently():
+    clock = FakeClock()
+    polite = scheduler(clock, min_interval_ms=500)
+
+    async def run():
+        async with polite.slot("https://a.test/1"):
+            pass
+        assert not polite.is_ready("https://www.a.test/2")
+        assert polite.delay_for("https://a.test/2") == pytest.approx(0.5)
+        assert polite.is_ready("https://b.test/1")
+        async with polite.slot("https://b.test/1"):
+            pass
+
+    asyncio.run(run())
+    assert clock.sleeps == []
+
+
+def test_per_host_concurrency_cap():
+    clock = FakeClock()
+    polite = scheduler(clock, per_host_concurrency=2)
+    entered = []
+
+    async def visit(i: int, gate: asyncio.Event) -> None:
+        async with polite.slot("https://a.test/"):
+            entered.append(i)
+            await gate.wait()
+
+    async def run():
+        gate = asyncio.Event()
+        tasks = [asyncio.create_task(visit(i, gate)) for i in range(3)]
+        await asyncio.sleep(0)
+        assert entered == [0, 1]
+        assert not polite.is_ready("https://a.test/other")
+        gate.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert entered == [0, 1, 2]
+
+
+def test_cancelled_wait_gives_back_the_host_slot():
+    async def never(seconds: float) -> None:
+        await asyncio.Event().wait()
+
+    clock = FakeClock()
+    polite = PolitenessScheduler(min_interval_ms=1000, per_host_concurrency=1, clock=clock, sleep=never)
+
+    async def run():
+        async with polite.slot("https://a.test/"):
+            pass
+        waiter = asyncio.create_task(polite.acquire("https://a.test/"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        clock.now += 1
+        assert polite.is_ready("https://a.test/")
+
+    asyncio.run(run())
+
+
+def test_default_config_does_not_pace_a_single_host():
+    # Default settings must not turn into a per-host cap of 1000 / delay_ms pages/s
+    config = ScrapingConfig(depth=1, max_pages=11, fetch_mode="hybrid")
+    scraper = WebScraper(config)
+    assert scraper.politeness.min_interval == 0
+
+    with FixtureSite(FixtureSiteConfig(pages=20, fanout=10)) as site:
+        start = time.perf_counter()
+        results = asyncio.run(scraper.scrape(site.url()))
+        elapsed = time.perf_counter() - start
+    assert len(results) == 11
+    # Start page, then two rounds of five workers, each pausing delay_ms; paced
+    # per host at delay_ms the same crawl takes at least 5 s
+    assert elapsed < 4.0
+
+
+def test_seed_pool_finds_a_ready_host_behind_many_busy_ones():
+    clock = FakeClock()
+    politeness = scheduler(clock, min_interval_ms=1000)
+    scraper = WebScraper(ScrapingConfig(depth=0, concurrency=1), politeness=politeness)
+    seeds = [Seed(f"https://busy{i}.test/") for i in range(60)] + [Seed("https://ready.test/")]
+    crawls = [scraper._new_seed_crawl(seed) for seed in seeds]
+    for seed in seeds[:-1]:
+        politeness._next_dispatch[politeness.host_key(seed.url)] = clock.now + 60
+    visited = []
+
+    async def visit(url, depth, pool, semaphore, seed=None):
+        visited.append(url)
+        return {"url": url}
+
+    scraper._visit_url = visit
+    asyncio.run(scraper._run_seed_pool(crawls, None, asyncio.Semaphore(1)))
+    assert visited[0] == crawls[-1].url
+    assert len(visited) == len(seeds)
@@ -0,0 +1,72 @@
+import asyncio
+
+from scraper.recrawl_index import PageRecord, RecrawlIndex
+
+
+URL = "https://a.test/page"
+
+
+def page(text: str = "hello") -> dict:
+    return {"url": URL, "depth": 1, "text": text, "links": [{"url": "https://a.test/next", "text": "next"}]}
+
+
+def visit(path: str, result: dict, headers: dict, not_modified: bool = False):
+    """Reconcile one visit against the index at ``path``; return the result and the stored record"""
+
+    async def run():
+        index = RecrawlIndex(path)
+        await index.open()
+        try:
+            previous = await index.lookup(URL)
+            reconciled = index.reconcile(result, previous, headers, not_modified=not_modified)
+            await index.flush()
+            return reconciled, await index.lookup(URL), index.stats
+        finally:
+            await index.close()
+
+    return asyncio.run(run())
+
+
+def test_new_then_unchanged(tmp_path):
+    path = str(tmp_path / "index.db")
+    result, record, stats = visit(path, page(), {"etag": '"v1"'})
+    assert result["change"] == "new" and stats["new"] == 1
+    assert record.etag == '"v1"'
+
+    result, record, stats = visit(path, page(), {"etag": '"v1"'})
+    assert result == {"url": URL, "depth": 1, "links": record.links, "unchanged": True}
+    assert stats["unchanged"] == 1
+
+
+def test_changed_content_is_emitted(tmp_path):
+    path = str(tmp_path / "index.db")
+    visit(path, page("old"), {})
+    result, record, stats = visit(path, page("new"), {})
+    assert result["change"] == "changed" and stats["changed"] == 1
+    assert record.content_hash == RecrawlIndex.content_hash(page("new"))
+
+
+def test_conditional_headers():
+    assert RecrawlIndex.conditional_headers(None) == {}
+    record = PageRecord(URL, '"v1"', "Mon, 01 Jan 2024 00:00:00 GMT", "hash", [])
+    assert RecrawlIndex.conditional_headers(record) == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+
+
+def test_unchanged_content_refreshes_validators(tmp_path):
+    path = str(tmp_path / "index.db")
+    visit(path, page(), {"etag": '"v1"', "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    result, record, _ = visit(path, page(), {"etag": '"v2"', "last-modified": "Tue, 02 Jan 2024 00:00:00 GMT"})
+    assert result["unchanged"]
+    assert record.etag == '"v2"'
+    assert record.last_modified == "Tue, 02 Jan 2024 00:00:00 GMT"
+
+
+def test_not_modified_keeps_validators_the_server_omits(tmp_path):
+    path = str(tmp_path / "index.db")
+    visit(path, page(), {"etag": '"v1"'})
+    result, record, stats = visit(path, {"url": URL, "depth": 1}, {}, not_modified=True)
+    assert result["unchanged"] and stats["not_modified"] == 1
+    assert record.etag == '"v1"'
+    assert record.links == page()["links"]
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from scraper.resource_blocker import ResourceBlocker
+
+
+def test_from_config_is_none_when_nothing_is_blocked():
+    assert ResourceBlocker.from_config() is None
+    with pytest.raises(ValueError):
+        ResourceBlocker.from_config("everything")
+
+
+def test_text_only_preset():
+    blocker = ResourceBlocker.from_config("text-only")
+    page = "https://www.a.test/article"
+    assert blocker.should_block("https://a.test/hero.jpg", "image", page)
+    assert blocker.should_block("https://a.test/site.css", "stylesheet", page)
+    assert blocker.should_block("https://www.google-analytics.com/collect", "xhr", page)
+    assert blocker.should_block("https://cdn.other.test/app.js", "script", page)
+    assert not blocker.should_block("https://static.a.test/app.js", "script", page)
+    assert not blocker.should_block("https://a.test/api/items", "fetch", page)
+
+
+def test_main_document_is_never_blocked():
+    blocker = ResourceBlocker(resource_types=["document"], third_party=True)
+    assert not blocker.should_block("https://b.test/", "document", "https://a.test/", is_main_document=True)
+    assert blocker.should_block("https://a.test/frame", "document", "https://a.test/")
+
+
+def test_explicit_settings_merge_with_a_preset():
+    blocker = ResourceBlocker.from_config("no-media", resource_types=["stylesheet"],
+                                          url_patterns=["*/ads/*"])
+    assert blocker.should_block("https://a.test/x.css", "stylesheet", "https://a.test/")
+    assert blocker.should_block("https://a.test/ads/1.js", "script", "https://a.test/")
+    assert not blocker.third_party
+
+
+def test_site_uses_the_last_two_labels():
+    assert ResourceBlocker.site("https://cdn.static.a.test:443/x") == "a.test"
+
+
+PAGE = "https://www.a.test/article"
+
+
+@pytest.mark.parametrize("url, resource_type, text_only, no_media", [
+    ("https://a.test/hero.jpg", "image", True, True),
+    ("https://a.test/clip.mp4", "media", True, True),
+    ("https://a.test/font.woff2", "font", True, True),
+    ("https://a.test/site.css", "stylesheet", True, False),
+    ("https://a.test/app.js", "script", False, False),
+    ("https://a.test/api/items", "fetch", False, False),
+    ("https://a.test/api/items", "xhr", False, False),
+    ("https://cdn.other.test/app.js", "script", True, False),
+    ("https://cdn.other.test/data.json", "fetch", True, False),
+    ("https://www.googletagmanager.com/gtm.js", "script", True, True),
+    ("https://connect.facebook.net/en_US/fbevents.js", "script", True, True),
+    ("https://a.test/frame", "document", False, False),
+])
+def test_preset_table(url, resource_type, text_only, no_media):
+    assert ResourceBlocker.from_config("text-only").should_block(url, resource_type, PAGE) is text_only
+    assert ResourceBlocker.from_config("no-media").should_block(url, resource_type, PAGE) is no_media
+
+
+class FakeFrame:
+    def __init__(self, page: "FakePage") -> None:
+        self.page = page
+
+
+class FakePage:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.main_frame = FakeFrame(self)
+
+
+class FakeRequest:
+    def __init__(self, url: str, resource_type: str, frame=None, navigation: bool = False) -> None:
+        self.url = url
+        self.resource_type = resource_type
+        self.frame = frame
+        self._navigation = navigation
+
+    def is_navigation_request(self) -> bool:
+        return self._navigation
+
+
+class FakeRoute:
+    def __init__(self, request: FakeRequest) -> None:
+        self.request = request
+        self.outcome = None
+
+    async def abort(self, error_code: str) -> None:
+        self.outcome = error_code
+
+    async def fallback(self) -> None:
+        self.outcome = "fallback"
+
+
+def test_route_handler_aborts_blocked_requests_and_counts_per_page():
+    blocker = ResourceBlocker.from_config("text-only")
+    page = FakePage("about:blank")
+    requests = [
+        # Navigating away from about:blank: the main document goes through
+        FakeRequest("https://a.test/", "document", page.main_frame, navigation=True),
+        FakeRequest("https://a.test/hero.jpg", "image", page.main_frame),
+        FakeRequest("https://a.test/site.css", "stylesheet", page.main_frame),
+        FakeRequest("https://a.test/api", "fetch", page.main_frame),
+        # A service worker request has no frame and no page
+        FakeRequest("https://a.test/sw.png", "image", None),
+    ]
+
+    async def run():
+        routes = []
+        for request in requests:
+            route = FakeRoute(request)
+            await blocker._handle_route(route)
+            routes.append(route.outcome)
+            page.url = "https://a.test/"
+        return routes
+
+    assert asyncio.run(run()) == ["fallback", "blockedbyclient", "blockedbyclient", "fallback",
+                                  "blockedbyclient"]
+    assert blocker.take_stats(page) == {"blocked": 2, "allowed": 2}
+    assert blocker.take_stats(page) == {"blocked": 0, "allowed": 0}
+    assert blocker.totals == {"blocked": 3, "allowed": 2}
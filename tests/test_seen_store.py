@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fixture_site import FixtureSite, FixtureSiteConfig
+from scraper import ScrapingConfig, WebScraper
+from scraper.seen_store import BloomFilter, FingerprintSet, make_seen_store
+
+
+def urls(n: int, prefix: str = "https://a.test/page/"):
+    return [f"{prefix}{i}" for i in range(n)]
+
+
+def test_fingerprint_set_grows_without_losing_urls():
+    seen = FingerprintSet(capacity=16)
+    seen.update(urls(5000))
+    seen.add("https://a.test/page/7")
+    assert len(seen) == 5000
+    assert all(url in seen for url in urls(5000))
+    assert not any(url in seen for url in urls(1000, "https://b.test/"))
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    seen = BloomFilter(capacity=10000, fp_rate=0.01)
+    seen.update(urls(10000))
+    assert all(url in seen for url in urls(10000))
+    false_positives = sum(url in seen for url in urls(10000, "https://b.test/"))
+    assert false_positives < 300
+
+
+@pytest.mark.parametrize("kind, cls", [("set", set), ("fingerprint", FingerprintSet), ("bloom", BloomFilter)])
+def test_make_seen_store(kind, cls):
+    seen = make_seen_store(kind, capacity=100)
+    assert isinstance(seen, cls)
+    seen.add("https://a.test/")
+    assert "https://a.test/" in seen and len(seen) == 1
+
+
+def test_make_seen_store_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        make_seen_store("lru")
+
+
+@pytest.mark.parametrize("options", [
+    dict(seen_store="fingerprint"),
+    dict(seen_store="bloom", bloom_fp_rate=0.0001),
+    dict(frontier_memory_limit=4),
+])
+def test_compact_stores_crawl_the_same_pages(options, tmp_path):
+    def crawl(**kwargs):
+        # One worker keeps the breadth-first visiting order deterministic
+        config = ScrapingConfig(depth=4, max_pages=60, delay_ms=0, concurrency=1, fetch_mode="hybrid",
+                                spill_dir=str(tmp_path), **kwargs)
+        return asyncio.run(WebScraper(config).scrape(site.url()))
+
+    with FixtureSite(FixtureSiteConfig(pages=80, fanout=4)) as site:
+        expected = crawl()
+        results = crawl(**options)
+    assert len(expected) == 60
+    assert [r["url"] for r in results] == [r["url"] for r in expected]
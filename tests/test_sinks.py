@@ -0,0 +1,91 @@
+import asyncio
+import gzip
+import json
+import os
+
+import pytest
+
+from scraper.sinks import NDJSONSink, ResultSink, flatten_tables
+
+
+def write_all(sink: ResultSink, records) -> None:
+    async def run():
+        async with sink:
+            for record in records:
+                await sink.write(record)
+
+    asyncio.run(run())
+
+
+def test_ndjson_sink_writes_dicts_and_lines(tmp_path):
+    path = str(tmp_path / "out.ndjson")
+    write_all(NDJSONSink(path, batch_size=2), [{"url": "a", "text": "é"}, '{"url": "b"}', {"url": "c"}])
+    with open(path, encoding="utf-8") as f:
+        assert [json.loads(line)["url"] for line in f] == ["a", "b", "c"]
+
+
+def test_ndjson_sink_gzip_follows_suffix(tmp_path):
+    path = str(tmp_path / "out.ndjson.gz")
+    sink = NDJSONSink(path)
+    assert sink.compression == "gzip"
+    write_all(sink, [{"n": i} for i in range(10)])
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["n"] for line in f] == list(range(10))
+
+
+def test_ndjson_sink_rotates_by_size(tmp_path):
+    sink = NDJSONSink(str(tmp_path / "results.ndjson"), rotate_bytes=100, batch_size=2)
+    records = [{"n": i, "pad": "x" * 40} for i in range(8)]
+    write_all(sink, records)
+    assert [p.rsplit("/", 1)[1] for p in sink.paths][:2] == ["results-00000.ndjson", "results-00001.ndjson"]
+    read = []
+    for path in sink.paths:
+        with open(path, encoding="utf-8") as f:
+            read.extend(json.loads(line)["n"] for line in f)
+    assert read == list(range(8))
+    assert sink.records == 8
+
+
+@pytest.mark.parametrize("suffix", ["gz", "zst"])
+def test_ndjson_sink_rotates_compressed_files_by_size_on_disk(tmp_path, suffix):
+    if suffix == "zst":
+        zstandard = pytest.importorskip("zstandard")
+    sink = NDJSONSink(str(tmp_path / f"results.ndjson.{suffix}"), rotate_bytes=2000, batch_size=2)
+    records = [{"n": i, "id": os.urandom(32).hex()} for i in range(200)]
+    write_all(sink, records)
+    # One batch compresses to well under 512 bytes
+    assert len(sink.paths) > 3
+    assert all(os.path.getsize(path) < 2000 + 512 for path in sink.paths)
+    read = []
+    for path in sink.paths:
+        if suffix == "gz":
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        else:
+            with open(path, "rb") as f:
+                lines = zstandard.ZstdDecompressor().stream_reader(f).read().decode("utf-8").splitlines()
+        read.extend(json.loads(line)["n"] for line in lines)
+    assert read == list(range(200))
+
+
+def test_ndjson_sink_rejects_bad_options():
+    with pytest.raises(ValueError):
+        NDJSONSink("out.ndjson", compression="lz4")
+    with pytest.raises(ValueError):
+        NDJSONSink("-", compression="gzip")
+
+
+def test_flatten_tables_joins_multi_row_headers():
+    result = {
+        "url": "https://a.test/",
+        "tables": [
+            {"headers": [["Name", "Price"], ["", "EUR"]], "rows": [["Tea", "3"], ["Cake", "4"]]},
+            {"headers": [], "rows": [["x"]]},
+        ],
+    }
+    assert flatten_tables(result) == [
+        {"url": "https://a.test/", "table": 0, "row": 0, "headers": ["Name", "Price / EUR"], "cells": ["Tea", "3"]},
+        {"url": "https://a.test/", "table": 0, "row": 1, "headers": ["Name", "Price / EUR"], "cells": ["Cake", "4"]},
+        {"url": "https://a.test/", "table": 1, "row": 0, "headers": [], "cells": ["x"]},
+    ]
+    assert flatten_tables({"url": "https://a.test/"}) == []
@@ -0,0 +1,148 @@
+import asyncio
+import os
+from dataclasses import replace
+
+from benchmarks.fixture_site import FixtureSite, FixtureSiteConfig
+from scraper import ReplayScraper, ScrapingConfig, WebScraper
+from scraper.snapshots import PageSnapshot, RecordedResponse, SnapshotStore
+
+
+class FakeResponse:
+    def __init__(self, url: str, status: int = 200, body: bytes = b"body") -> None:
+        self.url = url
+        self.status = status
+        self.headers = {"content-type": "text/html"}
+        self._body = body
+        self.request = type("Request", (), {"resource_type": "document"})()
+
+    async def body(self) -> bytes:
+        return self._body
+
+    async def all_headers(self):
+        return dict(self.headers)
+
+
+class FakePage:
+    """Just enough of a Playwright page for arm/capture/disarm"""
+
+    def __init__(self, goto_error: Exception = None) -> None:
+        self.listeners = {}
+        self.url = "about:blank"
+        self.goto_error = goto_error
+
+    def on(self, event, listener) -> None:
+        self.listeners.setdefault(event, []).append(listener)
+
+    def remove_listener(self, event, listener) -> None:
+        self.listeners[event].remove(listener)
+
+    def emit(self, event, value) -> None:
+        for listener in list(self.listeners.get(event, [])):
+            listener(value)
+
+    async def goto(self, url, **kwargs):
+        if self.goto_error is not None:
+            raise self.goto_error
+        self.url = url
+        response = FakeResponse(url)
+        self.emit("response", response)
+        return response
+
+    async def content(self) -> str:
+        return "<html><body>recorded</body></html>"
+
+
+class FakePool:
+    def __init__(self, page: FakePage) -> None:
+        self.page = page
+        self.released = []
+
+    async def acquire(self) -> FakePage:
+        return self.page
+
+    async def release(self, page: FakePage) -> None:
+        self.released.append(page)
+
+
+def snapshot(url: str, dom: str, asset: bytes = b"shared asset") -> PageSnapshot:
+    return PageSnapshot(
+        url=url, depth=1, fetch="browser", status=200, headers={"etag": '"x"'}, dom=dom,
+        final_url=url, responses=[RecordedResponse(url + "/app.js", 200, {}, asset, "script")],
+    )
+
+
+def test_round_trip_and_shared_blobs(tmp_path):
+    root = str(tmp_path / "snapshots")
+
+    async def run():
+        async with SnapshotStore(root) as store:
+            store.add(snapshot("https://a.test/1", "<p>one</p>"))
+            store.add(snapshot("https://a.test/2", "<p>two</p>"))
+        async with SnapshotStore(root) as store:
+            return await store.urls(), await store.load("https://a.test/2")
+
+    urls, loaded = asyncio.run(run())
+    assert sorted(urls) == ["https://a.test/1", "https://a.test/2"]
+    assert loaded == snapshot("https://a.test/2", "<p>two</p>")
+    blobs = [name for _, _, names in os.walk(os.path.join(root, "blobs")) for name in names]
+    # Two DOMs and one asset shared by both pages
+    assert len(blobs) == 3
+
+
+def test_capture_records_responses_until_disarmed(tmp_path):
+    async def run():
+        async with SnapshotStore(str(tmp_path)) as store:
+            page = FakePage()
+            store.arm(page)
+            response = await page.goto("https://a.test/")
+            await store.capture(page, "https://a.test/", 0, response)
+            store.disarm(page)
+            page.emit("response", FakeResponse("https://a.test/late"))
+            assert not page.listeners["response"]
+            assert not store._armed
+            await store.flush()
+            return await store.load("https://a.test/")
+
+    loaded = asyncio.run(run())
+    assert loaded.dom == "<html><body>recorded</body></html>"
+    assert [r.url for r in loaded.responses] == ["https://a.test/"]
+
+
+def test_failed_visit_disarms_the_page(tmp_path):
+    scraper = WebScraper(ScrapingConfig(record_dir=str(tmp_path)))
+    page = FakePage(goto_error=RuntimeError("net::ERR_CONNECTION_REFUSED"))
+    pool = FakePool(page)
+
+    async def run():
+        scraper.snapshot_store = SnapshotStore(str(tmp_path))
+        await scraper.snapshot_store.open()
+        try:
+            return await scraper._visit_browser("https://a.test/", 0, pool)
+        finally:
+            await scraper.snapshot_store.close()
+
+    result = asyncio.run(run())
+    assert "ERR_CONNECTION_REFUSED" in result["error"]
+    assert pool.released == [page]
+    assert not scraper.snapshot_store._armed
+    assert not page.listeners["response"]
+
+
+def test_static_replay_matches_the_recording_offline(tmp_path):
+    record_dir = str(tmp_path / "snapshots")
+    config = ScrapingConfig(fetch_mode="hybrid", depth=1, max_pages=8, include_tables=True)
+    with FixtureSite(FixtureSiteConfig(pages=10, fanout=3, tables=1, table_rows=3)) as site:
+        recorder = WebScraper(replace(config, record_dir=record_dir))
+        recorded = asyncio.run(recorder.scrape(site.url()))
+    assert recorder.stats()["snapshots"]["pages"] == len(recorded) == 4
+    assert all("lorem ipsum" in r["text"] and len(r["tables"]) == 1 for r in recorded)
+
+    # The site is gone: everything must come from the snapshots
+    replayed = asyncio.run(ReplayScraper(config, record_dir).replay())
+    assert all(r.get("replayed") for r in replayed)
+    assert not [r for r in replayed if "error" in r]
+
+    def content(results):
+        return {r["url"]: (r["text"], r["links"], r["tables"]) for r in results}
+
+    assert content(replayed) == content(recorded)
@@ -0,0 +1,84 @@
+import asyncio
+
+from scraper import ScrapingConfig
+from scraper.static_fetcher import StaticFetcher
+
+
+STATIC = "<html><body><main><h1>Title</h1><p>Server rendered text</p><a href='/next'>next</a></main></body></html>"
+SHELL = "<html><body><div id='root'></div><script src='/app.js'></script></body></html>"
+EMPTY = "<html><body></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, url: str, html: str, content_type: str = "text/html; charset=utf-8") -> None:
+        self.url = url
+        self.status = 200
+        self.headers = {"content-type": content_type}
+        self._html = html
+
+    async def text(self) -> str:
+        return self._html
+
+    async def dispose(self) -> None:
+        pass
+
+
+class FakeRequestContext:
+    """Serves fixed bodies by URL in place of Playwright's APIRequestContext"""
+
+    def __init__(self, pages: dict) -> None:
+        self.pages = pages
+
+    async def get(self, url: str, **kwargs) -> FakeResponse:
+        body = self.pages[url]
+        if isinstance(body, tuple):
+            return FakeResponse(url, *body)
+        return FakeResponse(url, body)
+
+
+def fetcher(pages: dict) -> StaticFetcher:
+    fetcher = StaticFetcher(ScrapingConfig(fetch_mode="hybrid"))
+    fetcher._request = FakeRequestContext(pages)
+    return fetcher
+
+
+def fetch_all(fetcher: StaticFetcher, urls) -> list:
+    async def run():
+        return [await fetcher.fetch(url) for url in urls]
+
+    return asyncio.run(run())
+
+
+def test_parse_flags_pages_that_need_javascript():
+    plain = fetcher({})
+    page, needs_browser = plain.parse(STATIC, "https://a.test/")
+    assert not needs_browser
+    assert "Server rendered text" in page.text
+    assert page.links == [{"text": "next", "href": "https://a.test/next"}]
+    assert plain.parse(SHELL, "https://a.test/")[1]
+    assert plain.parse(EMPTY, "https://a.test/")[1]
+
+
+def test_one_empty_page_does_not_move_a_host_to_the_browser():
+    f = fetcher({"https://a.test/1": STATIC, "https://a.test/empty": EMPTY, "https://a.test/2": STATIC})
+    pages = fetch_all(f, ["https://a.test/1", "https://a.test/empty", "https://a.test/2"])
+    assert [p is not None for p in pages] == [True, False, True]
+    assert f.should_try("https://a.test/3")
+    assert f.stats == {"static": 2, "escalated": 1}
+
+
+def test_host_is_rendered_after_consecutive_escalations():
+    shells = [f"https://a.test/app/{i}" for i in range(StaticFetcher._LEARN_AFTER)]
+    f = fetcher({**{url: SHELL for url in shells}, "https://a.test/ok": STATIC, "https://b.test/": STATIC})
+    # A static page in between starts the count again
+    fetch_all(f, shells[:-1] + ["https://a.test/ok"] + shells[:-1])
+    assert f.should_try("https://a.test/x")
+    assert fetch_all(f, shells[-1:]) == [None]
+    assert not f.should_try("https://a.test/x")
+    assert f.should_try("https://b.test/")
+
+
+def test_non_html_responses_do_not_count_towards_learning():
+    f = fetcher({"https://a.test/feed": ("{}", "application/json")})
+    assert fetch_all(f, ["https://a.test/feed"] * 5) == [None] * 5
+    assert f.should_try("https://a.test/")
@@ -0,0 +1,54 @@
+import asyncio
+
+from benchmarks.fixture_site import FixtureSite, FixtureSiteConfig
+from scraper import ScrapingConfig, WebScraper
+from scraper.trap_detector import TrapDetector
+
+
+def test_repeating_segments():
+    traps = TrapDetector(max_segment_repeats=2)
+    assert not traps.is_trap("https://a.test/a/b/a/b")
+    assert traps.is_trap("https://a.test/a/b/a/b/a/b")
+    assert traps.stats["repeating_path"] == 1
+
+
+def test_query_variants_per_path():
+    traps = TrapDetector(max_query_variants=2)
+    assert not traps.is_trap("https://a.test/cal?m=1&y=2024")
+    assert not traps.is_trap("https://a.test/cal?m=2&y=2024")
+    # Same parameters in another order are the same variant
+    assert not traps.is_trap("https://a.test/cal?y=2024&m=1")
+    assert traps.is_trap("https://a.test/cal?m=3&y=2024")
+    assert not traps.is_trap("https://a.test/other?m=3")
+    assert traps.stats["query_explosion"] == 1
+
+
+def test_from_config_is_none_when_off():
+    assert TrapDetector.from_config(ScrapingConfig()) is None
+    assert TrapDetector.from_config(ScrapingConfig(max_query_variants=5)).max_query_variants == 5
+
+
+def test_each_rejected_url_is_counted_once():
+    traps = TrapDetector(max_segment_repeats=1, max_query_variants=1)
+    assert not traps.is_trap("https://a.test/list?page=1")
+    # Every page of a site links to the same trap URLs
+    for _ in range(5):
+        assert traps.is_trap("https://a.test/a/a")
+        assert traps.is_trap("https://a.test/list?page=2")
+        assert traps.is_trap("https://a.test/list?page=3")
+    assert traps.stats == {"repeating_path": 1, "query_explosion": 2}
+
+
+def test_crawl_reports_each_trap_url_once():
+    config = ScrapingConfig(depth=6, max_pages=40, delay_ms=0, fetch_mode="hybrid", max_query_variants=1)
+    with FixtureSite(FixtureSiteConfig(pages=10, fanout=3, trap_every=1)) as site:
+        scraper = WebScraper(config)
+        results = asyncio.run(scraper.scrape(site.url()))
+    # Archive pages link to overlapping ?session= variants of themselves
+    checked = scraper.url_policy.filter_links(
+        link for r in results if r["depth"] < config.depth for link in r["links"]
+    )
+    variants = {link["href"] for link in checked if "session=" in link["href"]}
+    paths = {url.split("?")[0] for url in variants}
+    # The first variant of each path is allowed, every other one counts once
+    assert scraper.stats()["traps"]["query_explosion"] == len(variants) - len(paths) > 0
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fixture_site import FixtureSite, FixtureSiteConfig
+from scraper import ScrapingConfig, WebScraper
+from scraper.url_normalizer import URLNormalizer
+from scraper.url_policy import URLPolicy
+
+
+def test_normalize_matches_url_normalizer_rules():
+    policy = URLPolicy()
+    assert policy.normalize("HTTPS://WWW.A.test:443/x/?q=1#frag") == "https://a.test/x?q=1"
+    assert policy.normalize("http://a.test:80/") == "http://a.test"
+
+
+def test_scope_follows_seed_hosts_extensions_and_patterns():
+    policy = URLPolicy(seeds=["https://www.a.test/"], include_patterns=["*/docs/*"],
+                       exclude_patterns=["re:.*/docs/private/.*"])
+    assert policy.allows("https://a.test/docs/intro")
+    assert not policy.allows("https://b.test/docs/intro")
+    assert not policy.allows("https://a.test/blog/post")
+    assert not policy.allows("https://a.test/docs/private/keys")
+    assert not policy.allows("https://a.test/docs/manual.pdf")
+    assert not policy.allows("mailto:someone@a.test")
+
+
+def test_clean_links_absolutizes_and_dedupes():
+    policy = URLPolicy()
+    links = [
+        {"href": "/a/", "text": ""},
+        {"href": "https://a.test/a", "text": "A"},
+        {"href": "b", "text": "B"},
+        {"href": "#top", "text": "Top"},
+        {"href": "javascript:void(0)", "text": "JS"},
+    ]
+    assert policy.clean_links(links, "https://a.test/dir/page") == [
+        {"href": "https://a.test/a", "text": "A"},
+        {"href": "https://a.test/dir/b", "text": "B"},
+    ]
+
+
+def test_filter_links_keeps_in_scope_links_in_order():
+    policy = URLPolicy(seeds=["https://a.test/"])
+    links = [{"href": "https://a.test/2/"}, {"href": "https://b.test/"}, {"href": "https://a.test/1"}]
+    assert [l["href"] for l in policy.filter_links(links)] == ["https://a.test/2", "https://a.test/1"]
+
+
+def test_tracking_params_are_stripped():
+    config = ScrapingConfig(strip_tracking_params=True, strip_query_params=["ref"])
+    policy = URLPolicy.from_config(config)
+    assert policy.normalize("https://a.test/p?id=3&utm_source=x&ref=home&fbclid=1") == "https://a.test/p?id=3"
+
+
+def test_mime_types():
+    policy = URLPolicy(deny_mime_types=["application/pdf", "image/"])
+    assert policy.allows_mime("text/html; charset=utf-8")
+    assert not policy.allows_mime("image/png")
+    assert not policy.allows_mime("Application/PDF")
+    assert URLPolicy().allows_mime("image/png")
+
+
+def test_seed_change_clears_cached_decisions():
+    policy = URLPolicy(seeds=["https://a.test/"])
+    assert not policy.allows("https://b.test/")
+    policy.set_seeds(["https://b.test/"])
+    assert policy.allows("https://b.test/")
+
+
+@pytest.mark.parametrize("url", [
+    "HTTP://A.test:80/x/",
+    "https://www.a.test",
+    "https://a.test/x/y/?b=2&a=1#f",
+    "https://a.test:8443/",
+    "http://a.test:443/",
+    "https://a.test.//p",
+    "https://a.test/p;x?q",
+    "https://user@a.test/p",
+    "https://a.test/%7Euser/",
+    "ftp://a.test/file",
+])
+def test_single_parse_normalizes_like_url_normalizer(url):
+    assert URLPolicy().normalize(url) == URLNormalizer.normalize_url(url)
+
+
+def test_repeated_links_are_analyzed_once():
+    policy = URLPolicy(seeds=["https://a.test/"])
+    nav = [{"href": f"/section/{i}", "text": str(i)} for i in range(20)]
+    for page in range(50):
+        policy.clean_links(nav, f"https://a.test/page/{page}")
+    info = policy.cache_info()
+    # One entry per nav link, however many pages repeat it
+    assert info["size"] == 20
+    assert info["hits"] >= 49 * 20
+
+
+def test_crawl_stays_within_include_and_exclude_patterns():
+    config = ScrapingConfig(depth=3, max_pages=30, delay_ms=0, fetch_mode="hybrid",
+                            include_patterns=["re:.*/page/[0-9]$", "*/page/1?"],
+                            exclude_patterns=["*/page/5"])
+    with FixtureSite(FixtureSiteConfig(pages=20, fanout=4)) as site:
+        results = asyncio.run(WebScraper(config).scrape(site.url()))
+    paths = {r["url"].rsplit("/", 1)[1] for r in results}
+    assert "0" in paths and len(paths) > 5
+    assert "5" not in paths
+    assert all(len(p) == 1 or p.startswith("1") for p in paths)
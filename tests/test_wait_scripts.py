@@ -0,0 +1,122 @@
+import asyncio
+
+from node_dom import js, needs_node, run_page
+from scraper.js_manager import JsManager
+from scraper.wait_engine import WaitEngine
+
+
+JS = JsManager()
+
+PAGE = ["html", {}, ["body", {}, ["main", {}, ["p", {}, "Loaded"]]]]
+
+
+def settle(setup: str, quiet_ms: int = 100, max_ms: int = 3000, long_ms: int = 2000) -> dict:
+    """Install the tracking script, run ``setup``, then time one settle wait"""
+    body = f"""
+const pending = [];
+// Each fake fetch resolves after the delay in its URL: "/slow/<ms>"
+window.fetch = url => new Promise(resolve => {{
+  const ms = Number(String(url).split("/").pop());
+  if (ms >= 0) setTimeout(() => resolve({{ text: async () => "ok" }}), ms);
+}});
+await evaluate({js(JS.quiescence_init())});
+{setup}
+const info = await evaluate({js(JS.wait_quiescence(quiet_ms, max_ms, long_ms))});
+return {{ ...info, text: document.querySelector("main").innerText }};
+"""
+    return run_page(PAGE, body)
+
+
+@needs_node
+def test_idle_page_settles_after_the_quiet_period():
+    info = settle("")
+    assert info["reason"] == "quiet"
+    assert 100 <= info["waited_ms"] < 400
+
+
+@needs_node
+def test_in_flight_fetch_holds_the_wait_until_content_renders():
+    info = settle("""
+fetch("/slow/500").then(r => r.text()).then(() => {
+  const p = document.createElement("p");
+  p.append("late content");
+  document.querySelector("main").appendChild(p);
+});
+""")
+    assert info["reason"] == "quiet"
+    assert "late content" in info["text"]
+    assert 600 <= info["waited_ms"] < 1200
+
+
+@needs_node
+def test_in_flight_xhr_holds_the_wait():
+    info = settle("""
+XMLHttpRequest.latency = 400;
+const xhr = new XMLHttpRequest();
+xhr.open("GET", "/api");
+xhr.send();
+""")
+    assert info["reason"] == "quiet"
+    assert 400 <= info["waited_ms"] < 1000
+
+
+@needs_node
+def test_long_requests_do_not_hold_the_wait():
+    # "/slow/-1" never resolves, like a long poll
+    info = settle('fetch("/slow/-1");', long_ms=300)
+    assert info["reason"] == "quiet"
+    assert 300 <= info["waited_ms"] < 800
+
+
+@needs_node
+def test_a_dom_that_keeps_changing_times_out():
+    info = settle("""
+let n = 0;
+setInterval(() => document.querySelector("main").setAttribute("data-tick", ++n), 20);
+""", max_ms=500)
+    assert info["reason"] == "timeout"
+    assert 500 <= info["waited_ms"] < 900
+
+
+@needs_node
+def test_wait_script_returns_null_without_the_tracking_script():
+    assert run_page(PAGE, f"return await evaluate({js(JS.wait_quiescence(100, 1000, 2000))});") is None
+
+
+class FakePage:
+    def __init__(self, evaluate_result=None, evaluate_error: Exception = None) -> None:
+        self.evaluate_result = evaluate_result
+        self.evaluate_error = evaluate_error
+        self.load_states = []
+
+    async def evaluate(self, script: str):
+        if self.evaluate_error is not None:
+            raise self.evaluate_error
+        return self.evaluate_result
+
+    async def wait_for_load_state(self, state: str, timeout: int = 0) -> None:
+        self.load_states.append(state)
+
+
+def test_adaptive_settle_logs_the_page_script_result():
+    engine = WaitEngine(strategy="adaptive")
+    page = FakePage({"waited_ms": 120, "reason": "quiet"})
+    entry = asyncio.run(engine.settle(page, "load"))
+    assert entry["reason"] == "quiet" and entry["phase"] == "load"
+    assert page.load_states == []
+    assert engine.take_log(page) == [entry]
+    assert engine.take_log(page) == []
+
+
+def test_adaptive_settle_falls_back_to_networkidle_without_tracking():
+    page = FakePage(None)
+    entry = asyncio.run(WaitEngine(strategy="adaptive").settle(page, "load"))
+    assert entry["reason"] == "networkidle"
+    assert page.load_states == ["networkidle"]
+
+
+def test_adaptive_settle_waits_for_the_new_document_after_navigation():
+    page = FakePage(evaluate_error=RuntimeError("Execution context was destroyed"))
+    entry = asyncio.run(WaitEngine(strategy="adaptive").settle(page, "click"))
+    assert entry["reason"] == "navigated"
+    assert page.load_states == ["domcontentloaded"]